@@ -0,0 +1,98 @@
+# analysis_tools.py
+"""
+MCP tools that compare results across runs (see kpi.py).
+
+Tools included:
+  - compare_runs
+"""
+
+import time
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from mcp_app import mcp
+from helpers import wrap_errors, MCPApiError, MCPValidationError
+from rest_client_async_generated import AsyncSimioClientGenerated
+from batch import BATCH_CONCURRENCY, run_batch
+from kpi import build_matrix, pareto_fronts, ranks, signed
+from columnar import require_numpy
+
+class CompareRunsParams(BaseModel):
+    run_ids: List[str] = Field(..., min_length=1, max_length=1000)
+    responses: Optional[List[str]] = Field(None, description="Responses to include (default: all that appear)")
+    objectives: Dict[str, str] = Field(default_factory=dict, description="Response -> 'min' | 'max'; drives ranks and the Pareto set")
+    baseline: Optional[str] = Field(None, description="Row label (run id) deltas are taken against; default: first row")
+    include_controls: bool = Field(False, description="Add each row's control values")
+    sort_by: Optional[str] = Field(None, description="Response to sort rows by (best first, per objectives), or 'pareto'")
+    limit: int = Field(100, ge=1, le=1000, description="Max rows returned")
+    digits: int = Field(6, ge=0, le=12, description="Round values to this many decimals")
+    max_concurrency: int = Field(BATCH_CONCURRENCY, ge=1, le=32)
+
+@mcp.tool()
+@wrap_errors
+async def compare_runs(params: CompareRunsParams) -> dict:
+    """
+    Fetch response data for many runs concurrently and align it into a runs x responses matrix.
+    Returns values, deltas vs a baseline, per-response ranks and Pareto fronts as one compact table.
+    """
+    np = require_numpy()
+    t0 = time.monotonic()
+    client = AsyncSimioClientGenerated.from_env()
+
+    async def fetch(run_id, _):
+        return await client.scenarios_getscenarioresponsedatabyid(run_id=run_id)
+
+    fetched = await run_batch(
+        ((r, None) for r in dict.fromkeys(params.run_ids)), fetch, concurrency=params.max_concurrency, retries=1
+    )
+    payloads = {r: fetched["results"][r] for r in dict.fromkeys(params.run_ids) if r in fetched["results"]}
+    if not payloads:
+        raise MCPApiError(f"No response data fetched: {fetched['failed']}")
+    labels, run_ids, names, m, controls = build_matrix(payloads, params.responses)
+    if not names:
+        raise MCPApiError("No responses found in the runs' response data")
+
+    if params.baseline is not None and params.baseline not in labels:
+        raise MCPValidationError(f"Baseline '{params.baseline}' is not one of the rows ({labels[:20]})")
+    base = labels.index(params.baseline) if params.baseline is not None else 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta = m - m[base]
+        pct = np.where(m[base] != 0, delta / np.abs(m[base]) * 100.0, np.nan)
+    rank = ranks(m, names, params.objectives)
+    front = pareto_fronts(signed(m, names, params.objectives)) if params.objectives else None
+
+    order = np.arange(len(labels))
+    if params.sort_by == "pareto":
+        if front is None:
+            raise MCPValidationError("sort_by='pareto' needs objectives")
+        order = np.lexsort((order, np.where(front == 0, np.iinfo(np.int64).max, front)))
+    elif params.sort_by:
+        if params.sort_by not in names:
+            raise MCPValidationError(f"sort_by '{params.sort_by}' is not a response ({names})")
+        order = np.argsort(rank[:, names.index(params.sort_by)], kind="stable")
+    shown = order[: params.limit]
+
+    def cells(a, i):
+        return [None if np.isnan(x) else round(float(x), params.digits) for x in a[i]]
+
+    rows = []
+    for i in shown:
+        row = {"row": labels[i], "run_id": run_ids[i], "values": cells(m, i), "delta": cells(delta, i),
+               "delta_pct": cells(pct, i), "rank": rank[i].tolist()}
+        if front is not None:
+            row["pareto_front"] = int(front[i])
+        if params.include_controls:
+            row["controls"] = controls[i]
+        rows.append(row)
+    out = {
+        "responses": names,
+        "baseline": labels[base],
+        "rows": rows,
+        "row_count": len(labels),
+        "truncated": len(labels) > len(rows),
+        "failed": fetched["failed"],
+        "elapsed_secs": round(time.monotonic() - t0, 2),
+    }
+    if front is not None:
+        out["objectives"] = params.objectives
+        out["pareto_optimal"] = [labels[i] for i in np.flatnonzero(front == 1)]
+    return out
@@ -0,0 +1,66 @@
+# batch.py
+"""
+Bounded-concurrency batch engine for fan-out portal calls.
+
+`run_batch` applies one coroutine per item with at most `concurrency` in flight,
+records success or the error per item, and re-runs only the failed items for up
+to `retries` extra rounds (with a short backoff between rounds).
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Tuple
+
+BATCH_CONCURRENCY = int(os.getenv("SIMIO_BATCH_CONCURRENCY", "8"))
+
+async def run_batch(
+    items: Iterable[Tuple[Hashable, Any]],
+    fn: Callable[[Hashable, Any], Awaitable[Any]],
+    *,
+    concurrency: int = BATCH_CONCURRENCY,
+    retries: int = 2,
+    backoff_secs: float = 0.5,
+) -> Dict[str, Any]:
+    """
+    Run fn(key, value) for every (key, value) item.
+    Returns {"results": {key: result}, "failed": {key: "Type: message"}, "rounds": n}.
+    """
+    pending = dict(items)
+    done: Dict[Hashable, Any] = {}
+    failed: Dict[Hashable, str] = {}
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def one(key, value):
+        async with sem:
+            try:
+                done[key] = await fn(key, value)
+                failed.pop(key, None)
+            except Exception as e:
+                failed[key] = f"{e.__class__.__name__}: {e}"
+
+    rounds = 0
+    while pending and rounds <= retries:
+        if rounds:
+            await asyncio.sleep(backoff_secs * (2 ** (rounds - 1)))
+        rounds += 1
+        await asyncio.gather(*(one(k, v) for k, v in pending.items()))
+        pending = {k: v for k, v in pending.items() if k in failed}
+    return {"results": done, "failed": failed, "rounds": rounds}
+
+async def apply_control_values(
+    client,
+    run_id: Any,
+    scenario_name: str,
+    controls: Dict[str, Any],
+    *,
+    concurrency: int = BATCH_CONCURRENCY,
+    retries: int = 2,
+) -> Dict[str, Any]:
+    """Set many scenario control values concurrently; returns applied/failed control names."""
+    async def set_one(name, value):
+        return await client.scenarios_setexperimentrunscenariocontrolvalue(
+            run_id=str(run_id), scenario_name=scenario_name, control_name=name, body={"value": str(value)}
+        )
+
+    res = await run_batch(controls.items(), set_one, concurrency=concurrency, retries=retries)
+    return {"applied": sorted(res["results"]), "failed": res["failed"], "rounds": res["rounds"]}
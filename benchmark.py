@@ -0,0 +1,279 @@
+# benchmark.py
+"""
+Client-level benchmarks against the in-process mock portal (mock_portal.py).
+
+    python benchmark.py
+    python benchmark.py --latency-ms 50 --error-rate 0.02 --concurrency 1,8,32 --json bench.json
+
+Every tool is called through mcp.call_tool, so argument validation, output shaping,
+the REST clients and their caches, pools, rate limiter, retries and breakers are all
+measured as a client sees them. Sections:
+  tools        every registered tool: latency p50/p95/max, ok rate, portal requests
+               and auth calls per call (workflows get --workflow-repeat calls)
+  concurrency  read tools under N concurrent callers: calls/s, p50/p95 and portal
+               requests per call (coalescing and caching show up as < 1)
+Each tool gets one warm-up call first. The client rate limit is raised to
+--client-rate so the mock, not the limiter, sets the pace; pass a lower value to
+measure the limiter.
+"""
+
+import argparse, asyncio, json, os, sys, tempfile, time
+from dataclasses import asdict, fields
+from typing import Any, Callable, Dict, List, Optional
+
+from mock_portal import MockConfig, MockPortal
+
+PAT = "benchmark-pat"
+TABLE = "Orders"
+READ_TOOLS = ("runs_getrunbyid", "models_getmodels", "runs_get", "scenarios_getscenarioresponsedatabyid",
+              "scenarios_getscenariotablerowdata", "resolve_ids")
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))]
+
+def fixtures(portal: MockPortal) -> Dict[str, Callable[[int], Dict[str, Any]]]:
+    """Tool name -> args for call i; destructive tools get fresh objects each call."""
+    model = next(iter(portal.models))
+    exp = next(e for e in portal.experiments.values() if e["modelId"] == model and e["name"] == "__Default")["id"]
+    runs = [r["id"] for r in portal.runs.values() if r["experimentId"] == exp]
+    run, scen = str(runs[0]), next(iter(portal.scenarios[runs[0]]))
+    cell = {"run_id": run, "scenario_name": scen, "table_name": TABLE}
+    project = portal.models[model]["projectName"]
+    export_id, import_id = str(portal.add_transfer("exports")), str(portal.add_transfer("imports"))
+
+    def fresh_run(i: int, start: bool = False) -> str:
+        run_id = portal.add_run(exp, f"Bench{i}_{time.monotonic_ns()}")
+        if start:
+            portal.start_run(run_id)
+        return str(run_id)
+
+    def published(i: int) -> str:
+        name = f"del{i}_{time.monotonic_ns()}"
+        portal.add_published(name)
+        return name
+
+    def desired_rows(i: int) -> List[Dict[str, Any]]:
+        rows = [dict(r) for r in portal._table(run, scen, TABLE)]
+        for r in rows[:5]:
+            r["Value"] = i
+        return rows
+
+    plan = {"project_name": project, "interval_secs": 0.5, "min_interval_secs": 0.5}
+    return {
+        "portal_authenticate": lambda i: {},
+        "requesttoken_postrestapitokenrequest": lambda i: {"body": {"personalAccessToken": PAT}},
+        "experiments_getexperiments": lambda i: {"query": {"model_id": model}},
+        "experiments_getexperimentbyid": lambda i: {"experiment_id": str(exp)},
+        "heartbeat_get": lambda i: {},
+        "models_getmodels": lambda i: {},
+        "models_getmodelbyid": lambda i: {"model_id": str(model)},
+        "models_deletemodel": lambda i: {"model_id": str(portal.add_model(f"Tmp{i}"))},
+        "models_getmodeltableschema": lambda i: {"model_id": str(model)},
+        "projects_upload": lambda i: {"body": {"projectName": f"Upload{i}"}},
+        "projects_deleteproject": lambda i: {"project_id": str(portal.add_model(f"Tmp{i}"))},
+        "projects_getprojectbyid": lambda i: {"project_id": str(model)},
+        "projects_get": lambda i: {},
+        "publishedplans_publishplan": lambda i: {"body": {"experimentRunId": run, "scenarioName": scen, "publishedName": f"plan{i}"}},
+        "publishedplans_uploadandpublishplan": lambda i: {"body": {"publishedName": f"plan{i}"}},
+        "publishedruns_publishexperimentrun": lambda i: {"body": {"experimentRunId": run, "publishedName": f"pub{i}"}},
+        "publishedruns_deletepublishedrun": lambda i: {"published_name": published(i)},
+        "runs_get": lambda i: {"query": {"experiment_id": exp}},
+        "runs_getrunbyid": lambda i: {"run_id": run},
+        "runs_deleterun": lambda i: {"run_id": fresh_run(i)},
+        "runs_cancelrun": lambda i: {"run_id": fresh_run(i, start=True), "body": {}},
+        "runs_setscenariostartendtype": lambda i: {"run_id": run, "body": {"runId": run, "isSpecificStartTime": False, "isSpecificEndTime": False}},
+        "runs_cancelrunwithadditionalrunid": lambda i: {"run_id": fresh_run(i, start=True), "additional_run_id": "1", "body": {}},
+        "runs_createexperimentrun": lambda i: {"body": {"modelId": model, "experimentRunName": f"Created{i}"}},
+        "runs_createexperimentrunfromexisting": lambda i: {"body": {"existingExperimentRunId": int(run), "experimentRunName": f"Copy{i}"}},
+        "runs_startexistingplanrun": lambda i: {"body": {"existingExperimentRunId": int(fresh_run(i)), "runPlan": True, "runReplications": False}},
+        "runs_startexperimentrun": lambda i: {"body": {"ExperimentId": exp, "Name": f"Exp{i}", "CreateInfo": {"Scenarios": [{"Name": "S1", "ReplicationsRequired": 1}]}}},
+        "scenarios_renameexperimentrunscenario": lambda i: {"run_id": run, "scenario_name": scen, "body": {"name": scen}},
+        "scenarios_setexperimentrunscenariocontrolvalue": lambda i: {"run_id": run, "scenario_name": scen, "control_name": "A", "body": {"value": str(i)}},
+        "scenarios_setexperimentrunscenariodataconnectorconfigurations": lambda i: {"run_id": run, "scenario_name": scen, "body": {}},
+        "scenarios_exporttablesandlogs": lambda i: {"run_id": run, "scenario_name": scen},
+        "scenarios_getexportbyid": lambda i: {"run_id": run, "export_id": export_id},
+        "scenarios_importexperimentrunscenariotabledata": lambda i: {"run_id": run, "scenario_name": scen},
+        "scenarios_getimportbyid": lambda i: {"run_id": run, "import_id": import_id},
+        "scenarios_setexperimentrunscenariotablevalue": lambda i: {**cell, "body": {"rowIndex": 0, "columnName": "Value", "value": str(i)}},
+        "scenarios_insertexperimentrunscenariotablerow": lambda i: {**cell, "row_index": "0"},
+        "scenarios_removeexperimentrunscenariotablerow": lambda i: {**cell, "row_index": "0"},
+        "scenarios_getscenarioresponsedatabyid": lambda i: {"run_id": run},
+        "scenarios_getscenariotablerowdata": lambda i: cell,
+        "portal_request": lambda i: {"method": "GET", "path": f"/api/v1/runs/{run}"},
+        "describe_pysimio": None,  # takes no params model
+        "portal_authenticate_pysimio": lambda i: {"personal_access_token": PAT},
+        "list_models": lambda i: {},
+        "get_model_id_by_project": lambda i: {"project_name": project},
+        "resolve_ids": lambda i: {"project_name": project, "experiment_name": "__Default", "run_name": portal.runs[int(run)]["name"]},
+        "portal_health": lambda i: {"probe": True},
+        "create_or_replace_plan_run": lambda i: {**plan, "plan_name": f"Plan{i}", "controls": {"A": i, "B": 2}},
+        "sweep_plan_runs": lambda i: {**plan, "name_prefix": f"Sweep{i}", "grid": {"A": [1, 2], "B": [3, 4]}},
+        "set_controls_bulk": lambda i: {"run_id": run, "scenario_name": scen, "controls": {f"C{k}": k + i for k in range(16)}},
+        "export_scenarios": lambda i: {"run_id": run, "interval_secs": 0.5},
+        "import_scenarios": lambda i: {"run_id": run, "interval_secs": 0.5},
+        "download_scenario_table": lambda i: cell,
+        "table_query": lambda i: {**cell, "group_by": ["Category"], "aggregates": ["count(*)", "mean(Value)", "p95(Quantity)"]},
+        "sync_scenario_table": lambda i: {**cell, "rows": desired_rows(i), "key_columns": ["Id"]},
+        "compare_runs": lambda i: {"run_ids": [str(r) for r in runs], "objectives": {"Response1": "max", "Response2": "min"}},
+        # Job tools follow one background plan run (job_id filled in by main)
+        "get_job": lambda i: {"job_id": JOB["id"]},
+        "list_jobs": lambda i: {},
+        "wait_job": lambda i: {"job_id": JOB["id"], "timeout_secs": 10},
+        "cancel_job": lambda i: {"job_id": JOB["id"]},
+    }
+
+JOB: Dict[str, str] = {}
+WORKFLOWS = {"create_or_replace_plan_run", "sweep_plan_runs", "export_scenarios", "import_scenarios",
+             "sync_scenario_table", "compare_runs", "wait_job"}
+
+async def call(mcp, name: str, args: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        r = await mcp.call_tool(name, {} if args is None else {"params": args})
+    except Exception as e:
+        return {"ok": False, "error": {"message": str(e)}}
+    content = r[0] if isinstance(r, tuple) else r
+    try:
+        out = json.loads(content[0].text)
+    except (IndexError, ValueError):
+        return {"ok": False, "error": {"message": "non-JSON result"}}
+    return out if isinstance(out, dict) else {"ok": True}
+
+async def bench_tool(mcp, portal: MockPortal, name: str, args_for, repeat: int) -> Dict[str, Any]:
+    await call(mcp, name, args_for(-1) if args_for else None)  # warm-up: imports, tokens, caches
+    before = portal.stats()
+    times, oks, error = [], 0, None
+    for i in range(repeat):
+        args = args_for(i) if args_for else None
+        t0 = time.perf_counter()
+        out = await call(mcp, name, args)
+        times.append(time.perf_counter() - t0)
+        if out.get("ok") is not False:
+            oks += 1
+        elif error is None:
+            error = str((out.get("error") or {}).get("message", out))[:120]
+    after = portal.stats()
+    row = {
+        "tool": name, "calls": repeat, "ok": oks,
+        "p50_ms": round(percentile(times, 50) * 1000, 1), "p95_ms": round(percentile(times, 95) * 1000, 1),
+        "max_ms": round(max(times) * 1000, 1),
+        "requests_per_call": round((after["requests"] - before["requests"]) / repeat, 2),
+        "auth_per_call": round((after["auth"] - before["auth"]) / repeat, 2),
+    }
+    if error:
+        row["error"] = error
+    return row
+
+async def bench_concurrency(mcp, portal: MockPortal, name: str, args_for, concurrency: int, calls: int) -> Dict[str, Any]:
+    sem = asyncio.Semaphore(concurrency)
+    times: List[float] = []
+    failed = 0
+
+    async def one(i: int) -> None:
+        nonlocal failed
+        async with sem:
+            t0 = time.perf_counter()
+            out = await call(mcp, name, args_for(i))
+            times.append(time.perf_counter() - t0)
+            failed += out.get("ok") is False
+
+    before = portal.stats()
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    wall = time.perf_counter() - t0
+    after = portal.stats()
+    return {
+        "tool": name, "concurrency": concurrency, "calls": calls, "failed": failed,
+        "calls_per_sec": round(calls / wall, 1),
+        "p50_ms": round(percentile(times, 50) * 1000, 1), "p95_ms": round(percentile(times, 95) * 1000, 1),
+        "requests_per_call": round((after["requests"] - before["requests"]) / calls, 2),
+    }
+
+def print_table(title: str, rows: List[Dict[str, Any]]) -> None:
+    print(f"\n[{title}]")
+    if not rows:
+        return
+    cols = [c for c in rows[0] if c != "error"]
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in cols}
+    print("  ".join(c.ljust(widths[c]) for c in cols))
+    for r in rows:
+        line = "  ".join(str(r.get(c, "")).ljust(widths[c]) for c in cols)
+        print(line + (f"  ! {r['error']}" if r.get("error") else ""))
+
+async def run(args, portal: MockPortal) -> Dict[str, Any]:
+    from mcp_app import mcp
+    import server  # noqa: F401  registers every tool
+
+    specs = fixtures(portal)
+    names = [t.name for t in await mcp.list_tools()]
+    if args.tools:
+        names = [n for n in names if n in args.tools.split(",")]
+    missing = [n for n in names if n not in specs]
+    if missing:
+        print(f"No fixture for: {missing} (skipped)")
+
+    job_tools = [n for n in names if n in ("get_job", "list_jobs", "wait_job", "cancel_job")]
+    if job_tools:
+        started = await call(mcp, "create_or_replace_plan_run", {
+            "project_name": portal.models[next(iter(portal.models))]["projectName"],
+            "plan_name": "BenchJob", "background": True, "interval_secs": 0.5})
+        JOB["id"] = started.get("job_id", "none")
+
+    tools = []
+    for name in names:
+        if name in specs:
+            repeat = args.workflow_repeat if name in WORKFLOWS else args.repeat
+            tools.append(await bench_tool(mcp, portal, name, specs[name], repeat))
+            if args.verbose:
+                print(tools[-1])
+    print_table("tools", tools)
+
+    conc = []
+    for name in [n for n in READ_TOOLS if n in names]:
+        for c in args.concurrency:
+            conc.append(await bench_concurrency(mcp, portal, name, specs[name], c, max(args.calls, c)))
+    print_table("concurrency", conc)
+    return {"tools": tools, "concurrency": conc}
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark every tool against the mock portal")
+    ap.add_argument("--repeat", type=int, default=5, help="Timed calls per tool")
+    ap.add_argument("--workflow-repeat", type=int, default=2, help="Timed calls per polling workflow")
+    ap.add_argument("--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[1, 8, 32])
+    ap.add_argument("--calls", type=int, default=100, help="Calls per concurrency level")
+    ap.add_argument("--tools", help="Comma-separated subset of tools")
+    ap.add_argument("--client-rate", type=float, default=1000.0, help="SIMIO_RATE_PER_SEC/BURST for the clients")
+    ap.add_argument("--json", help="Also write results here")
+    ap.add_argument("--verbose", action="store_true")
+    for f in fields(MockConfig):
+        ap.add_argument(f"--{f.name.replace('_', '-')}", type=type(f.default),
+                        default=0.5 if f.name == "run_secs" else f.default, help=f"mock portal {f.name}")
+    args = ap.parse_args()
+    config = MockConfig(**{f.name: getattr(args, f.name) for f in fields(MockConfig)})
+
+    portal = MockPortal(config).start()
+    # Before any repo module is imported: they read these settings at import time
+    os.environ.update({
+        "SIMIO_PORTAL_URL": portal.url,
+        "PERSONAL_ACCESS_TOKEN": PAT,
+        "SIMIO_RATE_PER_SEC": str(args.client_rate),
+        "SIMIO_RATE_BURST": str(args.client_rate),
+        "SIMIO_DOWNLOAD_DIR": tempfile.mkdtemp(prefix="simio_bench_"),
+        "SIMIO_LAZY_TOOLS": "0",  # keep tool_manifest.json keyed to the server's own settings
+    })
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    try:
+        results = asyncio.run(run(args, portal))
+    finally:
+        portal.stop()
+    stats = portal.stats()
+    print(f"\n[mock portal] {stats['requests']} requests, {stats['auth']} auth calls; config {asdict(config)}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": asdict(config), "client_rate": args.client_rate, **results, "portal": stats}, f, indent=2)
+        print(f"Wrote {args.json}")
+
+if __name__ == "__main__":
+    main()
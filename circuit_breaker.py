@@ -0,0 +1,157 @@
+# circuit_breaker.py
+"""
+Per-endpoint-family circuit breakers for the REST clients.
+
+Circuits are keyed by (portal URL, endpoint family), the family being the same
+first path segment the rate limiter uses (runs, scenarios, models, ...). A closed
+circuit records the outcome of each HTTP attempt over a sliding window of the
+last SIMIO_BREAKER_WINDOW attempts. A failure is a connection/transport error or
+a 408/5xx; 429s and other 4xx don't count. An attempt slower than
+SIMIO_BREAKER_SLOW_SECS counts as slow. Once at least SIMIO_BREAKER_MIN_CALLS
+are recorded, the circuit opens when the failure rate reaches
+SIMIO_BREAKER_ERROR_RATE or the slow rate reaches SIMIO_BREAKER_SLOW_RATE.
+
+While open, requests fail at once with CircuitOpenError (carrying
+retry_after_secs) instead of waiting out timeouts and retries. After the open
+period, one caller gets the half-open slot. It checks the portal with
+heartbeat_get and then sends its own request as the trial. A failed probe or
+trial reopens the circuit for twice as long (capped at
+SIMIO_BREAKER_MAX_OPEN_SECS). A successful trial closes it.
+SIMIO_BREAKER_WINDOW=0 disables the breakers.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from rate_limit import endpoint_class
+
+BREAKER_WINDOW = int(os.getenv("SIMIO_BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.getenv("SIMIO_BREAKER_MIN_CALLS", "5"))
+BREAKER_ERROR_RATE = float(os.getenv("SIMIO_BREAKER_ERROR_RATE", "0.5"))
+BREAKER_SLOW_SECS = float(os.getenv("SIMIO_BREAKER_SLOW_SECS", "20"))
+BREAKER_SLOW_RATE = float(os.getenv("SIMIO_BREAKER_SLOW_RATE", "0.8"))
+BREAKER_OPEN_SECS = float(os.getenv("SIMIO_BREAKER_OPEN_SECS", "15"))
+BREAKER_MAX_OPEN_SECS = float(os.getenv("SIMIO_BREAKER_MAX_OPEN_SECS", "120"))
+
+# Never broken: the heartbeat is the probe, and auth failures are handled by token_cache
+EXEMPT_FAMILIES = frozenset({"heartbeat", "auth"})
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, message: str, retry_after_secs: float):
+        super().__init__(message)
+        self.retry_after_secs = round(retry_after_secs, 1)
+
+@dataclass
+class _Circuit:
+    state: str = "closed"  # closed | open | half_open
+    outcomes: Deque[Tuple[bool, bool]] = field(default_factory=deque)  # (failed, slow)
+    open_secs: float = BREAKER_OPEN_SECS
+    retry_at: float = 0.0
+    opened: int = 0
+    rejected: int = 0
+    reason: str = ""
+
+class CircuitBreakers:
+    def __init__(self, window: int = BREAKER_WINDOW):
+        self.window = window
+        self._circuits: Dict[Tuple[str, str], _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, base_url: str, path: str) -> Optional[_Circuit]:
+        family = endpoint_class(path)
+        if self.window <= 0 or family in EXEMPT_FAMILIES:
+            return None
+        key = (base_url.rstrip("/"), family)
+        c = self._circuits.get(key)
+        if c is None:
+            c = self._circuits[key] = _Circuit(outcomes=deque(maxlen=self.window))
+        return c
+
+    def _open(self, c: _Circuit, reason: str, backoff: bool) -> None:
+        if backoff:
+            c.open_secs = min(BREAKER_MAX_OPEN_SECS, c.open_secs * 2)
+        c.state = "open"
+        c.retry_at = time.monotonic() + c.open_secs
+        c.opened += 1
+        c.reason = reason
+        c.outcomes.clear()
+
+    def before(self, base_url: str, path: str) -> bool:
+        """Raise CircuitOpenError while open; True means the caller holds the half-open slot and must probe."""
+        with self._lock:
+            c = self._circuit(base_url, path)
+            if c is None or c.state == "closed":
+                return False
+            now = time.monotonic()
+            if now >= c.retry_at:
+                # Claim the slot; if its holder never reports back, it frees up after another open period
+                c.state = "half_open"
+                c.retry_at = now + c.open_secs
+                return True
+            c.rejected += 1
+            wait = c.retry_at - now
+            message = f"Circuit open for '{endpoint_class(path)}' on {base_url} ({c.reason}); retry in {wait:.0f}s"
+        raise CircuitOpenError(message, wait)
+
+    def probe_done(self, base_url: str, path: str, ok: bool) -> None:
+        """Heartbeat result for the half-open slot; a failed probe reopens the circuit and raises."""
+        if ok:
+            return
+        with self._lock:
+            c = self._circuit(base_url, path)
+            if c is None:
+                return
+            self._open(c, "heartbeat probe failed", backoff=True)
+            wait = c.open_secs
+        raise CircuitOpenError(f"Portal heartbeat failed; circuit for '{endpoint_class(path)}' on {base_url} stays open", wait)
+
+    def record(self, base_url: str, path: str, failed: bool, elapsed_secs: float) -> None:
+        with self._lock:
+            c = self._circuit(base_url, path)
+            if c is None or c.state == "open":
+                return
+            slow = elapsed_secs >= BREAKER_SLOW_SECS
+            if c.state == "half_open":
+                if failed or slow:
+                    self._open(c, "trial request " + ("failed" if failed else "was slow"), backoff=True)
+                else:
+                    c.state, c.open_secs, c.reason = "closed", BREAKER_OPEN_SECS, ""
+                return
+            c.outcomes.append((failed, slow))
+            n = len(c.outcomes)
+            if n < BREAKER_MIN_CALLS:
+                return
+            failures = sum(f for f, _ in c.outcomes)
+            slows = sum(s for _, s in c.outcomes)
+            if failures / n >= BREAKER_ERROR_RATE:
+                self._open(c, f"{failures} of the last {n} calls failed", backoff=False)
+            elif slows / n >= BREAKER_SLOW_RATE:
+                self._open(c, f"{slows} of the last {n} calls took over {BREAKER_SLOW_SECS:.0f}s", backoff=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "enabled": self.window > 0,
+                "circuits": [
+                    {
+                        "portal": k[0],
+                        "endpoint_family": k[1],
+                        "state": c.state,
+                        "recent_calls": len(c.outcomes),
+                        "recent_failures": sum(f for f, _ in c.outcomes),
+                        "retry_in_secs": round(max(0.0, c.retry_at - now), 1) if c.state != "closed" else 0.0,
+                        "times_opened": c.opened,
+                        "rejected": c.rejected,
+                        "reason": c.reason,
+                    }
+                    for k, c in self._circuits.items()
+                ],
+            }
+
+# Shared by the sync and async clients
+circuit_breaker = CircuitBreakers()
@@ -0,0 +1,270 @@
+# columnar.py
+"""
+Columnar (NumPy) filter / projection / group-by / aggregate over table rows.
+
+Rows arrive page by page (see table_io). Each page is reduced straight away to
+the columns the query references and to the rows that pass its filters, and is
+converted to NumPy arrays. Only those arrays are kept; group-bys and aggregates
+then run vectorized over them. Numeric columns are int64, or float64 with NaN
+for nulls, and everything else is an object array. The portal often sends
+cells as text, so a column whose non-null values all parse as numbers (empty
+strings count as null) is numeric too.
+
+Aggregates are written as "func(column) [as alias]":
+  count(*) | count(col) | count_distinct(col) | sum | mean | min | max | std |
+  median | pNN (percentile, e.g. p95)
+
+NumPy is an optional dependency; it is imported on first use.
+"""
+
+import operator
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from helpers import MCPConfigError, MCPValidationError
+
+_AGG_RE = re.compile(r"^\s*(\w+)\s*\(\s*([^)]*?)\s*\)\s*(?:as\s+(\w+))?\s*$", re.IGNORECASE)
+_NUMERIC_FUNCS = {"sum", "mean", "min", "max", "std", "median"}
+_COMPARE = {"==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+_NUMBER_RE = re.compile(r"^\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*$")
+_INT_RE = re.compile(r"^\s*[+-]?\d+\s*$")
+FILTER_OPS = {"==", "!=", "<", "<=", ">", ">=", "in", "not_in", "contains", "is_null", "not_null"}
+
+def require_numpy():
+    try:
+        import numpy  # optional; only needed for table_query / compare_runs
+    except ImportError:
+        raise MCPConfigError("This tool needs numpy (pip install numpy)")
+    return numpy
+
+@dataclass
+class Aggregate:
+    func: str
+    column: Optional[str]  # None for count(*)
+    alias: str
+
+    @classmethod
+    def parse(cls, spec: str) -> "Aggregate":
+        m = _AGG_RE.match(spec)
+        if not m:
+            raise MCPValidationError(f"Bad aggregate '{spec}'; expected e.g. 'sum(Cost)' or 'p95(WaitTime) as p95_wait'")
+        func, column, alias = m.group(1).lower(), m.group(2), m.group(3)
+        if not (func in _NUMERIC_FUNCS or func in {"count", "count_distinct"} or re.fullmatch(r"p\d{1,2}(\.\d+)?", func)):
+            raise MCPValidationError(f"Unknown aggregate function '{func}'")
+        if column in ("", "*"):
+            if func != "count":
+                raise MCPValidationError(f"{func}() needs a column")
+            column = None
+        return cls(func=func, column=column, alias=alias or (f"{func}({column})" if column else "count"))
+
+def _kind(v: Any) -> str:
+    """'int', 'float', 'null' or 'text' for one cell, reading numeric strings as numbers."""
+    if v is None or v == "":
+        return "null"
+    if isinstance(v, bool):
+        return "text"
+    if isinstance(v, int):
+        return "int"
+    if isinstance(v, float):
+        return "float"
+    if isinstance(v, str) and _NUMBER_RE.match(v):
+        return "int" if _INT_RE.match(v) else "float"
+    return "text"
+
+def to_array(values: Sequence[Any]):
+    """int64 / float64 (NaN for nulls) when every value is numeric (or a numeric string) or null, otherwise an object array."""
+    np = require_numpy()
+    per_value = [_kind(v) for v in values]
+    kinds = set(per_value)
+    if "text" in kinds:
+        return np.array(values, dtype=object)
+    if kinds <= {"int"}:
+        return np.array([int(v) for v in values], dtype=np.int64)
+    return np.array([np.nan if k == "null" else float(v) for k, v in zip(per_value, values)], dtype=np.float64)
+
+def _is_numeric(arr) -> bool:
+    return arr.dtype.kind in "fi"
+
+def _mask(arr, op: str, value: Any):
+    np = require_numpy()
+    if op == "is_null":
+        return np.isnan(arr) if _is_numeric(arr) else np.array([v is None for v in arr], dtype=bool)
+    if op == "not_null":
+        return ~_mask(arr, "is_null", None)
+    if op in ("in", "not_in"):
+        if not isinstance(value, (list, tuple)):
+            raise MCPValidationError(f"'{op}' needs a list value")
+        try:
+            m = np.isin(arr, np.array(value, dtype=np.float64 if _is_numeric(arr) else object))
+        except (TypeError, ValueError):
+            raise MCPValidationError(f"Column is numeric; cannot compare with {value!r}")
+        return m if op == "in" else ~m
+    if op == "contains":
+        needle = str(value).casefold()
+        return np.array([v is not None and needle in str(v).casefold() for v in arr], dtype=bool)
+    if _is_numeric(arr):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise MCPValidationError(f"Column is numeric; cannot compare with {value!r}")
+    elif op not in ("==", "!="):
+        # Ordered comparison on a text column: compare as strings, nulls never match
+        return np.array([v is not None and _cmp(str(v), op, str(value)) for v in arr], dtype=bool)
+    with np.errstate(invalid="ignore"):
+        return _cmp(arr, op, value)
+
+def _cmp(a, op: str, b):
+    return _COMPARE[op](a, b)
+
+class ColumnarTable:
+    """Accumulates pages as NumPy columns, keeping only the given columns and the rows passing `filters`."""
+
+    def __init__(self, columns: Optional[Iterable[str]], filters: Sequence[Dict[str, Any]] = ()):
+        self.wanted = None if columns is None else list(dict.fromkeys(columns))
+        self.filters = list(filters)
+        for f in self.filters:
+            if f.get("op") not in FILTER_OPS:
+                raise MCPValidationError(f"Unknown filter op '{f.get('op')}'; use one of {sorted(FILTER_OPS)}")
+        self._chunks: Dict[str, List[Any]] = {}
+        self.scanned = 0
+        self.matched = 0
+
+    def add_page(self, rows: List[Dict[str, Any]]) -> None:
+        np = require_numpy()
+        if not rows:
+            return
+        self.scanned += len(rows)
+        if self.wanted is None:
+            self.wanted = list(dict.fromkeys(k for r in rows for k in r))
+        needed = list(dict.fromkeys([*self.wanted, *(f["column"] for f in self.filters)]))
+        cols = {c: to_array([r.get(c) for r in rows]) for c in needed}
+        keep = np.ones(len(rows), dtype=bool)
+        for f in self.filters:
+            keep &= _mask(cols[f["column"]], f["op"], f.get("value"))
+        self.matched += int(keep.sum())
+        for c in self.wanted:
+            self._chunks.setdefault(c, []).append(cols[c][keep])
+
+    def columns(self) -> Dict[str, Any]:
+        """Concatenate the pages; a column numeric on some pages and text on others becomes object."""
+        np = require_numpy()
+        out = {}
+        for c in self.wanted or []:
+            chunks = self._chunks.get(c, [])
+            if not chunks:
+                out[c] = np.array([], dtype=np.float64)
+            elif all(_is_numeric(ch) for ch in chunks):
+                out[c] = np.concatenate(chunks)
+            else:
+                out[c] = np.concatenate([ch.astype(object) if _is_numeric(ch) else ch for ch in chunks])
+        return out
+
+def _py(v: Any) -> Any:
+    """NumPy scalar -> JSON-friendly Python value (NaN -> None)."""
+    if hasattr(v, "item"):
+        v = v.item()
+    if isinstance(v, float) and v != v:
+        return None
+    return v
+
+def _aggregate(np, agg: Aggregate, values, gid, n_groups: int, order, bounds):
+    """One aggregate for every group; gid is each row's group index."""
+    if agg.func == "count" and values is None:
+        return np.bincount(gid, minlength=n_groups)
+    numeric = _is_numeric(values)
+    valid = ~np.isnan(values) if numeric else np.array([v is not None for v in values], dtype=bool)
+    if agg.func == "count":
+        return np.bincount(gid[valid], minlength=n_groups)
+    if agg.func == "count_distinct":
+        pairs = {(g, v) for g, v in zip(gid[valid].tolist(), values[valid].tolist())}
+        return np.bincount(np.array([g for g, _ in pairs], dtype=np.int64), minlength=n_groups)
+    if not numeric:
+        raise MCPValidationError(f"{agg.func}() needs a numeric column; '{agg.column}' is not")
+    counts = np.bincount(gid[valid], minlength=n_groups).astype(np.float64)
+    sums = np.bincount(gid[valid], weights=values[valid], minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if agg.func == "sum":
+            return sums
+        if agg.func == "mean":
+            return sums / counts
+        if agg.func == "std":
+            sq = np.bincount(gid[valid], weights=values[valid] ** 2, minlength=n_groups)
+            return np.sqrt(np.maximum(sq / counts - (sums / counts) ** 2, 0.0))
+    # Order statistics: per-group slices of the group-sorted values
+    parts = np.split(values[order], bounds)
+    if agg.func in ("min", "max"):
+        fn = np.nanmin if agg.func == "min" else np.nanmax
+        return np.array([fn(p) if np.any(~np.isnan(p)) else np.nan for p in parts])
+    q = 50.0 if agg.func == "median" else float(agg.func[1:])
+    return np.array([np.nanpercentile(p, q) if np.any(~np.isnan(p)) else np.nan for p in parts])
+
+def query(
+    table: ColumnarTable,
+    *,
+    group_by: Sequence[str] = (),
+    aggregates: Sequence[Aggregate] = (),
+    order_by: Sequence[str] = (),
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """
+    Run group-by/aggregates (or a plain projection) over the accumulated table.
+    order_by names output columns; prefix with '-' for descending.
+    """
+    np = require_numpy()
+    cols = table.columns()
+    n = len(next(iter(cols.values()))) if cols else 0
+    if aggregates or group_by:
+        if group_by:
+            codes, uniques = [], []
+            for g in group_by:
+                vals = cols[g]
+                keys = np.array(["\0null" if v is None else repr(v) for v in vals], dtype=object) if not _is_numeric(vals) else vals
+                _, first, inv = np.unique(keys, return_index=True, return_inverse=True)
+                uniques.append(vals[first])  # original value of each key (keys may be repr strings)
+                codes.append(inv.reshape(-1))
+            if n:
+                combo, gid = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+                gid = gid.reshape(-1)
+            else:
+                combo, gid = np.empty((0, len(codes)), dtype=np.int64), np.empty(0, dtype=np.int64)
+            out = {g: uniques[i][combo[:, i]] for i, g in enumerate(group_by)}
+            n_groups = len(combo)
+        else:
+            gid = np.zeros(n, dtype=np.int64)
+            out, n_groups = {}, 1
+        order = np.argsort(gid, kind="stable")
+        bounds = np.searchsorted(gid[order], np.arange(1, n_groups))
+        for agg in aggregates:
+            values = None if agg.column is None else cols[agg.column]
+            out[agg.alias] = _aggregate(np, agg, values, gid, n_groups, order, bounds)
+        n_out = n_groups
+    else:
+        out, n_out = cols, n
+
+    idx = np.arange(n_out)
+    for key in reversed(list(order_by)):
+        desc = key.startswith("-")
+        name = key.lstrip("-+")
+        if name not in out:
+            raise MCPValidationError(f"order_by column '{name}' is not in the output ({sorted(out)})")
+        col = out[name][idx]
+        if _is_numeric(col):
+            # NaN sorts last both ways
+            k = np.where(np.isnan(col), np.inf, -col if desc else col)
+            idx = idx[np.argsort(k, kind="stable")]
+        else:
+            k = np.array(["" if v is None else str(v) for v in col], dtype=object)
+            o = np.argsort(k, kind="stable")
+            idx = idx[o[::-1] if desc else o]
+    shown = idx[:limit]
+    names = list(out)
+    rows = [{c: _py(out[c][i]) for c in names} for i in shown]
+    return {
+        "columns": names,
+        "rows": rows,
+        "row_count": n_out,
+        "truncated": n_out > len(rows),
+        "scanned_rows": table.scanned,
+        "matched_rows": table.matched,
+    }
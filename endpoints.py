@@ -0,0 +1,191 @@
+# endpoints.py
+"""
+Endpoint descriptor table for the Simio Portal REST API (from swagger.json, 2025-09-05).
+
+Each Endpoint gives the operation name, HTTP method, path template and whether it
+takes a JSON body. `mode` selects how the clients send it:
+  request  plain request (GETs are coalesced by singleflight.py)
+  cached   GET served from metadata_cache.py
+  mutate   request that invalidates metadata_cache.py and name_index.py afterwards
+Both REST clients add one method per entry (`endpoint_methods`), and each of those
+methods goes through the client's single `call_endpoint` dispatcher. The MCP tools in
+api_tools_rest_generated.py are built from the same table. `endpoint_stats` counts
+calls, failures and latency per endpoint for `portal_health`.
+"""
+
+import inspect
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from string import Formatter
+from typing import Any, Dict, Optional, Tuple
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    body: Optional[str] = None  # None (no body) | "required" (key required, may be null) | "optional"
+    mode: str = "request"  # request | cached | mutate
+    summary: str = ""
+
+    @cached_property
+    def path_params(self) -> Tuple[str, ...]:
+        return tuple(field for _, field, _, _ in Formatter().parse(self.path) if field)
+
+    @cached_property
+    def signature(self) -> inspect.Signature:
+        """The client method signature: path parameters, then query (and body)."""
+        params = [inspect.Parameter(p, inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=str) for p in self.path_params]
+        params.append(inspect.Parameter("query", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None, annotation=Optional[dict]))
+        if self.body:
+            params.append(inspect.Parameter("body", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None, annotation=Optional[dict]))
+        return inspect.Signature(params)
+
+    def bind(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[str, Optional[dict], Optional[dict]]:
+        """(path, query params, JSON body) for a call with these arguments; TypeError if they don't fit."""
+        bound = self.signature.bind(*args, **kwargs).arguments
+        path = self.path.format(**{p: bound[p] for p in self.path_params})
+        return path, bound.get("query") or None, bound.get("body")
+
+ENDPOINTS: Dict[str, Endpoint] = {e.name: e for e in (
+    Endpoint("requesttoken_postrestapitokenrequest", "POST", "/api/auth", body="required"),
+    Endpoint("experiments_getexperiments", "GET", "/api/v1/experiments", mode="cached",
+             summary="Retrieves a collection of experiments."),
+    Endpoint("experiments_getexperimentbyid", "GET", "/api/v1/experiments/{experiment_id}",
+             summary="Retrieves an experiment using its corresponding ID."),
+    Endpoint("heartbeat_get", "GET", "/api/v1/heartbeat",
+             summary="Verifies server status."),
+    Endpoint("models_getmodels", "GET", "/api/v1/models", mode="cached",
+             summary="Retrieves a collection of models."),
+    Endpoint("models_getmodelbyid", "GET", "/api/v1/models/{model_id}",
+             summary="Retrieves a model using its corresponding ID."),
+    Endpoint("models_deletemodel", "DELETE", "/api/v1/models/{model_id}", mode="mutate",
+             summary="Deletes the model matching the specified model ID."),
+    Endpoint("models_getmodeltableschema", "GET", "/api/v1/models/{model_id}/table-schemas",
+             summary="Retrieves a collection of model table schemas."),
+    Endpoint("projects_upload", "POST", "/api/v1/projects/upload", body="optional", mode="mutate",
+             summary="Uploads and saves the project to the specified named project."),
+    Endpoint("projects_deleteproject", "DELETE", "/api/v1/projects/{project_id}", mode="mutate",
+             summary="Deletes the project matching the specified project ID."),
+    Endpoint("projects_getprojectbyid", "GET", "/api/v1/projects/{project_id}",
+             summary="Retrieves a project using its corresponding ID."),
+    Endpoint("projects_get", "GET", "/api/v1/projects", mode="cached",
+             summary="Retrieves a collection of projects."),
+    Endpoint("publishedplans_publishplan", "POST", "/api/v1/published-plans/publish-plan", body="required",
+             summary="Publishes the plan results of a single scenario of an experiment run to a named published plan result."),
+    Endpoint("publishedplans_uploadandpublishplan", "POST", "/api/v1/published-plans/upload-and-publish-plan", body="optional", mode="mutate",
+             summary="Uploads and publishes the plan results of a single scenario of an experiment run to a named published plan result."),
+    Endpoint("publishedruns_publishexperimentrun", "POST", "/api/v1/published-runs", body="required",
+             summary="Publishes an existing experiment run as a named published experiment result."),
+    Endpoint("publishedruns_deletepublishedrun", "DELETE", "/api/v1/published-runs/{published_name}",
+             summary="Deletes a published experiment run based on the specified publish name."),
+    Endpoint("runs_get", "GET", "/api/v1/runs",
+             summary="""Retrieves a collection of 'top level' experiment runs, those created as ExperimentRuns,
+or those started to run replications for an existing experiment. Note that plan only runs will show up
+as child runs in AdditionalRunsStatus."""),
+    Endpoint("runs_getrunbyid", "GET", "/api/v1/runs/{run_id}",
+             summary="Retrieves a run using its corresponding ID."),
+    Endpoint("runs_deleterun", "DELETE", "/api/v1/runs/{run_id}", mode="mutate",
+             summary="Deletes the experiment run matching the specified experiment run ID."),
+    Endpoint("runs_cancelrun", "PATCH", "/api/v1/runs/{run_id}", body="required",
+             summary="Cancels a currently running experiment run using the provided experiment run ID."),
+    Endpoint("runs_setscenariostartendtype", "PUT", "/api/v1/runs/{run_id}/time-options", body="required",
+             summary="Sets the start and end time options for an experiment run."),
+    Endpoint("runs_cancelrunwithadditionalrunid", "PATCH", "/api/v1/runs/{run_id}/additional-runs/{additional_run_id}", body="required",
+             summary="Cancels a currently running plan run using the provided parent experiment run ID and additional run ID."),
+    Endpoint("runs_createexperimentrun", "POST", "/api/v1/runs/create", body="required",
+             summary="Creates a new plan run. (PLAN RUNS ONLY)"),
+    Endpoint("runs_createexperimentrunfromexisting", "POST", "/api/v1/runs/create-from-existing", body="required",
+             summary="Creates a new plan run from an existing plan run. (PLAN RUNS ONLY)"),
+    Endpoint("runs_startexistingplanrun", "POST", "/api/v1/runs/start-existing-plan-run", body="required",
+             summary="""Starts an existing plan run. The ID returned here can be retrieved by making a GET request to /runs and 
+passing in the ExperimentId. In the results, the "additionalRunsStatus" will contain the ID returned
+from this call. To run Risk Analysis, make sure runReplications is true. (PLAN RUNS ONLY)"""),
+    Endpoint("runs_startexperimentrun", "POST", "/api/v1/runs/start-experiment-run", body="required",
+             summary="""Creates and starts an experiment run (NOT FOR PLAN RUNS).
+Once the project is uploaded, you can get the experiment id /api/v1/experiments/{model_id}
+To update control parameters, you would add them to the "scenarios" section in the json
+and run it again.
+These following json contains the minimum parameters required to run an experiment.
+{
+    "ExperimentId": ExperimentId,
+    "Name": "ExperimentName",
+    "CreateInfo": {
+        "Scenarios": [
+        {
+        "Name": "ScenarioName",
+        "ReplicationsRequired": 1
+        }
+        ]
+    }    
+}"""),
+    Endpoint("scenarios_renameexperimentrunscenario", "PUT", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/name", body="required",
+             summary="Renames the specified scenario of the experiment run."),
+    Endpoint("scenarios_setexperimentrunscenariocontrolvalue", "PUT", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/control-values/{control_name}", body="required",
+             summary="Modifies a control value for the specified scenario of the experiment run."),
+    Endpoint("scenarios_setexperimentrunscenariodataconnectorconfigurations", "PATCH", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/data-connector-configurations", body="required",
+             summary="Modifies the active configuration names of data connector configurations for a plan run scenario."),
+    Endpoint("scenarios_exporttablesandlogs", "POST", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/exports",
+             summary="Begins an export of table and log data using the export bindings associated with the scenario."),
+    Endpoint("scenarios_getexportbyid", "GET", "/api/v1/runs/{run_id}/scenarios/exports/{export_id}",
+             summary="Retrieves the status of an export using its ID."),
+    Endpoint("scenarios_importexperimentrunscenariotabledata", "POST", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/imports",
+             summary="Begins an import of table data using the import bindings associated with the scenario."),
+    Endpoint("scenarios_getimportbyid", "GET", "/api/v1/runs/{run_id}/scenarios/imports/{import_id}",
+             summary="Retrieves the status of an import using its ID."),
+    Endpoint("scenarios_setexperimentrunscenariotablevalue", "PATCH", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/table-data/{table_name}/rows", body="required",
+             summary="Updates a value in an experiment run scenario table."),
+    Endpoint("scenarios_insertexperimentrunscenariotablerow", "POST", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/table-data/{table_name}/rows/{row_index}",
+             summary="Inserts a row in an experiment run scenario table at a specified zero-based row index."),
+    Endpoint("scenarios_removeexperimentrunscenariotablerow", "DELETE", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/table-data/{table_name}/rows/{row_index}",
+             summary="Removes a row in an experiment run scenario table at a specified zero-based row index."),
+    Endpoint("scenarios_getscenarioresponsedatabyid", "GET", "/api/v1/runs/{run_id}/scenarios",
+             summary="Retrieves an experiments run, control values and response data using its corresponding experiment run ID."),
+    Endpoint("scenarios_getscenariotablerowdata", "GET", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/table-data/{table_name}",
+             summary="Retrieves a collection of table row data from an experiment run scenario table."),
+)}
+
+def _method(ep: Endpoint, is_async: bool):
+    if is_async:
+        async def method(self, *args, **kwargs):
+            return await self.call_endpoint(ep.name, *args, **kwargs)
+    else:
+        def method(self, *args, **kwargs):
+            return self.call_endpoint(ep.name, *args, **kwargs)
+    method.__name__ = method.__qualname__ = ep.name
+    method.__doc__ = ep.summary
+    self_param = inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    method.__signature__ = ep.signature.replace(parameters=[self_param, *ep.signature.parameters.values()])
+    return method
+
+def endpoint_methods(cls):
+    """Class decorator: one method per endpoint, each calling cls.call_endpoint."""
+    is_async = inspect.iscoroutinefunction(cls.call_endpoint)
+    for ep in ENDPOINTS.values():
+        setattr(cls, ep.name, _method(ep, is_async))
+    return cls
+
+class EndpointStats:
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, elapsed_secs: float, failed: bool) -> None:
+        with self._lock:
+            s = self._stats.setdefault(name, {"calls": 0, "failures": 0, "total_secs": 0.0, "max_secs": 0.0})
+            s["calls"] += 1
+            s["failures"] += failed
+            s["total_secs"] += elapsed_secs
+            s["max_secs"] = max(s["max_secs"], elapsed_secs)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {"calls": s["calls"], "failures": s["failures"],
+                       "mean_secs": round(s["total_secs"] / s["calls"], 4), "max_secs": round(s["max_secs"], 4)}
+                for name, s in self._stats.items()
+            }
+
+# Shared by the sync and async clients
+endpoint_stats = EndpointStats()
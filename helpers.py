@@ -1,9 +1,10 @@
 # helpers.py
+import functools
+import inspect
 import logging
 import os
 import threading
 from dotenv import load_dotenv
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
 
 # --- env & logging ---
 load_dotenv()
@@ -13,6 +14,7 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
 )
 log = logging.getLogger("SimioPortalMCP")
+logging.getLogger("httpx").setLevel(logging.WARNING)  # per-request INFO lines from the async client
 
 # --- exceptions ---
 class MCPConfigError(RuntimeError): ...
@@ -21,29 +23,45 @@ class MCPValidationError(ValueError): ...
 class MCPApiError(RuntimeError): ...
 
 # --- retry policy ---
-retryable = retry(
-    reraise=True,
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=0.5, min=0.5, max=4),
-    retry=retry_if_exception_type(Exception),
-)
+# REST calls are retried inside the clients by method and failure class (retry_policy.py).
+# This re-runs a whole tool only after a transient failure, so use it on idempotent pysimio calls only.
+from retry_policy import retry_transient as retryable
 
 # --- error wrapper for MCP tools ---
+def _shape(res):
+    if isinstance(res, dict) and "ok" in res:
+        return res
+    return {"ok": True, **(res if isinstance(res, dict) else {"data": res})}
+
+def _error(fn, e: Exception) -> dict:
+    if isinstance(e, (MCPConfigError, MCPAuthenticationError, MCPValidationError, MCPApiError)):
+        log.exception("Handled error in %s", fn.__name__)
+        return {"ok": False, "error": {"type": e.__class__.__name__, "message": str(e)}}
+    retry_after = getattr(e, "retry_after_secs", None)
+    if retry_after is not None:
+        # Fast-fail from an open circuit: no traceback, and tell the caller when to come back
+        log.warning("%s in %s: %s", e.__class__.__name__, fn.__name__, e)
+        return {"ok": False, "error": {"type": e.__class__.__name__, "message": str(e), "retry_after_secs": retry_after}}
+    log.exception("Unhandled error in %s", fn.__name__)
+    return {"ok": False, "error": {"type": "MCPApiError", "message": str(e)}}
+
 def wrap_errors(fn):
+    """Turn tool results/exceptions into {"ok": ...} dicts; works for sync and async tools."""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def _aw(*args, **kwargs):
+            try:
+                return _shape(await fn(*args, **kwargs))
+            except Exception as e:
+                return _error(fn, e)
+        return _aw
+
+    @functools.wraps(fn)
     def _w(*args, **kwargs):
         try:
-            res = fn(*args, **kwargs)
-            if isinstance(res, dict) and "ok" in res:
-                return res
-            return {"ok": True, **(res if isinstance(res, dict) else {"data": res})}
-        except (MCPConfigError, MCPAuthenticationError, MCPValidationError, MCPApiError) as e:
-            log.exception("Handled error in %s", fn.__name__)
-            return {"ok": False, "error": {"type": e.__class__.__name__, "message": str(e)}}
+            return _shape(fn(*args, **kwargs))
         except Exception as e:
-            log.exception("Unhandled error in %s", fn.__name__)
-            return {"ok": False, "error": {"type": "MCPApiError", "message": str(e)}}
-    _w.__name__ = fn.__name__
-    _w.__doc__ = fn.__doc__
+            return _error(fn, e)
     return _w
 
 # --- pysimio client (lazy) ---
@@ -0,0 +1,49 @@
+# job_tools.py
+"""
+MCP tools for following background workflow jobs (see jobs.py).
+"""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+from mcp_app import mcp
+from helpers import wrap_errors
+from jobs import job_manager
+
+class GetJobParams(BaseModel):
+    job_id: str = Field(..., min_length=1)
+
+class ListJobsParams(BaseModel):
+    status: Optional[str] = Field(None, description="Filter: running | succeeded | failed | cancelled")
+    kind: Optional[str] = Field(None, description="Filter by workflow name, e.g. create_or_replace_plan_run")
+
+class WaitJobParams(BaseModel):
+    job_id: str = Field(..., min_length=1)
+    timeout_secs: float = Field(60.0, ge=0, le=3600, description="Max seconds to wait before returning the current state")
+
+class CancelJobParams(BaseModel):
+    job_id: str = Field(..., min_length=1)
+
+@mcp.tool()
+@wrap_errors
+async def get_job(params: GetJobParams) -> dict:
+    """Return a job's status, its portal run ids, live run progress and (when finished) its result."""
+    return job_manager.get(params.job_id).view()
+
+@mcp.tool()
+@wrap_errors
+async def list_jobs(params: ListJobsParams) -> dict:
+    """List jobs, newest first (without their results)."""
+    jobs = job_manager.list(status=params.status, kind=params.kind)
+    return {"jobs": [j.view(include_result=False) for j in jobs]}
+
+@mcp.tool()
+@wrap_errors
+async def wait_job(params: WaitJobParams) -> dict:
+    """Wait up to timeout_secs for a job to finish, then return it (status stays 'running' on timeout)."""
+    return (await job_manager.wait(params.job_id, params.timeout_secs)).view()
+
+@mcp.tool()
+@wrap_errors
+async def cancel_job(params: CancelJobParams) -> dict:
+    """Cancel a running job and cancel its portal runs via runs_cancelrun."""
+    return await job_manager.cancel(params.job_id)
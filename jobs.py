@@ -0,0 +1,148 @@
+# jobs.py
+"""
+Background jobs for long-running workflows.
+
+A workflow submitted as a job returns its job id immediately and keeps
+orchestrating (and polling) as a task on the server's event loop. The job
+records the portal run ids it creates, so cancelling a job also cancels those
+runs on the portal. A workflow that returns ok: false (e.g. a run ended in a
+failed state) marks its job failed, with the result kept. Finished jobs are
+kept (newest SIMIO_JOB_RETENTION) so their results can still be fetched.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from helpers import MCPValidationError
+from run_poller import run_poller
+
+log = logging.getLogger("SimioPortalMCP")
+
+JOB_RETENTION = int(os.getenv("SIMIO_JOB_RETENTION", "200"))
+
+RUNNING, SUCCEEDED, FAILED, CANCELLED = "running", "succeeded", "failed", "cancelled"
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    client: Any = field(repr=False)
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    status: str = RUNNING
+    run_ids: List[Any] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, str]] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def view(self, include_result: bool = True) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "elapsed_secs": round((self.finished_at or time.time()) - self.created_at, 2),
+            "run_ids": list(self.run_ids),
+            "params": self.params,
+        }
+        if self.status == RUNNING and self.client is not None:
+            progress = {str(r): run_poller.last(self.client, r) for r in self.run_ids}
+            out["progress"] = {k: v for k, v in progress.items() if v}
+        if include_result:
+            out["result"] = self.result
+            out["error"] = self.error
+        return out
+
+class JobManager:
+    def __init__(self, retention: int = JOB_RETENTION):
+        self.retention = retention
+        self._jobs: Dict[str, Job] = {}
+
+    def submit(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        fn: Callable[[Job], Awaitable[Dict[str, Any]]],
+        client: Any = None,
+    ) -> Job:
+        """Start fn(job) as a background task and return the job right away."""
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind, params=params, client=client)
+        self._jobs[job.id] = job
+        job.task = asyncio.get_running_loop().create_task(self._run(job, fn))
+        self._prune()
+        return job
+
+    async def _run(self, job: Job, fn: Callable[[Job], Awaitable[Dict[str, Any]]]) -> None:
+        try:
+            job.result = await fn(job)
+            if isinstance(job.result, dict) and job.result.get("ok") is False:
+                job.status = FAILED
+                if isinstance(job.result.get("error"), dict):
+                    job.error = job.result["error"]
+            else:
+                job.status = SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+        except Exception as e:
+            log.exception("Job %s (%s) failed", job.id, job.kind)
+            job.status = FAILED
+            job.error = {"type": e.__class__.__name__, "message": str(e)}
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        finished = sorted((j for j in self._jobs.values() if j.status != RUNNING), key=lambda j: j.created_at)
+        for j in finished[: max(0, len(finished) - self.retention)]:
+            del self._jobs[j.id]
+
+    def get(self, job_id: str) -> Job:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise MCPValidationError(f"Unknown job_id '{job_id}'")
+        return job
+
+    def list(self, status: Optional[str] = None, kind: Optional[str] = None) -> List[Job]:
+        jobs = sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+        return [j for j in jobs if (status is None or j.status == status) and (kind is None or j.kind == kind)]
+
+    async def wait(self, job_id: str, timeout_secs: float) -> Job:
+        """Wait up to timeout_secs for the job to finish; returns it either way."""
+        job = self.get(job_id)
+        if job.task is not None and not job.task.done():
+            await asyncio.wait({job.task}, timeout=timeout_secs)
+        return job
+
+    async def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel the job's task and every portal run it created (runs_cancelrun)."""
+        job = self.get(job_id)
+        if job.status != RUNNING:
+            return {"job_id": job.id, "status": job.status, "cancelled_runs": [], "errors": {}}
+        if job.task is not None:
+            job.task.cancel()
+        cancelled, errors = [], {}
+        await self._cancel_runs(job, list(job.run_ids), cancelled, errors)
+        if job.task is not None:
+            await asyncio.wait({job.task})
+            # Runs whose create call was in flight are recorded while the task unwinds
+            seen = set(cancelled) | set(errors)
+            await self._cancel_runs(job, [r for r in job.run_ids if r not in seen and str(r) not in seen], cancelled, errors)
+        return {"job_id": job.id, "status": job.status, "cancelled_runs": cancelled, "errors": errors}
+
+    @staticmethod
+    async def _cancel_runs(job: Job, run_ids: List[Any], cancelled: List[Any], errors: Dict[str, str]) -> None:
+        for run_id in run_ids:
+            try:
+                await job.client.runs_cancelrun(run_id=str(run_id), body={"status": "cancelled"})
+                cancelled.append(run_id)
+            except Exception as e:
+                errors[str(run_id)] = f"{e.__class__.__name__}: {e}"
+
+# Shared by every workflow that can run in the background
+job_manager = JobManager()
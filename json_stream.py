@@ -0,0 +1,128 @@
+# json_stream.py
+"""
+JSON decoding for the REST clients: a faster backend and incremental item decoding.
+
+`loads` and `dumps` use orjson when it is installed and the standard json
+module otherwise. `ACCEPT_ENCODING` advertises gzip/deflate, plus brotli when the
+`brotli` or `brotlicffi` package is present, since requests and httpx both
+decode it transparently then.
+
+`ItemDecoder` turns a response body that arrives in chunks into the items
+found at one of several ijson-style prefixes ("item" for the elements of a
+top-level array, "rows.item" for the elements of its "rows" member, ...).
+With the optional `ijson` package, items are yielded as soon as they are
+complete, so memory is bounded by one item rather than the whole response.
+Without it, the body is buffered and decoded once at the end (same items,
+no memory saving). Only one prefix is used per response: the first to match.
+"""
+
+import json
+from typing import Any, Iterator, List, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional
+    ijson = None
+
+def _has_brotli() -> bool:
+    for name in ("brotli", "brotlicffi"):
+        try:
+            __import__(name)
+            return True
+        except ImportError:
+            pass
+    return False
+
+ACCEPT_ENCODING = "gzip, deflate, br" if _has_brotli() else "gzip, deflate"
+STREAM_CHUNK_BYTES = 64 * 1024
+
+def loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """JSON bytes (compact, or 2-space indented); anything not natively serializable becomes str."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=str, option=option)
+    if indent:
+        return json.dumps(obj, default=str, indent=2).encode()
+    return json.dumps(obj, default=str, separators=(",", ":")).encode()
+
+def _walk(obj: Any, parts: Sequence[str]) -> Iterator[Any]:
+    if not parts:
+        yield obj
+    elif parts[0] == "item":
+        if isinstance(obj, list):
+            for x in obj:
+                yield from _walk(x, parts[1:])
+    elif isinstance(obj, dict) and parts[0] in obj:
+        yield from _walk(obj[parts[0]], parts[1:])
+
+class ItemDecoder:
+    """feed() body chunks and get back the items completed so far; close() returns the rest."""
+
+    def __init__(self, prefixes: Sequence[str] = ("item",)):
+        self.prefixes = list(prefixes)
+        self.prefix: Optional[str] = None  # the prefix that matched
+        if ijson is not None:
+            self._events = ijson.sendable_list()
+            self._parser = ijson.parse_coro(self._events, use_float=True)
+            self._builder = None
+            self._depth = 0
+        else:
+            self._chunks: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        if ijson is None:
+            self._chunks.append(chunk)
+            return []
+        self._parser.send(chunk)
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        if ijson is None:
+            data = loads(b"".join(self._chunks)) if self._chunks else None
+            self._chunks = []
+            for prefix in self.prefixes:
+                items = list(_walk(data, prefix.split(".")))
+                if items:
+                    self.prefix = prefix
+                    return items
+            return []
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> List[Any]:
+        out = []
+        for path, event, value in self._events:
+            if self._builder is not None:
+                self._builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    self._depth += 1
+                elif event in ("end_map", "end_array"):
+                    self._depth -= 1
+                    if self._depth == 0:
+                        out.append(self._builder.value)
+                        self._builder = None
+                continue
+            if path not in self.prefixes or event in ("end_map", "end_array", "map_key"):
+                continue
+            if self.prefix is None:
+                self.prefix = path
+            elif path != self.prefix:
+                continue
+            if event in ("start_map", "start_array"):
+                self._builder = ijson.ObjectBuilder()
+                self._builder.event(event, value)
+                self._depth = 1
+            else:
+                out.append(value)
+        del self._events[:]
+        return out
@@ -0,0 +1,131 @@
+# kpi.py
+"""
+Runs x responses KPI matrix built from scenarios_getscenarioresponsedatabyid.
+
+Each (run, scenario) pair becomes one row. It is labelled with the run id, or
+"<run id>/<scenario>" when a run has several scenarios. Response values are
+reduced to one number (lists of replication values are averaged), and missing
+values are NaN. Deltas, ranks and Pareto fronts are computed with NumPy over
+the whole matrix at once.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from columnar import require_numpy
+from helpers import MCPValidationError
+
+_RESPONSE_KEYS = ("responses", "responseValues", "responseData")
+_CONTROL_KEYS = ("controlValues", "controls")
+
+def number(v: Any) -> Optional[float]:
+    """One float for a response value: numbers, numeric text, replication lists (mean) or {value|mean|average}."""
+    if isinstance(v, bool):
+        return float(v)
+    if isinstance(v, (int, float)):
+        return float(v)
+    if isinstance(v, str):
+        try:
+            return float(v)
+        except ValueError:
+            return None
+    if isinstance(v, dict):
+        for k in ("value", "mean", "average", "values"):
+            if k in v:
+                return number(v[k])
+        return None
+    if isinstance(v, (list, tuple)):
+        nums = [n for n in (number(x) for x in v) if n is not None]
+        return sum(nums) / len(nums) if nums else None
+    return None
+
+def _named_values(items: Any) -> Dict[str, Any]:
+    """{name: value} from either a dict or a list of {name, value...} entries."""
+    if isinstance(items, dict):
+        return dict(items)
+    out = {}
+    for it in items or []:
+        if isinstance(it, dict) and it.get("name") is not None:
+            rest = {k: v for k, v in it.items() if k != "name"}
+            out[str(it["name"])] = rest.get("value", rest)
+    return out
+
+def scenario_rows(run_id: str, data: Any) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    """[(scenario name, responses, controls)] from one run's response-data payload."""
+    if isinstance(data, dict) and isinstance(data.get("scenarios"), list):
+        scenarios = data["scenarios"]
+    elif isinstance(data, list):
+        scenarios = data
+    else:
+        scenarios = [data or {}]
+    out = []
+    for s in scenarios:
+        if not isinstance(s, dict):
+            continue
+        responses = next((_named_values(s[k]) for k in _RESPONSE_KEYS if k in s), {})
+        controls = next((_named_values(s[k]) for k in _CONTROL_KEYS if k in s), {})
+        out.append((str(s.get("name") or run_id), responses, controls))
+    return out
+
+def build_matrix(payloads: Dict[str, Any], responses: Optional[Sequence[str]] = None):
+    """Return (row labels, run ids, response names, float matrix, controls per row)."""
+    np = require_numpy()
+    labels, run_ids, values, controls = [], [], [], []
+    for run_id, data in payloads.items():
+        rows = scenario_rows(run_id, data)
+        for name, resp, ctl in rows:
+            labels.append(run_id if len(rows) == 1 else f"{run_id}/{name}")
+            run_ids.append(run_id)
+            values.append(resp)
+            controls.append(ctl)
+    names = list(responses) if responses else list(dict.fromkeys(k for v in values for k in v))
+    m = np.full((len(values), len(names)), np.nan)
+    for i, resp in enumerate(values):
+        for j, n in enumerate(names):
+            x = number(resp.get(n))
+            if x is not None:
+                m[i, j] = x
+    return labels, run_ids, names, m, controls
+
+def signed(m, names: Sequence[str], objectives: Dict[str, str]):
+    """Matrix restricted to the objective columns, negated where the goal is 'max' (so lower is better)."""
+    np = require_numpy()
+    cols, signs = [], []
+    for col, goal in objectives.items():
+        if col not in names:
+            raise MCPValidationError(f"Objective '{col}' is not a response ({list(names)})")
+        if goal not in ("min", "max"):
+            raise MCPValidationError(f"Objective '{col}' must be 'min' or 'max', not '{goal}'")
+        cols.append(names.index(col))
+        signs.append(-1.0 if goal == "max" else 1.0)
+    return m[:, cols] * np.array(signs)
+
+def ranks(m, names: Sequence[str], objectives: Dict[str, str]):
+    """1-based rank per column (best = 1, NaN last); direction from objectives, default 'min'."""
+    np = require_numpy()
+    sign = np.array([-1.0 if objectives.get(n) == "max" else 1.0 for n in names])
+    order = np.argsort(np.where(np.isnan(m), np.inf, m * sign), axis=0, kind="stable")
+    out = np.empty(m.shape, dtype=np.int64)
+    np.put_along_axis(out, order, np.arange(1, len(m) + 1)[:, None], axis=0)
+    return out
+
+def pareto_fronts(a):
+    """
+    Non-dominated sorting (all columns minimized). Returns each row's front
+    number (1 = Pareto-optimal); rows with any NaN objective get 0.
+    """
+    np = require_numpy()
+    n = len(a)
+    front = np.zeros(n, dtype=np.int64)
+    valid = ~np.isnan(a).any(axis=1)
+    remaining = np.flatnonzero(valid)
+    k = 0
+    while remaining.size:
+        k += 1
+        sub = a[remaining]
+        # dominated[i]: some j is <= in every objective and < in at least one
+        le = (sub[:, None, :] <= sub[None, :, :]).all(axis=2)
+        lt = (sub[:, None, :] < sub[None, :, :]).any(axis=2)
+        dominated = (le & lt).any(axis=0)
+        front[remaining[~dominated]] = k
+        remaining = remaining[dominated]
+    return front
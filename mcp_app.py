@@ -1,5 +1,22 @@
 # mcp_app.py
 from mcp.server.fastmcp import FastMCP
+from output_shaping import shaped
+from tool_registry import LazyTool
+
+class SimioMCP(FastMCP):
+    """FastMCP whose tools all take an optional `output` shape (see output_shaping.py)."""
+
+    def tool(self, name=None, **kwargs):
+        register = super().tool(name, **kwargs)
+
+        def decorator(fn):
+            registered = self._tool_manager.get_tool(name or fn.__name__)
+            if isinstance(registered, LazyTool):
+                registered.bind(shaped(fn), **kwargs)  # listed from the manifest; built on first call
+            else:
+                register(shaped(fn))
+            return fn  # direct Python callers keep the unshaped function
+        return decorator
 
 # Single MCP instance used by all tools
-mcp = FastMCP("SimioPortalTools")
+mcp = SimioMCP("SimioPortalTools")
@@ -0,0 +1,110 @@
+# metadata_cache.py
+"""
+Shared cache for slow-changing portal metadata (models, experiments, projects).
+
+Entries are keyed by tenant (portal URL, PAT), path and query, and are served
+from memory for SIMIO_METADATA_TTL_SECS. Once stale they are revalidated with
+If-None-Match / If-Modified-Since when the portal sent an ETag / Last-Modified,
+so an unchanged list costs a 304 instead of a full download. Mutating calls
+(project upload, model/project delete) invalidate every entry for the portal.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+METADATA_TTL_SECS = float(os.getenv("SIMIO_METADATA_TTL_SECS", "60"))
+
+CacheKey = Tuple[str, str, str, Tuple[Tuple[str, str], ...]]
+
+@dataclass
+class CacheEntry:
+    data: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def fresh(self, ttl: float) -> bool:
+        return time.monotonic() - self.fetched_at < ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional-request headers for revalidating this entry."""
+        h = {}
+        if self.etag:
+            h["If-None-Match"] = self.etag
+        if self.last_modified:
+            h["If-Modified-Since"] = self.last_modified
+        return h
+
+class MetadataCache:
+    """Thread-safe TTL cache; cached payloads are shared, so treat them as read-only."""
+
+    def __init__(self, ttl_secs: float = METADATA_TTL_SECS):
+        self.ttl_secs = ttl_secs
+        self._entries: Dict[CacheKey, CacheEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(base_url: str, pat: Optional[str], path: str, params: Optional[Mapping[str, Any]]) -> CacheKey:
+        query = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return (base_url.rstrip("/"), pat or "", path, query)
+
+    def lookup(self, key: CacheKey) -> Tuple[Optional[CacheEntry], bool]:
+        """Return (entry, fresh). A stale entry is still returned for revalidation."""
+        with self._lock:
+            entry = self._entries.get(key)
+            fresh = bool(entry and entry.fresh(self.ttl_secs))
+            if fresh:
+                self.hits += 1
+            return entry, fresh
+
+    def store(self, key: CacheKey, data: Any, headers: Mapping[str, str]) -> Any:
+        entry = CacheEntry(
+            data=data,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            fetched_at=time.monotonic(),
+        )
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+        return data
+
+    def touch(self, key: CacheKey, entry: CacheEntry) -> Optional[CacheEntry]:
+        """After a 304 for `entry`: mark it fresh and return it if it is still the stored entry.
+        If a newer entry was stored meanwhile, return that one; if the key was invalidated
+        (a mutation raced the revalidation), return None so the caller refetches."""
+        with self._lock:
+            current = self._entries.get(key)
+            if current is entry:
+                entry.fetched_at = time.monotonic()
+                self.revalidated += 1
+            return current
+
+    def invalidate(self, base_url: Optional[str] = None) -> None:
+        """Drop every entry for `base_url` (all tenants), or everything when omitted."""
+        with self._lock:
+            if base_url is None:
+                self._entries.clear()
+                return
+            base = base_url.rstrip("/")
+            for k in [k for k in self._entries if k[0] == base]:
+                del self._entries[k]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ttl_secs": self.ttl_secs,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+            }
+
+# Shared by the sync and async clients
+metadata_cache = MetadataCache()
@@ -0,0 +1,523 @@
+# mock_portal.py
+"""
+In-process stand-in for the Simio Portal REST API, for benchmarks and offline checks.
+
+MockPortal serves the endpoints this repo calls (/api/auth, /api/v1/heartbeat,
+models, projects, experiments, runs, scenarios, table data, exports/imports,
+published runs/plans) from a ThreadingHTTPServer on 127.0.0.1. Data is
+generated from MockConfig: how many models/experiments/runs/scenarios, table
+size and per-item padding to grow payloads. Runs go NotStarted -> Running ->
+Completed (or Failed, at run_failure_rate) over run_secs after a start call;
+percentComplete grows linearly. Every request waits latency_ms (+/- jitter), and
+non-auth requests fail with 503 at error_rate or 429 at throttle_rate.
+
+Like the portal, it requires a bearer token from /api/auth, answers 304 to
+If-None-Match on list endpoints, gzips large bodies when asked, and honors
+skip/take paging on list and table endpoints. `counts` tallies requests per
+(method, route), e.g. "GET /api/v1/runs/{run_id}".
+
+    portal = MockPortal(MockConfig(latency_ms=20)).start()
+    os.environ["SIMIO_PORTAL_URL"] = portal.url
+    ...
+    portal.stop()
+
+`python mock_portal.py --port 8765` runs one standalone (see --help).
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 5.0  # per request
+    latency_jitter_ms: float = 0.0  # uniform +/-
+    error_rate: float = 0.0  # fraction of non-auth requests answered 503
+    throttle_rate: float = 0.0  # fraction of non-auth requests answered 429
+    retry_after_secs: int = 1
+    models: int = 3
+    experiments_per_model: int = 2
+    runs_per_experiment: int = 5
+    scenarios_per_run: int = 3
+    responses_per_scenario: int = 4
+    table_rows: int = 1000
+    table_columns: int = 6
+    padding_bytes: int = 0  # extra "notes" characters on every listed item
+    run_secs: float = 2.0  # start -> terminal state
+    run_failure_rate: float = 0.0
+    transfer_secs: float = 1.0  # export/import duration
+    seed: int = 0
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class _Error(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class MockPortal:
+    def __init__(self, config: Optional[MockConfig] = None, port: int = 0):
+        self.config = config or MockConfig()
+        self.port = port
+        self.counts: Counter = Counter()
+        self._lock = threading.RLock()
+        self._rng = random.Random(self.config.seed)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._routes = self._build_routes()
+        self.reset()
+
+    # ---------- data ----------
+
+    def reset(self) -> None:
+        """Regenerate all data and clear counters."""
+        cfg = self.config
+        with self._lock:
+            self.counts.clear()
+            self.tokens: Dict[str, str] = {}
+            self.models: Dict[int, Dict[str, Any]] = {}
+            self.experiments: Dict[int, Dict[str, Any]] = {}
+            self.runs: Dict[int, Dict[str, Any]] = {}
+            self.scenarios: Dict[int, Dict[str, Dict[str, Any]]] = {}
+            self.tables: Dict[Tuple[int, str, str], List[Dict[str, Any]]] = {}
+            self.transfers: Dict[int, Dict[str, Any]] = {}
+            self.published: Dict[str, Dict[str, Any]] = {}
+            self._next_id = 1
+            for m in range(cfg.models):
+                model_id = self.add_model(f"Project{m + 1}")
+                for e in range(cfg.experiments_per_model):
+                    exp_id = self.add_experiment(model_id, "__Default" if e == 0 else f"Experiment{e + 1}")
+                    for r in range(cfg.runs_per_experiment):
+                        run_id = self.add_run(exp_id, f"Run{r + 1}")
+                        self.runs[run_id].update(state="Completed", percentComplete=100,
+                                                 startDateTimeUtc=_now_iso(), endDateTimeUtc=_now_iso())
+
+    def _id(self) -> int:
+        self._next_id += 1
+        return self._next_id - 1
+
+    def _pad(self) -> Dict[str, str]:
+        return {"notes": "x" * self.config.padding_bytes} if self.config.padding_bytes else {}
+
+    def add_model(self, project_name: str) -> int:
+        with self._lock:
+            model_id = self._id()
+            self.models[model_id] = {"id": model_id, "projectName": project_name, "name": project_name,
+                                     "createdDateTimeUtc": _now_iso(), **self._pad()}
+            return model_id
+
+    def add_experiment(self, model_id: int, name: str) -> int:
+        with self._lock:
+            exp_id = self._id()
+            self.experiments[exp_id] = {"id": exp_id, "modelId": model_id, "name": name, **self._pad()}
+            return exp_id
+
+    def add_run(self, experiment_id: int, name: str, scenarios: Optional[List[str]] = None) -> int:
+        """A NotStarted run with scenarios (default: the run's own name for one, else Scenario1..N)."""
+        with self._lock:
+            run_id = self._id()
+            self.runs[run_id] = {"id": run_id, "experimentId": experiment_id, "name": name, "state": "NotStarted",
+                                 "percentComplete": 0, "startDateTimeUtc": None, "endDateTimeUtc": None,
+                                 "additionalRunsStatus": [], **self._pad()}
+            n = self.config.scenarios_per_run
+            names = scenarios or ([name] if n <= 1 else [f"Scenario{i + 1}" for i in range(n)])
+            self.scenarios[run_id] = {s: {"name": s, "controls": {}} for s in names}
+            return run_id
+
+    def start_run(self, run_id: int) -> None:
+        with self._lock:
+            self._start(self.runs[run_id])
+
+    def add_transfer(self, kind: str) -> int:
+        """An export ("exports") or import ("imports") started now."""
+        with self._lock:
+            transfer_id = self._id()
+            self.transfers[transfer_id] = {"kind": kind, "t0": time.monotonic()}
+            return transfer_id
+
+    def add_published(self, name: str) -> None:
+        with self._lock:
+            self.published[name] = {}
+
+    def _run(self, run_id: str) -> Dict[str, Any]:
+        run = self.runs.get(int(run_id)) if run_id.isdigit() else None
+        if run is None:
+            raise _Error(404, f"Run {run_id} not found")
+        if run["state"] == "Running":
+            elapsed = time.monotonic() - run["_t0"]
+            run["percentComplete"] = min(100.0, round(100 * elapsed / max(self.config.run_secs, 1e-6), 1))
+            if elapsed >= self.config.run_secs:
+                run.update(state="Failed" if run["_fails"] else "Completed", endDateTimeUtc=_now_iso())
+        return run
+
+    def _start(self, run: Dict[str, Any]) -> None:
+        run.update(state="Running", percentComplete=0, startDateTimeUtc=_now_iso(), endDateTimeUtc=None,
+                   _t0=time.monotonic(), _fails=self._rng.random() < self.config.run_failure_rate)
+
+    def _scenario(self, run_id: str, name: str, create: bool = False) -> Dict[str, Any]:
+        scenarios = self.scenarios.setdefault(int(self._run(run_id)["id"]), {})
+        if name not in scenarios:
+            if not create:
+                raise _Error(404, f"Scenario {name} not found in run {run_id}")
+            scenarios[name] = {"name": name, "controls": {}}
+        return scenarios[name]
+
+    def _responses(self, run_id: int, scenario: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Deterministic per run/scenario, shifted by numeric control values."""
+        rng = random.Random(f"{self.config.seed}:{run_id}:{scenario['name']}")
+        shift = 0.0
+        for v in scenario["controls"].values():
+            try:
+                shift += float(v)
+            except (TypeError, ValueError):
+                pass
+        return [{"name": f"Response{i + 1}", "value": round(rng.uniform(10, 100) + shift * (i + 1), 4)}
+                for i in range(self.config.responses_per_scenario)]
+
+    def _table(self, run_id: str, scenario: str, table: str) -> List[Dict[str, Any]]:
+        key = (int(self._run(run_id)["id"]), scenario, table)
+        rows = self.tables.get(key)
+        if rows is None:
+            rng = random.Random(f"{self.config.seed}:{key}")
+            extra = max(0, self.config.table_columns - 5)
+            rows = self.tables[key] = [
+                {"Id": i, "Name": f"Item{i}", "Category": rng.choice("ABCD"), "Quantity": rng.randint(0, 100),
+                 "Value": round(rng.uniform(0, 1000), 3), **{f"Col{c + 1}": rng.random() for c in range(extra)}}
+                for i in range(self.config.table_rows)
+            ]
+        return rows
+
+    # ---------- handlers: (query, body, *path groups) -> (status, payload) ----------
+
+    def _auth(self, q, body):
+        pat = (body or {}).get("personalAccessToken")
+        if not pat:
+            raise _Error(400, "personalAccessToken is required")
+        token = f"mock-{hashlib.sha1(f'{pat}:{len(self.tokens)}'.encode()).hexdigest()[:24]}"
+        self.tokens[token] = pat
+        return 200, {"token": token}
+
+    def _list(self, items, q, **filters):
+        out = [i for i in items if all(str(i.get(k)) == str(v) for k, v in filters.items() if v is not None)]
+        if "skip" in q or "take" in q:
+            skip = int(q.get("skip", 0))
+            out = out[skip:skip + int(q.get("take", len(out)))]
+        return 200, [{k: v for k, v in i.items() if not k.startswith("_")} for i in out]
+
+    def _get_one(self, items: Dict[int, Any], key: str, kind: str):
+        item = items.get(int(key)) if key.isdigit() else None
+        if item is None:
+            raise _Error(404, f"{kind} {key} not found")
+        return 200, item
+
+    def _delete_one(self, items: Dict[int, Any], key: str, kind: str):
+        self._get_one(items, key, kind)
+        del items[int(key)]
+        return 204, None
+
+    def _run_view(self, run_id: str):
+        return 200, {k: v for k, v in self._run(run_id).items() if not k.startswith("_")}
+
+    def _create_run(self, q, body):
+        body = body or {}
+        model_id = body.get("modelId")
+        exp = next((e for e in self.experiments.values() if e["modelId"] == model_id), None)
+        if exp is None:
+            raise _Error(400, f"Model {model_id} has no experiment")
+        name = body.get("experimentRunName") or "Run"
+        return 201, {"id": self.add_run(exp["id"], name, [name])}  # a plan run's one scenario is named after it
+
+    def _create_from_existing(self, q, body):
+        src = self._run(str((body or {}).get("existingExperimentRunId", "")))
+        run_id = self.add_run(src["experimentId"], (body or {}).get("experimentRunName") or f"{src['name']} copy",
+                              list(self.scenarios.get(src["id"], {})))
+        return 201, {"id": run_id}
+
+    def _start_existing(self, q, body):
+        run = self._run(str((body or {}).get("existingExperimentRunId", "")))
+        self._start(run)
+        return 201, {"id": run["id"]}
+
+    def _start_experiment(self, q, body):
+        body = body or {}
+        exp_id = body.get("ExperimentId") or body.get("experimentId")
+        if int(exp_id or 0) not in self.experiments:
+            raise _Error(400, f"Experiment {exp_id} not found")
+        scen = [s.get("Name") or s.get("name") for s in (body.get("CreateInfo") or {}).get("Scenarios") or []]
+        run_id = self.add_run(int(exp_id), body.get("Name") or body.get("name") or "Run", [s for s in scen if s] or None)
+        self._start(self.runs[run_id])
+        return 201, {"id": run_id}
+
+    def _cancel(self, q, body, run_id, additional=None):
+        run = self._run(run_id)
+        if run["state"] == "Running":
+            run.update(state="Canceled", endDateTimeUtc=_now_iso())
+        return 204, None
+
+    def _set_control(self, q, body, run_id, scenario, control):
+        self._scenario(run_id, unquote(scenario), create=True)["controls"][unquote(control)] = (body or {}).get("value")
+        return 204, None
+
+    def _response_data(self, q, body, run_id):
+        run = self._run(run_id)
+        scenarios = [
+            {"name": s["name"], "controlValues": [{"name": k, "value": v} for k, v in s["controls"].items()],
+             "responses": self._responses(run["id"], s) if run["state"] == "Completed" else []}
+            for s in self.scenarios.get(run["id"], {}).values()
+        ]
+        return 200, {"id": run["id"], "name": run["name"], "state": run["state"], "scenarios": scenarios}
+
+    def _table_rows(self, q, body, run_id, scenario, table):
+        rows = self._table(run_id, unquote(scenario), unquote(table))
+        if "skip" in q or "take" in q:
+            skip = int(q.get("skip", 0))
+            rows = rows[skip:skip + int(q.get("take", len(rows)))]
+        return 200, rows
+
+    def _table_cell(self, q, body, run_id, scenario, table):
+        rows = self._table(run_id, unquote(scenario), unquote(table))
+        i = int((body or {}).get("rowIndex", -1))
+        if not 0 <= i < len(rows):
+            raise _Error(400, f"rowIndex {i} out of range")
+        column, value = (body or {}).get("columnName"), (body or {}).get("value")
+        old = rows[i].get(column)
+        if isinstance(old, (int, float)) and isinstance(value, str):  # values arrive as text; keep the column type
+            try:
+                value = type(old)(float(value)) if isinstance(old, int) else float(value)
+            except ValueError:
+                raise _Error(400, f"'{value}' is not a valid value for column {column}")
+        rows[i][column] = value
+        return 204, None
+
+    def _table_insert(self, q, body, run_id, scenario, table, index):
+        rows = self._table(run_id, unquote(scenario), unquote(table))
+        rows.insert(min(int(index), len(rows)), {k: None for k in (rows[0] if rows else {})})
+        return 204, None
+
+    def _table_remove(self, q, body, run_id, scenario, table, index):
+        rows = self._table(run_id, unquote(scenario), unquote(table))
+        if not 0 <= int(index) < len(rows):
+            raise _Error(400, f"row {index} out of range")
+        del rows[int(index)]
+        return 204, None
+
+    def _transfer_start(self, q, body, run_id, scenario, kind):
+        self._scenario(run_id, unquote(scenario))
+        return 201, {"id": self.add_transfer(kind)}
+
+    def _transfer_status(self, q, body, run_id, kind, transfer_id):
+        t = self.transfers.get(int(transfer_id))
+        if t is None or t["kind"] != kind:
+            raise _Error(404, f"{kind[:-1]} {transfer_id} not found")
+        pct = min(100.0, 100 * (time.monotonic() - t["t0"]) / max(self.config.transfer_secs, 1e-6))
+        return 200, {"id": int(transfer_id), "status": "Completed" if pct >= 100 else "Running", "percentComplete": round(pct, 1)}
+
+    def _publish_run(self, q, body):
+        name = (body or {}).get("publishedName") or (body or {}).get("name") or f"published{len(self.published) + 1}"
+        self.published[name] = dict(body or {})
+        return 201, {"name": name}
+
+    def _delete_published(self, q, body, name):
+        if self.published.pop(unquote(name), None) is None:
+            raise _Error(404, f"Published run {name} not found")
+        return 204, None
+
+    def _table_schemas(self, q, body, model_id):
+        self._get_one(self.models, model_id, "Model")
+        columns = [("Id", "Integer"), ("Name", "String"), ("Category", "String"), ("Quantity", "Integer"), ("Value", "Real")]
+        return 200, [{"name": "Table1", "columns": [{"name": c, "type": t} for c, t in columns]}]
+
+    def _project(self, q, body, project_id):
+        model = self._get_one(self.models, project_id, "Project")[1]
+        return 200, {"id": model["id"], "name": model["projectName"]}
+
+    def _upload(self, q, body):
+        name = (body or {}).get("projectName") or q.get("projectName") or "Uploaded"
+        return 201, {"id": self.add_model(name)}
+
+    def _run_ok(self, q, body, run_id):
+        self._run(run_id)
+        return 204, None
+
+    def _scenario_ok(self, q, body, run_id, scenario):
+        self._scenario(run_id, unquote(scenario))
+        return 204, None
+
+    def _build_routes(self) -> List[Tuple[str, "re.Pattern", str, Callable]]:
+        table = "/api/v1/runs/{run_id}/scenarios/{scenario_name}/table-data/{table_name}"
+        routes = [
+            ("POST", "/api/auth", self._auth),
+            ("GET", "/api/v1/heartbeat", lambda q, b: (200, {"status": "Healthy", "time": _now_iso()})),
+            ("GET", "/api/v1/models", lambda q, b: self._list(self.models.values(), q)),
+            ("GET", "/api/v1/models/{model_id}", lambda q, b, i: self._get_one(self.models, i, "Model")),
+            ("DELETE", "/api/v1/models/{model_id}", lambda q, b, i: self._delete_one(self.models, i, "Model")),
+            ("GET", "/api/v1/models/{model_id}/table-schemas", self._table_schemas),
+            ("GET", "/api/v1/projects", lambda q, b: self._list(
+                [{"id": m["id"], "name": m["projectName"]} for m in self.models.values()], q)),
+            ("GET", "/api/v1/projects/{project_id}", self._project),
+            ("DELETE", "/api/v1/projects/{project_id}", lambda q, b, i: self._delete_one(self.models, i, "Project")),
+            ("POST", "/api/v1/projects/upload", self._upload),
+            ("GET", "/api/v1/experiments", lambda q, b: self._list(self.experiments.values(), q, modelId=q.get("model_id"))),
+            ("GET", "/api/v1/experiments/{experiment_id}", lambda q, b, i: self._get_one(self.experiments, i, "Experiment")),
+            ("GET", "/api/v1/runs", lambda q, b: self._list([self._run(str(i)) for i in list(self.runs)], q,
+                                                             experimentId=q.get("experiment_id"))),
+            ("POST", "/api/v1/runs/create", self._create_run),
+            ("POST", "/api/v1/runs/create-from-existing", self._create_from_existing),
+            ("POST", "/api/v1/runs/start-existing-plan-run", self._start_existing),
+            ("POST", "/api/v1/runs/start-experiment-run", self._start_experiment),
+            ("GET", "/api/v1/runs/{run_id}", lambda q, b, i: self._run_view(i)),
+            ("DELETE", "/api/v1/runs/{run_id}", lambda q, b, i: self._delete_one(self.runs, i, "Run")),
+            ("PATCH", "/api/v1/runs/{run_id}", self._cancel),
+            ("PATCH", "/api/v1/runs/{run_id}/additional-runs/{additional_run_id}", self._cancel),
+            ("PUT", "/api/v1/runs/{run_id}/time-options", self._run_ok),
+            ("GET", "/api/v1/runs/{run_id}/scenarios", self._response_data),
+            ("GET", "/api/v1/runs/{run_id}/scenarios/{kind:exports|imports}/{id}", self._transfer_status),
+            ("PUT", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/name", self._scenario_ok),
+            ("PUT", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/control-values/{control_name}", self._set_control),
+            ("PATCH", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/data-connector-configurations", self._scenario_ok),
+            ("POST", "/api/v1/runs/{run_id}/scenarios/{scenario_name}/{kind:exports|imports}", self._transfer_start),
+            ("GET", table, self._table_rows),
+            ("PATCH", table + "/rows", self._table_cell),
+            ("POST", table + "/rows/{row_index}", self._table_insert),
+            ("DELETE", table + "/rows/{row_index}", self._table_remove),
+            ("POST", "/api/v1/published-plans/publish-plan", lambda q, b: (201, {"ok": True})),
+            ("POST", "/api/v1/published-plans/upload-and-publish-plan", lambda q, b: (201, {"ok": True})),
+            ("POST", "/api/v1/published-runs", self._publish_run),
+            ("DELETE", "/api/v1/published-runs/{published_name}", self._delete_published),
+        ]
+        out = []
+        for method, template, handler in routes:
+            # "{name}" matches one path segment, "{name:a|b}" one of the alternatives
+            pattern = re.sub(r"\{\w+(?::([^}]+))?\}", lambda m: f"({m.group(1) or '[^/]+'})", template)
+            label = re.sub(r"\{(\w+):[^}]+\}", r"{\1}", template)
+            out.append((method, re.compile(pattern + "$"), f"{method} {label}", handler))
+        return out
+
+    def dispatch(self, method: str, path: str, query: Dict[str, str], body: Any, token: Optional[str]) -> Tuple[int, Any, Dict[str, str]]:
+        """(status, payload, extra headers) for one request, after latency and fault injection."""
+        cfg = self.config
+        delay = cfg.latency_ms + (self._rng.uniform(-1, 1) * cfg.latency_jitter_ms if cfg.latency_jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        for m, pattern, label, handler in self._routes:
+            match = pattern.match(path) if m == method else None
+            if match is None:
+                continue
+            with self._lock:
+                self.counts[label] += 1
+                if path != "/api/auth":
+                    if token not in self.tokens:
+                        return 401, {"error": "Unauthorized"}, {}
+                    roll = self._rng.random()
+                    if roll < cfg.throttle_rate:
+                        return 429, {"error": "Too many requests"}, {"Retry-After": str(cfg.retry_after_secs)}
+                    if roll < cfg.throttle_rate + cfg.error_rate:
+                        return 503, {"error": "Service unavailable"}, {}
+                try:
+                    status, payload = handler(query, body, *match.groups())
+                except _Error as e:
+                    return e.status, {"error": str(e)}, {}
+                return status, payload, {}
+        with self._lock:
+            self.counts[f"{method} <unmatched>"] += 1
+        return 404, {"error": f"No route for {method} {path}"}, {}
+
+    # ---------- server ----------
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "MockPortal":
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), type("_Handler", (_Handler,), {"portal": self}))
+        self._server.daemon_threads = True
+        self.port = self._server.server_port
+        threading.Thread(target=self._server.serve_forever, name="mock-portal", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockPortal":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"requests": sum(self.counts.values()), "auth": self.counts["POST /api/auth"],
+                    "by_route": dict(self.counts.most_common())}
+
+class _Handler(BaseHTTPRequestHandler):
+    portal: MockPortal
+    protocol_version = "HTTP/1.1"  # keep-alive, like the portal
+    disable_nagle_algorithm = True  # headers and body are separate writes; avoid the delayed-ACK stall
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _serve(self) -> None:
+        u = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(u.query).items()}
+        n = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(n) if n else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = None
+        auth = self.headers.get("Authorization") or ""
+        token = auth[7:] if auth.startswith("Bearer ") else None
+        status, payload, headers = self.portal.dispatch(self.command, u.path, query, body, token)
+        data = b"" if status == 204 or payload is None else json.dumps(payload).encode()
+        if status == 200 and self.command == "GET" and u.path.rstrip("/").split("/")[-1] in ("models", "projects", "experiments"):
+            etag = '"' + hashlib.sha1(data).hexdigest()[:16] + '"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                status, data = 304, b""
+        if len(data) > 1024 and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            data = gzip.compress(data, 1)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Run a mock Simio Portal on 127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    for f in fields(MockConfig):
+        ap.add_argument(f"--{f.name.replace('_', '-')}", type=type(f.default), default=f.default)
+    args = ap.parse_args()
+    config = MockConfig(**{f.name: getattr(args, f.name) for f in fields(MockConfig)})
+    portal = MockPortal(config, port=args.port).start()
+    print(f"Mock portal at {portal.url} (any PAT works); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        portal.stop()
+
+if __name__ == "__main__":
+    main()
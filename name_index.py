@@ -0,0 +1,172 @@
+# name_index.py
+"""
+In-memory name -> ID index used to resolve project / experiment / run paths.
+
+Three maps per tenant (portal URL, PAT), all keyed by case-folded, stripped names:
+  project name              -> model id
+  (model id, experiment)    -> experiment id
+  (experiment id, run name) -> run id
+
+Each scope (the model list, one model's experiments, one experiment's runs) is
+scanned on first use and rescanned on its own only when it is older than
+SIMIO_METADATA_TTL_SECS or a name is missing from it. Scans walk the list
+lazily (paging.iter_items) and stop as soon as every wanted name has been seen,
+so on a paged or streamed runs list a lookup does not download an experiment's
+whole run history. A scope that was cut short only answers for the names it
+saw; a scan that reaches the end of the list is complete. Workflows that
+create or delete runs update the run scope in place; mutate-mode endpoints
+(deletes, project upload) drop every scope of their portal, like metadata_cache.
+"""
+
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from helpers import MCPApiError
+from metadata_cache import METADATA_TTL_SECS
+from paging import LIST_NAME_FILTER, iter_items, iter_runs
+
+def fold(name: Optional[str]) -> str:
+    return (name or "").strip().casefold()
+
+_NAME_FIELDS = {"models": "projectName", "experiments": "name", "runs": "name"}
+
+class _Scope:
+    __slots__ = ("ids", "names", "loaded_at", "complete")
+
+    def __init__(self):
+        self.ids: Dict[str, Any] = {}
+        self.names: List[str] = []
+        self.loaded_at = time.monotonic()
+        self.complete = False
+
+    def add(self, item: Any, name_field: str) -> None:
+        name = item.get(name_field) if isinstance(item, dict) else None
+        if name is None or item.get("id") is None:
+            return
+        self.names.append(name)
+        self.ids.setdefault(fold(name), item["id"])  # first match wins, as before
+
+def _available(scope: _Scope) -> str:
+    return f" Available: {scope.names}" if scope.complete else ""
+
+class NameIndex:
+    def __init__(self, ttl_secs: float = METADATA_TTL_SECS):
+        self.ttl_secs = ttl_secs
+        self._scopes: Dict[Tuple[str, str, str, str], _Scope] = {}
+
+    @staticmethod
+    def _tenant(client) -> Tuple[str, str]:
+        return (client.base_url.rstrip("/"), client._pat() or "")
+
+    @staticmethod
+    def _items(client, kind: str, parent: str, names: Sequence[str]) -> Tuple[AsyncIterator[Any], bool]:
+        """Lazy list of one scope, and whether it was filtered by name on the server."""
+        if kind == "models":
+            return iter_items(lambda q: client.models_getmodels(query=q)), False
+        query = {"model_id": parent} if kind == "experiments" else {"experiment_id": parent}
+        filtered = bool(LIST_NAME_FILTER) and len(names) == 1
+        if filtered:
+            query[LIST_NAME_FILTER] = names[0]
+        if kind == "experiments":
+            return iter_items(lambda q: client.experiments_getexperiments(query=q), query), filtered
+        return iter_runs(client, query), filtered
+
+    async def _scan(self, client, kind: str, parent: str, names: Sequence[str] = ()) -> _Scope:
+        """Walk a scope's list until every name in `names` has been seen (the whole list when empty)."""
+        wanted = {fold(n) for n in names}
+        name_field = _NAME_FIELDS[kind]
+        items, filtered = self._items(client, kind, parent, list(names))
+        scope = _Scope()
+        try:
+            async for item in items:
+                scope.add(item, name_field)
+                if wanted and wanted <= scope.ids.keys():
+                    break
+            else:
+                scope.complete = not filtered
+        finally:
+            await items.aclose()
+        self._scopes[(*self._tenant(client), kind, parent)] = scope
+        return scope
+
+    async def _lookup(self, client, kind: str, parent: str, name: str) -> Tuple[Optional[Any], _Scope]:
+        scope = self._scopes.get((*self._tenant(client), kind, parent))
+        if scope is not None and time.monotonic() - scope.loaded_at < self.ttl_secs:
+            hit = scope.ids.get(fold(name))
+            if hit is not None:
+                return hit, scope
+        # Stale, never loaded, or a miss that may be a newly created object
+        scope = await self._scan(client, kind, parent, [name])
+        return scope.ids.get(fold(name)), scope
+
+    async def model_id(self, client, project_name: str) -> Optional[Any]:
+        return (await self._lookup(client, "models", "", project_name))[0]
+
+    async def experiment_id(self, client, model_id: Any, experiment_name: str) -> Optional[Any]:
+        return (await self._lookup(client, "experiments", str(model_id), experiment_name))[0]
+
+    async def run_id(self, client, experiment_id: Any, run_name: str) -> Optional[Any]:
+        return (await self._lookup(client, "runs", str(experiment_id), run_name))[0]
+
+    async def run_ids(self, client, experiment_id: Any, run_names: Iterable[str]) -> Dict[str, Any]:
+        """Look up many run names with at most one scan of the experiment's runs; returns the found ones."""
+        names = list(run_names)
+        key = (*self._tenant(client), "runs", str(experiment_id))
+        scope = self._scopes.get(key)
+        if scope is None or time.monotonic() - scope.loaded_at >= self.ttl_secs or any(fold(n) not in scope.ids for n in names):
+            scope = await self._scan(client, "runs", str(experiment_id), names)
+        return {n: scope.ids[fold(n)] for n in names if fold(n) in scope.ids}
+
+    async def resolve(
+        self,
+        client,
+        project_name: str,
+        experiment_name: Optional[str] = None,
+        run_name: Optional[str] = None,
+        require_run: bool = True,
+    ) -> Dict[str, Any]:
+        """Resolve a project[/experiment[/run]] path; raise MCPApiError naming the missing level."""
+        out: Dict[str, Any] = {}
+        model_id, scope = await self._lookup(client, "models", "", project_name)
+        if model_id is None:
+            raise MCPApiError(f"Project '{project_name}' not found in models list")
+        out["model_id"] = model_id
+        if experiment_name is None:
+            return out
+        experiment_id, scope = await self._lookup(client, "experiments", str(model_id), experiment_name)
+        if experiment_id is None:
+            raise MCPApiError(f"Experiment '{experiment_name}' not found for model {model_id}." + _available(scope))
+        out["experiment_id"] = experiment_id
+        if run_name is None:
+            return out
+        run_id, scope = await self._lookup(client, "runs", str(experiment_id), run_name)
+        if run_id is None and require_run:
+            raise MCPApiError(f"Run '{run_name}' not found for experiment {experiment_id}." + _available(scope))
+        out["run_id"] = run_id
+        return out
+
+    def add_run(self, client, experiment_id: Any, run_name: str, run_id: Any) -> None:
+        scope = self._scopes.get((*self._tenant(client), "runs", str(experiment_id)))
+        if scope is not None:
+            scope.ids[fold(run_name)] = run_id
+            scope.names.append(run_name)
+
+    def drop_run(self, client, experiment_id: Any, run_id: Any) -> None:
+        scope = self._scopes.get((*self._tenant(client), "runs", str(experiment_id)))
+        if scope is not None:
+            gone = {k for k, v in scope.ids.items() if str(v) == str(run_id)}
+            for k in gone:
+                del scope.ids[k]
+            scope.names = [n for n in scope.names if fold(n) not in gone]
+
+    def invalidate(self, base_url: Optional[str] = None) -> None:
+        """Drop every scope for `base_url` (all tenants), or everything when omitted."""
+        if base_url is None:
+            self._scopes.clear()
+            return
+        base = base_url.rstrip("/")
+        for k in [k for k in list(self._scopes) if k[0] == base]:
+            self._scopes.pop(k, None)
+
+# Shared by resolve_ids and the workflow tools
+name_index = NameIndex()
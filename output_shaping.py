@@ -0,0 +1,161 @@
+# output_shaping.py
+"""
+Output shaping for every MCP tool (applied by mcp_app.SimioMCP at registration).
+
+Each tool gains an optional `output` argument (OutputShape). It applies to the
+payload values of a successful result (everything except "ok"), in this order:
+  fields        keep only these keys of each row (rows = dicts in payload lists,
+                or a payload dict that has any of the keys)
+  offset/limit  slice every payload list
+  summary       replace lists with {"count", "first": first summary_items rows}
+  max_bytes     if the JSON is still larger, drop rows from the end of the
+                largest lists until it fits
+Lists cut by offset/limit, summary or max_bytes are reported under
+"truncated" as {path, total, returned, offset, reason}. There is no byte
+budget unless the caller sets output.max_bytes or SIMIO_OUTPUT_MAX_BYTES sets a
+default for every tool, so results are unchanged when `output` is omitted.
+Error results pass through untouched.
+"""
+
+import functools
+import inspect
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from json_stream import dumps
+
+OUTPUT_MAX_BYTES = int(os.getenv("SIMIO_OUTPUT_MAX_BYTES", "0"))  # 0 = no default budget
+
+class OutputShape(BaseModel):
+    fields: Optional[List[str]] = Field(None, description="Keep only these keys of each returned row, e.g. ['id','name','state']")
+    offset: int = Field(0, ge=0, description="Skip this many rows of each returned list")
+    limit: Optional[int] = Field(None, ge=0, description="Return at most this many rows of each list")
+    summary: bool = Field(False, description="Return counts plus the first summary_items rows instead of full lists")
+    summary_items: int = Field(5, ge=0, le=100)
+    max_bytes: Optional[int] = Field(None, ge=1000, description="Trim lists until the JSON result fits this size (default: no limit)")
+
+def _nbytes(obj: Any) -> int:
+    # FastMCP sends results as 2-space indented JSON, so measure that
+    return len(dumps(obj, indent=True))
+
+def _project(row: Any, fields: List[str]) -> Any:
+    return {k: row[k] for k in fields if k in row} if isinstance(row, dict) else row
+
+def _lists(value: Any, path: str, out: List[Tuple[Any, Any, str]], holder: Any = None, key: Any = None) -> None:
+    """Collect (holder, key, path) for every list reachable through dicts (not inside other lists)."""
+    if isinstance(value, list):
+        out.append((holder, key, path))
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            _lists(v, f"{path}.{k}", out, value, k)
+
+def _shape_value(value: Any, shape: OutputShape, path: str, notes: List[Dict[str, Any]]) -> Any:
+    if isinstance(value, list):
+        total = len(value)
+        rows = value[shape.offset:]
+        if shape.limit is not None:
+            rows = rows[:shape.limit]
+        if shape.fields:
+            rows = [_project(r, shape.fields) for r in rows]
+        if shape.summary:
+            notes.append({"path": path, "total": total, "returned": min(len(rows), shape.summary_items),
+                          "offset": shape.offset, "reason": "summary"})
+            return {"count": total, "first": rows[:shape.summary_items]}
+        if len(rows) < total:
+            notes.append({"path": path, "total": total, "returned": len(rows), "offset": shape.offset, "reason": "limit"})
+        return rows
+    if isinstance(value, dict):
+        if shape.fields and any(f in value for f in shape.fields):
+            return _project(value, shape.fields)
+        return {k: _shape_value(v, shape, f"{path}.{k}", notes) for k, v in value.items()}
+    return value
+
+def _row_bytes(row: Any, depth: int) -> int:
+    """Bytes a row adds inside a list nested `depth` dicts deep: its indented JSON, re-indented, plus ",\n"."""
+    text = dumps(row, indent=True)
+    return len(text) + (text.count(b"\n") + 1) * 2 * (depth + 1) + 2
+
+def _note(notes: List[Dict[str, Any]], path: str, total: int, keep: int) -> None:
+    note = next((n for n in notes if n["path"] == path and n.get("total") is not None), None)
+    if note:
+        note["returned"], note["reason"] = min(keep, note["returned"]), "max_bytes"
+    else:
+        notes.append({"path": path, "total": total, "returned": keep, "offset": 0, "reason": "max_bytes"})
+
+def _fit(res: Dict[str, Any], max_bytes: int, notes: List[Dict[str, Any]]) -> None:
+    """Drop rows from the end of the largest lists until res serializes within max_bytes."""
+    budget = max_bytes - 500  # room for the truncation notes
+    size = _nbytes(res)
+    for _ in range(3):  # row sizes are estimates; re-measure and go again if they were short
+        if size <= budget:
+            return
+        found: List[Tuple[Any, Any, str]] = []
+        for k, v in res.items():
+            if k not in ("ok", "truncated"):
+                _lists(v, k, found, res, k)
+        # Measured once per list per round; trimming then updates the estimate in place
+        lists = [(holder, key, path, [_row_bytes(r, path.count(".") + 1) for r in holder[key]])
+                 for holder, key, path in found if holder[key]]
+        lists.sort(key=lambda f: sum(f[3]), reverse=True)
+        excess = size - budget
+        for holder, key, path, row_sizes in lists:
+            if excess <= 0:
+                break
+            keep = len(row_sizes)
+            while keep and excess > 0:
+                keep -= 1
+                excess -= row_sizes[keep]
+            _note(notes, path, len(row_sizes), keep)
+            holder[key] = holder[key][:keep]
+        if not lists:
+            break
+        size = _nbytes(res)
+    if size > budget:
+        # No list left to trim (huge objects or strings): preview them, splitting the budget between them
+        texts = {k: dumps(res[k]).decode() for k in res if k not in ("ok", "truncated")}
+        big = [k for k, t in texts.items() if len(t) > budget // max(1, len(texts))]
+        room = max(0, budget - sum(len(t) for k, t in texts.items() if k not in big))
+        chars = room // max(1, len(big))
+        for k in big:
+            res[k] = texts[k][:chars] + "..."
+            notes.append({"path": k, "reason": "max_bytes", "preview_chars": chars})
+
+def shape_result(res: Any, shape: Optional[OutputShape]) -> Any:
+    if not isinstance(res, dict) or res.get("ok") is False:
+        return res
+    if shape is None:
+        if not OUTPUT_MAX_BYTES:
+            return res
+        shape = OutputShape()
+    notes: List[Dict[str, Any]] = []
+    out = {k: (v if k == "ok" else _shape_value(v, shape, k, notes)) for k, v in res.items()}
+    max_bytes = shape.max_bytes or OUTPUT_MAX_BYTES
+    if max_bytes:
+        _fit(out, max_bytes, notes)
+    if notes:
+        out["truncated"] = notes
+    return out
+
+def shaped(fn: Callable) -> Callable:
+    """Add an `output: OutputShape` argument to a tool and shape its result."""
+    sig = inspect.signature(fn)
+    if "output" in sig.parameters:
+        return fn
+    params = list(sig.parameters.values()) + [
+        inspect.Parameter("output", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[OutputShape])
+    ]
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def _aw(*args, output: Optional[OutputShape] = None, **kwargs):
+            return shape_result(await fn(*args, **kwargs), output)
+        wrapper = _aw
+    else:
+        @functools.wraps(fn)
+        def _w(*args, output: Optional[OutputShape] = None, **kwargs):
+            return shape_result(fn(*args, **kwargs), output)
+        wrapper = _w
+    wrapper.__signature__ = sig.replace(parameters=params)
+    return wrapper
@@ -0,0 +1,108 @@
+# paging.py
+"""
+Lazy iteration over list endpoints (runs, experiments, models, table rows).
+
+`iter_pages` calls a list endpoint one page at a time with offset/limit query
+parameters. It stops on a short page, or when the portal ignores the parameters
+(a page longer than requested, or the same page twice); in that case the first
+response is taken as the whole list. Without paging parameters it makes one
+request, or streams it through `stream` when given, so a consumer that stops
+early also stops the download. `iter_items` flattens pages into items and
+`find` stops at the first match.
+
+List paging is off by default (SIMIO_LIST_PAGE_PARAMS=none) since portals
+differ. Set it to the portal's offset/limit names, e.g. "skip,take", to page
+runs/experiments/models lists by SIMIO_LIST_PAGE_SIZE items.
+SIMIO_LIST_NAME_FILTER names a query parameter that filters runs and
+experiments by name on the server, when the portal has one.
+"""
+
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+def parse_page_params(spec: Optional[str]) -> Tuple[str, ...]:
+    """('offset', 'limit') names from "skip,take"; () for "none" or empty."""
+    names = tuple(p.strip() for p in (spec or "").split(",", 1) if p.strip())
+    return () if not names or names[0].lower() == "none" else names
+
+LIST_PAGE_SIZE = int(os.getenv("SIMIO_LIST_PAGE_SIZE", "500"))
+LIST_PAGE_PARAMS = parse_page_params(os.getenv("SIMIO_LIST_PAGE_PARAMS", "none"))
+LIST_NAME_FILTER = os.getenv("SIMIO_LIST_NAME_FILTER", "").strip()
+
+_ITEM_KEYS = ("items", "data", "value", "results")
+# Where items sit in a list response, for incremental decoding
+LIST_PREFIXES = ("item",) + tuple(f"{k}.item" for k in _ITEM_KEYS)
+
+def list_items(data: Any) -> List[Any]:
+    """A list response as a list: bare lists as is, or the list inside a wrapper dict."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return next((data[k] for k in _ITEM_KEYS if isinstance(data.get(k), list)), [])
+    return []
+
+async def iter_pages(
+    fetch: Callable[[Optional[Dict[str, Any]]], Awaitable[Any]],
+    query: Optional[Dict[str, Any]] = None,
+    *,
+    page_size: int = LIST_PAGE_SIZE,
+    page_params: Tuple[str, ...] = LIST_PAGE_PARAMS,
+    rows: Callable[[Any], List[Any]] = list_items,
+) -> AsyncIterator[List[Any]]:
+    """Yield non-empty pages from `fetch(query)`, a coroutine returning one response."""
+    if not page_params:
+        page = rows(await fetch(query or None))
+        if page:
+            yield page
+        return
+    offset_param, limit_param = page_params
+    offset = 0
+    previous: Optional[List[Any]] = None
+    while True:
+        page = rows(await fetch({**(query or {}), offset_param: offset, limit_param: page_size}))
+        if previous is not None and page and page == previous:
+            return  # offset ignored: every page is the same page
+        if page:
+            yield page
+        if len(page) != page_size:
+            return  # short page = last page; a longer one means paging was ignored
+        previous = page
+        offset += len(page)
+
+async def iter_items(
+    fetch: Callable[[Optional[Dict[str, Any]]], Awaitable[Any]],
+    query: Optional[Dict[str, Any]] = None,
+    *,
+    page_size: int = LIST_PAGE_SIZE,
+    page_params: Tuple[str, ...] = LIST_PAGE_PARAMS,
+    stream: Optional[Callable[[Optional[Dict[str, Any]]], AsyncIterator[Any]]] = None,
+) -> AsyncIterator[Any]:
+    """Yield list items lazily; unpaged lists are streamed when `stream` is given."""
+    if not page_params and stream is not None:
+        items = stream(query or None)
+        try:
+            async for item in items:
+                yield item
+        finally:
+            await items.aclose()  # a consumer that stopped early closes the response now
+        return
+    async for page in iter_pages(fetch, query, page_size=page_size, page_params=page_params):
+        for item in page:
+            yield item
+
+async def find(items: AsyncIterator[Any], predicate: Callable[[Any], bool]) -> Optional[Any]:
+    """First item matching predicate; stops fetching pages (and closes a streamed body) once found."""
+    try:
+        async for item in items:
+            if predicate(item):
+                return item
+        return None
+    finally:
+        await items.aclose()
+
+def iter_runs(client, query: Dict[str, Any]) -> AsyncIterator[Any]:
+    """runs_get items, lazily; run lists can be long, so an unpaged one is streamed."""
+    return iter_items(
+        lambda q: client.runs_get(query=q), query,
+        stream=lambda q: client.stream_items("GET", "/api/v1/runs", params=q, prefixes=LIST_PREFIXES),
+    )
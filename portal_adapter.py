@@ -1,4 +1,5 @@
 # portal_adapter.py
+import asyncio
 from helpers import api, MCPApiError
 
 _SNAKE_TO_CAMEL = {
@@ -34,3 +35,7 @@ def call(method: str, **kwargs):
             return fn(**_alt_kwargs(kwargs))
         except TypeError as e2:
             raise MCPApiError(f"{method} signature mismatch: {e1} || {e2}")
+
+async def acall(method: str, **kwargs):
+    """`call` on a worker thread, so async tools don't block the event loop on pysimio I/O."""
+    return await asyncio.to_thread(call, method, **kwargs)
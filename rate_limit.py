@@ -0,0 +1,173 @@
+# rate_limit.py
+"""
+Process-wide token-bucket rate limiter for outgoing portal requests.
+
+Every request from the sync and async REST clients takes a token from the
+bucket of its (portal URL, endpoint class) pair. The endpoint class is the
+first path segment after /api/v1, e.g. runs, scenarios, models, or "auth".
+Tokens are reserved rather than polled: a request that finds the bucket empty
+is given a slot in the queue and sleeps until that slot (time.sleep in the sync
+client, asyncio.sleep in the async one), so bursts are spread out evenly
+instead of failing.
+
+Buckets adapt AIMD-style. A 429 halves the bucket's rate (down to
+SIMIO_RATE_MIN_PER_SEC, at most once per Retry-After window) and holds the
+bucket until Retry-After has passed.
+Each success raises the rate a little, back up to SIMIO_RATE_PER_SEC. A
+throttled request is queued again and replayed (up to SIMIO_RATE_MAX_RETRIES
+times), since a 429 means the portal did not process it.
+SIMIO_RATE_PER_SEC=0 turns off the bucket limit, but Retry-After is still
+honored.
+"""
+
+import asyncio
+import email.utils
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+RATE_PER_SEC = float(os.getenv("SIMIO_RATE_PER_SEC", "10"))
+RATE_BURST = float(os.getenv("SIMIO_RATE_BURST", "20"))
+RATE_MIN_PER_SEC = float(os.getenv("SIMIO_RATE_MIN_PER_SEC", "0.5"))
+RATE_MAX_RETRIES = int(os.getenv("SIMIO_RATE_MAX_RETRIES", "5"))
+# A request that would have to queue longer than this fails instead
+RATE_MAX_WAIT_SECS = float(os.getenv("SIMIO_RATE_MAX_WAIT_SECS", "300"))
+
+class RateLimitError(RuntimeError): ...
+
+def endpoint_class(path: str) -> str:
+    parts = [p for p in path.split("?", 1)[0].split("/") if p]
+    if parts and parts[0] == "api":
+        parts = parts[1:]
+    if parts and re.fullmatch(r"v\d+", parts[0]):
+        parts = parts[1:]
+    return parts[0].lower() if parts else ""
+
+def retry_after_secs(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+@dataclass
+class _Bucket:
+    rate: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    decreased_at: float = 0.0
+    throttled: int = 0
+    queued: int = 0
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float = RATE_PER_SEC,
+        burst: float = RATE_BURST,
+        min_rate: float = RATE_MIN_PER_SEC,
+        max_wait_secs: float = RATE_MAX_WAIT_SECS,
+    ):
+        self.max_rate = rate
+        self.burst = max(1.0, burst)
+        self.min_rate = min(min_rate, rate) if rate > 0 else min_rate
+        self.max_wait_secs = max_wait_secs
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, base_url: str, path: str) -> _Bucket:
+        key = (base_url.rstrip("/"), endpoint_class(path))
+        b = self._buckets.get(key)
+        if b is None:
+            b = self._buckets[key] = _Bucket(rate=self.max_rate, tokens=self.burst, updated=time.monotonic())
+        return b
+
+    def reserve(self, base_url: str, path: str) -> float:
+        """Take a token (possibly a future one) and return how long to wait before sending."""
+        with self._lock:
+            b = self._bucket(base_url, path)
+            now = time.monotonic()
+            if b.rate > 0:
+                b.tokens = min(self.burst, b.tokens + (now - b.updated) * b.rate)
+            b.updated = now
+            wait = max(0.0, b.blocked_until - now)
+            if self.max_rate > 0:
+                b.tokens -= 1.0
+                if b.tokens < 0:
+                    wait = max(wait, -b.tokens / b.rate)
+            if wait > self.max_wait_secs:
+                if self.max_rate > 0:
+                    b.tokens += 1.0
+                raise RateLimitError(
+                    f"Rate limit queue for {endpoint_class(path) or '/'} on {base_url} is {wait:.0f}s deep "
+                    f"(max {self.max_wait_secs:.0f}s)"
+                )
+            if wait > 0:
+                b.queued += 1
+            return wait
+
+    def acquire(self, base_url: str, path: str) -> None:
+        wait = self.reserve(base_url, path)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, base_url: str, path: str) -> None:
+        wait = self.reserve(base_url, path)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self, base_url: str, path: str) -> None:
+        if self.max_rate <= 0:
+            return
+        with self._lock:
+            b = self._bucket(base_url, path)
+            if b.rate < self.max_rate:
+                b.rate = min(self.max_rate, b.rate + self.max_rate / 50)
+
+    def on_throttle(self, base_url: str, path: str, retry_after: Optional[str]) -> None:
+        """Record a 429: halve the rate and hold the bucket until Retry-After."""
+        with self._lock:
+            b = self._bucket(base_url, path)
+            b.throttled += 1
+            now = time.monotonic()
+            delay = retry_after_secs(retry_after)
+            if self.max_rate > 0:
+                # A burst of 429s for requests already in flight is one signal, not many
+                if now - b.decreased_at >= max(1.0, delay or 0.0):
+                    b.rate = max(self.min_rate, b.rate / 2)
+                    b.decreased_at = now
+                b.tokens = min(b.tokens, 0.0)
+            if delay is None:
+                delay = 1.0 / b.rate if b.rate > 0 else 1.0
+            b.blocked_until = max(b.blocked_until, now + delay)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "max_rate_per_sec": self.max_rate,
+                "burst": self.burst,
+                "buckets": [
+                    {
+                        "portal": k[0],
+                        "endpoint_class": k[1],
+                        "rate_per_sec": round(b.rate, 3),
+                        "blocked_for_secs": round(max(0.0, b.blocked_until - now), 2),
+                        "throttled": b.throttled,
+                        "queued": b.queued,
+                    }
+                    for k, b in self._buckets.items()
+                ],
+            }
+
+# Shared by the sync and async clients
+rate_limiter = RateLimiter()
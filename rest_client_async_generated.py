@@ -0,0 +1,226 @@
+"""
+AUTO-GENERATED async client from swagger.json at 2025-09-05T19:43:19.771981Z.
+This file provides AsyncSimioClientGenerated with one coroutine per endpoint
+(from endpoints.py, through call_endpoint()), mirroring SimioClientGenerated.
+Uses httpx AsyncClients pooled per (portal URL, PAT) and event loop by
+session_pool.async_pool.
+"""
+
+
+import asyncio
+import os
+import time
+import weakref
+import httpx
+from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass
+from token_cache import token_store
+from metadata_cache import metadata_cache
+from name_index import name_index
+from session_pool import async_pool
+from rate_limit import RATE_MAX_RETRIES, rate_limiter
+from circuit_breaker import circuit_breaker
+from singleflight import singleflight
+from json_stream import ACCEPT_ENCODING, STREAM_CHUNK_BYTES, ItemDecoder, loads
+from retry_policy import RetryBudget, classify, classify_status
+from endpoints import ENDPOINTS, endpoint_methods, endpoint_stats
+from rest_client_generated import SimioApiError, SimioClientGenerated, _join
+
+# asyncio.Lock binds to the loop that first uses it, so locks are kept per event loop
+_auth_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], asyncio.Lock]]" = weakref.WeakKeyDictionary()
+
+@endpoint_methods
+@dataclass
+class AsyncSimioClientGenerated:
+    base_url: str
+    token: Optional[str] = None
+    personal_access_token: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "AsyncSimioClientGenerated":
+        base = os.getenv("SIMIO_PORTAL_URL", "").strip()
+        if not base:
+            raise SimioApiError("SIMIO_PORTAL_URL must be set")
+        return cls(base_url=base)
+
+    def _headers(self) -> Dict[str,str]:
+        h = {"Accept":"application/json", "Accept-Encoding": ACCEPT_ENCODING}
+        if self.token:
+            h["Authorization"] = f"Bearer {self.token}"
+        return h
+
+    def _handle(self, r: httpx.Response):
+        if r.status_code >= 400:
+            try: data = r.json()
+            except Exception: data = r.text
+            raise SimioApiError(f"{r.status_code} {r.request.method} {r.url}: {data}")
+        if r.status_code == 204:
+            return None
+        if "application/json" in (r.headers.get("Content-Type","")):
+            return loads(r.content)
+        try: return loads(r.content)
+        except Exception: return r.text
+
+    async def _send(self, method: str, path: str, *, params=None, json=None, timeout=60, headers=None, stream=False) -> httpx.Response:
+        url = _join(self.base_url, path)
+        client = async_pool.get(self.base_url, self._pat())
+        budget = RetryBudget(method)
+        throttled = 0
+        while True:
+            if circuit_breaker.before(self.base_url, path):
+                await self._probe(path)
+            await rate_limiter.acquire_async(self.base_url, path)
+            started = time.monotonic()
+            try:
+                req = client.build_request(method.upper(), url, headers={**self._headers(), **(headers or {})}, params=params, json=json, timeout=budget.timeout(timeout))
+                r = await client.send(req, stream=stream)
+            except httpx.TransportError as e:
+                kind = classify(e)
+                circuit_breaker.record(self.base_url, path, kind in ("connect", "transport"), time.monotonic() - started)
+                # Only failures that cannot have applied a non-idempotent call are retried
+                wait = budget.next_wait(kind)
+                if wait is None:
+                    raise
+                await asyncio.sleep(wait)
+                continue
+            if r.status_code == 429:
+                # Throttled requests were not processed: back off and queue them again
+                rate_limiter.on_throttle(self.base_url, path, r.headers.get("Retry-After"))
+                if throttled < RATE_MAX_RETRIES:
+                    throttled += 1
+                    await r.aclose()
+                    continue
+                return r
+            rate_limiter.on_success(self.base_url, path)
+            server_error = classify_status(r.status_code) == "server"
+            circuit_breaker.record(self.base_url, path, server_error, time.monotonic() - started)
+            if server_error:
+                wait = budget.next_wait("server")
+                if wait is not None:
+                    await r.aclose()
+                    await asyncio.sleep(wait)
+                    continue
+            return r
+
+    async def _probe(self, path: str) -> None:
+        """Half-open circuit: check the portal's heartbeat before sending the trial request."""
+        try:
+            await self.heartbeat_get()
+            ok = True
+        except Exception:
+            ok = False
+        circuit_breaker.probe_done(self.base_url, path, ok)
+
+    async def _execute(self, method: str, path: str, *, params=None, json=None, timeout=60, headers=None, stream=False):
+        if not self.token and path != "/api/auth" and self._pat():
+            await self.authenticate(self.personal_access_token)
+        r = await self._send(method, path, params=params, json=json, timeout=timeout, headers=headers, stream=stream)
+        if r.status_code == 401 and path != "/api/auth" and self._pat():
+            await r.aclose()
+            # Cached token expired or was revoked: re-authenticate once and replay
+            stale = self.token
+            if stale:
+                token_store.invalidate(self.base_url, self._pat(), stale)
+            await self.authenticate(self.personal_access_token)
+            r = await self._send(method, path, params=params, json=json, timeout=timeout, headers=headers, stream=stream)
+        return r
+
+    async def request(self, method: str, path: str, *, params=None, json=None, timeout=60):
+        if method.upper() == "GET":
+            # Identical concurrent GETs share one in-flight request
+            key = ("GET",) + metadata_cache.key(self.base_url, self._pat(), path, params)
+            return await singleflight.ado(key, lambda: self._get(path, params, timeout))
+        return self._handle(await self._execute(method, path, params=params, json=json, timeout=timeout))
+
+    async def _get(self, path: str, params, timeout):
+        return self._handle(await self._execute("GET", path, params=params, timeout=timeout))
+
+    async def stream_items(self, method: str, path: str, *, params=None, json=None, prefixes=("item",), timeout=60):
+        """Async-iterate the items of a JSON response as they arrive (see json_stream.ItemDecoder)."""
+        r = await self._execute(method, path, params=params, json=json, timeout=timeout, stream=True)
+        try:
+            if r.status_code >= 400:
+                await r.aread()
+                self._handle(r)
+            decoder = ItemDecoder(prefixes)
+            async for chunk in r.aiter_bytes(STREAM_CHUNK_BYTES):
+                for item in decoder.feed(chunk):
+                    yield item
+            for item in decoder.close():
+                yield item
+        finally:
+            await r.aclose()
+
+    async def cached_get(self, path: str, *, params=None, timeout=60):
+        """GET through the shared metadata cache (TTL, then ETag/Last-Modified revalidation)."""
+        key = metadata_cache.key(self.base_url, self._pat(), path, params)
+        entry, fresh = metadata_cache.lookup(key)
+        if fresh:
+            return entry.data
+        return await singleflight.ado(("cached",) + key, lambda: self._revalidate(key, entry, path, params, timeout))
+
+    async def _revalidate(self, key, entry, path: str, params, timeout):
+        r = await self._execute("GET", path, params=params, timeout=timeout, headers=entry.validators() if entry else None)
+        if r.status_code == 304 and entry:
+            current = metadata_cache.touch(key, entry)
+            if current is not None:
+                return current.data
+            r = await self._execute("GET", path, params=params, timeout=timeout)  # invalidated meanwhile
+        return metadata_cache.store(key, self._handle(r), r.headers)
+
+    async def _mutate_metadata(self, method: str, path: str, *, params=None, json=None):
+        try:
+            return await self.request(method, path, params=params, json=json)
+        finally:
+            # Even a failed call may have partially applied; never serve a stale list or ID
+            metadata_cache.invalidate(self.base_url)
+            name_index.invalidate(self.base_url)
+
+    def _pat(self) -> Optional[str]:
+        return self.personal_access_token or os.getenv("PERSONAL_ACCESS_TOKEN")
+
+    async def _fetch_token(self, pat: str) -> str:
+        data = self._handle(await self._send("POST", "/api/auth", json={"personalAccessToken": pat}))
+        token = (data or {}).get("token")
+        if not token:
+            raise SimioApiError("Auth succeeded but no token returned")
+        return token
+
+    async def authenticate(self, personal_access_token: Optional[str] = None) -> str:
+        """Return a bearer token for this portal/PAT, sharing the sync client's token cache."""
+        if personal_access_token:
+            self.personal_access_token = personal_access_token
+        pat = self._pat()
+        if not pat:
+            raise SimioApiError("No PAT provided")
+        token = token_store.peek(self.base_url, pat)
+        if not token:
+            locks = _auth_locks.setdefault(asyncio.get_running_loop(), {})
+            lock = locks.setdefault(token_store.key(self.base_url, pat), asyncio.Lock())
+            async with lock:
+                token = token_store.peek(self.base_url, pat)
+                if not token:
+                    token = await self._fetch_token(pat)
+                    # Background renewals run on a timer thread, so they use the sync client
+                    sync = SimioClientGenerated(base_url=self.base_url, personal_access_token=pat)
+                    token_store.put(self.base_url, pat, token, fetch=lambda: sync._fetch_token(pat))
+        self.token = token
+        return token
+
+    async def call_endpoint(self, name: str, *args, **kwargs):
+        """Call endpoints.ENDPOINTS[name]; every per-endpoint method goes through here."""
+        ep = ENDPOINTS[name]
+        path, params, body = ep.bind(args, kwargs)
+        started = time.monotonic()
+        failed = True
+        try:
+            if ep.mode == "cached":
+                result = await self.cached_get(path, params=params)
+            elif ep.mode == "mutate":
+                result = await self._mutate_metadata(ep.method, path, params=params, json=body)
+            else:
+                result = await self.request(ep.method, path, params=params, json=body)
+            failed = False
+            return result
+        finally:
+            endpoint_stats.record(name, time.monotonic() - started, failed)
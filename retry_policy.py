@@ -0,0 +1,150 @@
+# retry_policy.py
+"""
+Retry policy for portal requests, keyed on failure class and HTTP method.
+
+Failure classes:
+  connect   - the request never reached the portal (refused, DNS, connect timeout,
+              no free pool connection): safe to retry for any method
+  transport - the connection broke or timed out after the request was sent: the
+              portal may have acted on it, so only idempotent methods are retried
+  server    - 408/500/502/503/504: retried for idempotent methods only
+  throttle  - 429: replayed by the rate limiter (rate_limit.py), not here
+  permanent - any other 4xx/5xx: never retried
+Non-idempotent calls (POST, PATCH: creating runs, uploading projects, starting
+exports) are therefore sent at most once unless the connection was never made.
+
+Waits use full jitter (uniform in [0, base * 2**attempt], capped at
+SIMIO_RETRY_MAX_SECS), and all attempts of one call share a latency budget of
+SIMIO_RETRY_BUDGET_SECS: no retry starts if its wait would cross it.
+"""
+
+import functools
+import inspect
+import os
+import random
+import re
+import sys
+import time
+from typing import Callable, Optional
+
+RETRY_ATTEMPTS = int(os.getenv("SIMIO_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_SECS = float(os.getenv("SIMIO_RETRY_BASE_SECS", "0.5"))
+RETRY_MAX_SECS = float(os.getenv("SIMIO_RETRY_MAX_SECS", "4"))
+RETRY_BUDGET_SECS = float(os.getenv("SIMIO_RETRY_BUDGET_SECS", "30"))
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({408, 500, 502, 503, 504})
+
+def classify_status(status: int) -> Optional[str]:
+    if status == 429:
+        return "throttle"
+    if status in RETRY_STATUSES:
+        return "server"
+    if status >= 400:
+        return "permanent"
+    return None
+
+def status_of(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by a client exception, if any."""
+    resp = getattr(exc, "response", None)
+    status = getattr(resp, "status_code", None)
+    if isinstance(status, int):
+        return status
+    # SimioApiError messages start with "<status> <METHOD> <url>"
+    m = re.match(r"(\d{3}) [A-Z]+ ", str(exc))
+    return int(m.group(1)) if m else None
+
+def classify(exc: BaseException) -> str:
+    # httpx and requests are only checked once something imported them, so importing this module stays cheap
+    httpx = sys.modules.get("httpx")
+    if httpx is not None:
+        if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return "connect"
+        if isinstance(exc, httpx.TransportError):
+            return "transport"
+    requests = sys.modules.get("requests")
+    if requests is not None:
+        if isinstance(exc, requests.ConnectTimeout):
+            return "connect"
+        if isinstance(exc, requests.ConnectionError):
+            reason = getattr(exc.args[0], "reason", None) if exc.args else None
+            # urllib3's NewConnectionError is a ConnectTimeoutError: the request was never sent
+            if isinstance(reason, sys.modules["urllib3"].exceptions.ConnectTimeoutError):
+                return "connect"
+            return "transport"
+        if isinstance(exc, requests.Timeout):
+            return "transport"
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return "transport"
+    status = status_of(exc)
+    if status is not None:
+        return classify_status(status) or "other"
+    return "other"
+
+def should_retry(kind: Optional[str], method: str) -> bool:
+    if kind == "connect":
+        return True
+    if kind in ("transport", "server"):
+        return method.upper() in IDEMPOTENT_METHODS
+    return False
+
+def backoff_secs(attempt: int) -> float:
+    """Full-jitter wait before retry number `attempt` (0-based)."""
+    return random.uniform(0, min(RETRY_MAX_SECS, RETRY_BASE_SECS * 2 ** attempt))
+
+class RetryBudget:
+    """Attempt count and deadline shared by all tries of one call."""
+
+    def __init__(self, method: str, attempts: int = RETRY_ATTEMPTS, budget_secs: float = RETRY_BUDGET_SECS):
+        self.method = method.upper()
+        self.attempts = max(1, attempts)
+        self.deadline = time.monotonic() + budget_secs
+        self.tries = 0
+
+    def next_wait(self, kind: Optional[str]) -> Optional[float]:
+        """Seconds to wait before retrying after a `kind` failure, or None to give up."""
+        self.tries += 1
+        if self.tries >= self.attempts or not should_retry(kind, self.method):
+            return None
+        wait = backoff_secs(self.tries - 1)
+        if time.monotonic() + wait >= self.deadline:
+            return None
+        return wait
+
+    def timeout(self, timeout: float) -> float:
+        """Per-attempt timeout: retries never run past the deadline."""
+        if self.tries == 0:
+            return timeout
+        return max(0.1, min(timeout, self.deadline - time.monotonic()))
+
+def _transient(exc: BaseException) -> bool:
+    return classify(exc) in ("connect", "transport", "server")
+
+def retry_transient(fn: Callable) -> Callable:
+    """Tool-level retry for idempotent calls that bypass the REST clients (pysimio).
+    tenacity is imported on the first call, keeping it off the startup path."""
+    retrying: Optional[Callable] = None
+
+    def build() -> Callable:
+        nonlocal retrying
+        if retrying is None:
+            from tenacity import retry, retry_if_exception, stop_after_attempt, stop_after_delay, wait_random_exponential
+
+            retrying = retry(
+                reraise=True,
+                stop=stop_after_attempt(RETRY_ATTEMPTS) | stop_after_delay(RETRY_BUDGET_SECS),
+                wait=wait_random_exponential(multiplier=RETRY_BASE_SECS, max=RETRY_MAX_SECS),
+                retry=retry_if_exception(_transient),
+            )(fn)
+        return retrying
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            return await build()(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return build()(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,306 @@
+# run_poller.py
+"""
+Shared background poller for in-flight runs.
+
+Every workflow that waits on a run registers it here instead of running its own
+getRun loop. One task on the event loop wakes up when the earliest tracked run
+is due, groups the due runs by tenant and experiment, and fetches them with as
+few requests as possible: one runs_get(experiment_id=...) per experiment with
+two or more due runs, runs_getrunbyid for the rest (and for any run the list
+did not include, e.g. plan runs that only appear as child runs). The runs list
+is read lazily and dropped as soon as every tracked run of the experiment has
+been seen (paging.iter_runs). Each snapshot
+is fanned out to every waiter of that run, so portal request volume tracks the
+number of experiments being watched, not the number of waiting workflows.
+
+Runs registered with adaptive=True are rescheduled from their progress: the
+percentComplete rate since the first observation gives an ETA, and the next
+poll is set to half the remaining time, clamped to [min_interval_secs,
+max_interval_secs]. Without measurable progress the interval doubles up to the
+maximum. Snapshots carry the current estimate as eta_secs.
+
+Other asynchronous portal jobs (scenario exports and imports) are tracked by
+the same loop through `wait_for`, with their own fetch coroutine, snapshot and
+done test. Their interval grows by `backoff` after every poll.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from paging import iter_runs
+
+log = logging.getLogger("SimioPortalMCP")
+
+TERMINAL_STATES = {"COMPLETED", "FAILED", "ERROR", "CANCELED"}
+# Consecutive failed status fetches before waiters of a run are failed
+MAX_POLL_ERRORS = 5
+
+def is_terminal(state: Optional[str]) -> bool:
+    return (state or "").upper() in TERMINAL_STATES
+
+def _run_done(snap: Dict[str, Any]) -> bool:
+    return is_terminal(snap.get("state"))
+
+def snapshot(detail: Dict[str, Any]) -> Dict[str, Any]:
+    """The status fields workflows report for a run."""
+    return {
+        "state": detail.get("state"),
+        "percentComplete": detail.get("percentComplete"),
+        "started": detail.get("startDateTimeUtc"),
+        "finished": detail.get("endDateTimeUtc"),
+    }
+
+@dataclass
+class _Tracked:
+    client: Any
+    run_id: str
+    experiment_id: Optional[str]
+    interval_secs: float
+    next_due: float = 0.0
+    last: Dict[str, Any] = field(default_factory=dict)
+    errors: int = 0
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    polls: int = 0
+    adaptive: bool = False
+    min_interval_secs: float = 1.0
+    max_interval_secs: float = 300.0
+    first_progress: Optional[Tuple[float, float]] = None  # (monotonic ts, percentComplete)
+    eta_secs: Optional[float] = None
+    # Set for non-run jobs (wait_for); runs use the shared runs_get / runs_getrunbyid fetch
+    fetch: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None
+    snapshot: Callable[[Dict[str, Any]], Dict[str, Any]] = snapshot
+    done: Callable[[Dict[str, Any]], bool] = _run_done
+    backoff: float = 1.0
+
+    def reschedule(self, now: float) -> None:
+        pct = self.last.get("percentComplete")
+        if not self.adaptive:
+            if self.polls > 1:
+                self.interval_secs = min(self.max_interval_secs, self.interval_secs * self.backoff)
+            self.next_due = now + self.interval_secs
+            return
+        try:
+            pct = float(pct)
+        except (TypeError, ValueError):
+            pct = None
+        rate = None
+        if pct is not None:
+            if self.first_progress is None or self.first_progress[1] >= pct:
+                # Baseline moves until progress starts, so idle startup time doesn't skew the rate
+                self.first_progress = (now, pct)
+            t0, p0 = self.first_progress
+            if pct > p0 and now > t0:
+                rate = (pct - p0) / (now - t0)
+        if rate:
+            self.eta_secs = max(0.0, (100.0 - pct) / rate)
+            interval = self.eta_secs / 2
+        else:
+            self.eta_secs = None
+            interval = self.interval_secs * 2 if self.polls > 1 else self.interval_secs
+        self.interval_secs = min(self.max_interval_secs, max(self.min_interval_secs, interval))
+        self.next_due = now + self.interval_secs
+
+class RunPoller:
+    def __init__(self):
+        self._runs: Dict[Tuple[str, str, str], _Tracked] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.requests = 0  # portal status requests issued, for diagnostics
+
+    @staticmethod
+    def _key(client, run_id) -> Tuple[str, str, str]:
+        return (client.base_url.rstrip("/"), client._pat() or "", str(run_id))
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wake = asyncio.Event()
+            self._task = loop.create_task(self._loop())
+
+    def last(self, client, run_id) -> Dict[str, Any]:
+        t = self._runs.get(self._key(client, run_id))
+        return dict(t.last) if t else {}
+
+    def tracked(self) -> List[Dict[str, Any]]:
+        return [
+            {"run_id": t.run_id, "experiment_id": t.experiment_id, "waiters": len(t.waiters), "interval_secs": t.interval_secs, **t.last}
+            for t in self._runs.values()
+        ]
+
+    async def wait(
+        self,
+        client,
+        run_id: Any,
+        *,
+        experiment_id: Any = None,
+        interval_secs: float = 10.0,
+        timeout_secs: Optional[float] = None,
+        adaptive: bool = False,
+        min_interval_secs: float = 1.0,
+        max_interval_secs: float = 300.0,
+    ) -> Dict[str, Any]:
+        """
+        Wait until `run_id` reaches a terminal state and return its snapshot.
+        On timeout returns the last snapshot with state 'TIMEOUT'.
+        `interval_secs` is the fixed interval, or the starting one when adaptive.
+        """
+        key = self._key(client, run_id)
+        t = self._runs.get(key)
+        if t is None:
+            t = self._runs[key] = _Tracked(
+                client=client,
+                run_id=str(run_id),
+                experiment_id=None if experiment_id is None else str(experiment_id),
+                interval_secs=interval_secs,
+                adaptive=adaptive,
+                min_interval_secs=min_interval_secs,
+                max_interval_secs=max(min_interval_secs, max_interval_secs),
+            )
+        else:
+            # Shared run: the most eager waiter sets the pace
+            t.interval_secs = min(t.interval_secs, interval_secs)
+            t.min_interval_secs = min(t.min_interval_secs, min_interval_secs)
+            t.max_interval_secs = min(t.max_interval_secs, max(min_interval_secs, max_interval_secs))
+            t.adaptive = t.adaptive and adaptive
+            t.experiment_id = t.experiment_id or (None if experiment_id is None else str(experiment_id))
+        return await self._await(key, t, timeout_secs)
+
+    async def wait_for(
+        self,
+        client,
+        key: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        *,
+        snapshot: Callable[[Dict[str, Any]], Dict[str, Any]],
+        done: Callable[[Dict[str, Any]], bool],
+        interval_secs: float = 2.0,
+        backoff: float = 1.5,
+        max_interval_secs: float = 60.0,
+        timeout_secs: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Wait for a non-run portal job (identified by `key`, e.g. 'export:<run>:<id>')
+        until done(snapshot(await fetch())) is true. Same timeout behaviour as wait().
+        """
+        tkey = self._key(client, key)
+        t = self._runs.get(tkey)
+        if t is None:
+            t = self._runs[tkey] = _Tracked(
+                client=client, run_id=str(key), experiment_id=None, interval_secs=interval_secs,
+                max_interval_secs=max(interval_secs, max_interval_secs),
+                fetch=fetch, snapshot=snapshot, done=done, backoff=max(1.0, backoff),
+            )
+        return await self._await(tkey, t, timeout_secs)
+
+    async def _await(self, key: Tuple[str, str, str], t: _Tracked, timeout_secs: Optional[float]) -> Dict[str, Any]:
+        fut = asyncio.get_running_loop().create_future()
+        t.waiters.append(fut)
+        self._ensure_running()
+        self._wake.set()
+        try:
+            return await asyncio.wait_for(asyncio.shield(fut), timeout_secs)
+        except asyncio.TimeoutError:
+            return {**t.last, "state": "TIMEOUT"}
+        finally:
+            if fut in t.waiters:
+                t.waiters.remove(fut)
+            if not t.waiters and self._runs.get(key) is t:
+                del self._runs[key]
+
+    async def _loop(self) -> None:
+        while self._runs:
+            now = time.monotonic()
+            due = [t for t in self._runs.values() if t.next_due <= now]
+            if due:
+                for t in due:
+                    t.next_due = now + t.interval_secs
+                try:
+                    await self._poll(due)
+                except Exception:
+                    log.exception("Run poller tick failed")
+                continue
+            self._wake.clear()
+            delay = min(t.next_due for t in self._runs.values()) - now
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, due: List[_Tracked]) -> None:
+        groups: Dict[Tuple[str, str, Optional[str]], List[_Tracked]] = {}
+        custom = [t for t in due if t.fetch is not None]
+        for t in due:
+            if t.fetch is not None:
+                continue
+            groups.setdefault((*self._key(t.client, t.run_id)[:2], t.experiment_id), []).append(t)
+
+        async def fetch_group(members: List[_Tracked]) -> None:
+            remaining = members
+            exp_id = members[0].experiment_id
+            if exp_id is not None and len(members) > 1:
+                try:
+                    self.requests += 1
+                    # The list covers every tracked run of this experiment, due or not; stop once all are seen
+                    tenant = self._key(members[0].client, "")[:2]
+                    wanted = {t.run_id for key, t in self._runs.items()
+                              if key[:2] == tenant and t.fetch is None and t.experiment_id == exp_id}
+                    by_id: Dict[str, Any] = {}
+                    runs = iter_runs(members[0].client, {"experiment_id": exp_id})
+                    try:
+                        async for r in runs:
+                            if isinstance(r, dict) and str(r.get("id")) in wanted:
+                                by_id[str(r.get("id"))] = r
+                                if len(by_id) == len(wanted):
+                                    break
+                    finally:
+                        await runs.aclose()
+                    remaining = [t for t in members if t.run_id not in by_id]
+                    for key, t in list(self._runs.items()):
+                        if key[:2] == tenant and t.fetch is None and t.experiment_id == exp_id and t.run_id in by_id:
+                            self._update(t, by_id[t.run_id])
+                except Exception as e:
+                    log.warning("runs_get for experiment %s failed: %s", exp_id, e)
+            await asyncio.gather(*(fetch_one(t) for t in remaining))
+
+        async def fetch_one(t: _Tracked) -> None:
+            try:
+                self.requests += 1
+                if t.fetch is not None:
+                    detail = await t.fetch()
+                else:
+                    detail = await t.client.runs_getrunbyid(run_id=t.run_id)
+                self._update(t, detail or {})
+            except Exception as e:
+                self._failed(t, e)
+
+        await asyncio.gather(*(fetch_group(m) for m in groups.values()), *(fetch_one(t) for t in custom))
+
+    def _update(self, t: _Tracked, detail: Dict[str, Any]) -> None:
+        t.errors = 0
+        t.polls += 1
+        t.last = t.snapshot(detail)
+        t.reschedule(time.monotonic())
+        finished = t.done(t.last)
+        if finished:
+            t.eta_secs = 0.0 if t.fetch is None else None
+        if t.eta_secs is not None:
+            t.last["eta_secs"] = round(t.eta_secs, 1)
+        if finished:
+            for fut in t.waiters:
+                if not fut.done():
+                    fut.set_result(dict(t.last))
+
+    def _failed(self, t: _Tracked, exc: Exception) -> None:
+        t.errors += 1
+        t.next_due = time.monotonic() + t.interval_secs
+        log.warning("Status fetch for run %s failed (%d in a row): %s", t.run_id, t.errors, exc)
+        if t.errors >= MAX_POLL_ERRORS:
+            for fut in t.waiters:
+                if not fut.done():
+                    fut.set_exception(exc)
+
+# Shared by every workflow on this process
+run_poller = RunPoller()
@@ -1,9 +1,10 @@
 # server.py
 from helpers import log
 from mcp_app import mcp  # the shared FastMCP instance
-import api_tools_rest_generated
-import tools  # importing registers all @mcp.tool()s
-import workflow_tools
+from tool_registry import load_tools
+
+# Tools are listed from tool_manifest.json; their modules are imported on first call
+load_tools(mcp)
 
 if __name__ == "__main__":
     log.info("Starting SimioPortalTools...")
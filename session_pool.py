@@ -0,0 +1,122 @@
+# session_pool.py
+"""
+Per-tenant HTTP connection pools for the REST clients.
+
+A tenant is a (portal URL, PAT) pair. Each tenant gets its own keep-alive pool,
+requests.Session for SimioClientGenerated and httpx.AsyncClient (per event loop)
+for AsyncSimioClientGenerated, so users of a shared server never share
+connections or credentials while each user's TLS connections are reused.
+Pools idle for longer than SIMIO_POOL_IDLE_SECS are closed on the next lookup.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_PER_HOST = int(os.getenv("SIMIO_POOL_MAX_PER_HOST", "10"))
+IDLE_SECS = float(os.getenv("SIMIO_POOL_IDLE_SECS", "300"))
+
+TenantKey = Tuple[str, str]
+
+def tenant_key(base_url: str, pat: Optional[str]) -> TenantKey:
+    return (base_url.rstrip("/"), pat or "")
+
+class _Pooled:
+    __slots__ = ("client", "last_used")
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.last_used = time.monotonic()
+
+class SessionPool:
+    """Thread-safe tenant -> requests.Session map with idle eviction."""
+
+    def __init__(self, max_per_host: int = MAX_PER_HOST, idle_secs: float = IDLE_SECS):
+        self.max_per_host = max_per_host
+        self.idle_secs = idle_secs
+        self._entries: Dict[TenantKey, _Pooled] = {}
+        self._lock = threading.Lock()
+
+    def _new_session(self) -> requests.Session:
+        s = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_per_host)
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        return s
+
+    def get(self, base_url: str, pat: Optional[str]) -> requests.Session:
+        key = tenant_key(base_url, pat)
+        with self._lock:
+            self._evict_idle()
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Pooled(self._new_session())
+            entry.last_used = time.monotonic()
+            return entry.client
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_secs
+        for key in [k for k, e in self._entries.items() if e.last_used < cutoff]:
+            self._entries.pop(key).client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"tenants": len(self._entries), "max_per_host": self.max_per_host, "idle_secs": self.idle_secs}
+
+    def close(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                entry.client.close()
+            self._entries.clear()
+
+class AsyncClientPool:
+    """(event loop, tenant) -> httpx.AsyncClient map with idle eviction."""
+
+    def __init__(self, max_per_host: int = MAX_PER_HOST, idle_secs: float = IDLE_SECS):
+        self.max_per_host = max_per_host
+        self.idle_secs = idle_secs
+        self._entries: Dict[Tuple[asyncio.AbstractEventLoop, TenantKey], _Pooled] = {}
+
+    def _new_client(self):
+        import httpx  # only needed once an async client is used
+        limits = httpx.Limits(
+            max_connections=self.max_per_host,
+            max_keepalive_connections=self.max_per_host,
+            keepalive_expiry=self.idle_secs,
+        )
+        return httpx.AsyncClient(limits=limits)
+
+    def get(self, base_url: str, pat: Optional[str]):
+        loop = asyncio.get_running_loop()
+        self._evict_idle(loop)
+        key = (loop, tenant_key(base_url, pat))
+        entry = self._entries.get(key)
+        if entry is None or entry.client.is_closed:
+            entry = self._entries[key] = _Pooled(self._new_client())
+        entry.last_used = time.monotonic()
+        return entry.client
+
+    def _evict_idle(self, loop: asyncio.AbstractEventLoop) -> None:
+        cutoff = time.monotonic() - self.idle_secs
+        for key in [k for k, e in self._entries.items() if e.last_used < cutoff or k[0].is_closed()]:
+            entry = self._entries.pop(key)
+            if key[0] is loop:
+                loop.create_task(entry.client.aclose())
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tenants": len(self._entries), "max_per_host": self.max_per_host, "idle_secs": self.idle_secs}
+
+    async def aclose(self) -> None:
+        """Close every pool bound to the running event loop (e.g. on shutdown)."""
+        loop = asyncio.get_running_loop()
+        for key in [k for k in self._entries if k[0] is loop]:
+            await self._entries.pop(key).client.aclose()
+
+# Process-wide pools used by the generated clients
+session_pool = SessionPool()
+async_pool = AsyncClientPool()
@@ -0,0 +1,102 @@
+# singleflight.py
+"""
+Single-flight coalescing of identical in-flight GETs.
+
+Concurrent GETs with the same (portal URL, PAT, path, query), e.g. many
+workflows polling runs_getrunbyid for one run or listing models at once,
+share one HTTP request and its parsed result. The first caller starts the
+request; callers that arrive while it is in flight wait for it and get a
+deep copy of the result (or the same exception). The shared result itself is
+never handed out once anyone has joined (the first caller then gets a copy
+too), so nobody can mutate another caller's data. Nothing is kept once the request finishes: this
+dedupes concurrent load, and caching is left to metadata_cache.
+
+The async side coalesces per event loop. The shared request runs as its own
+task, so cancelling one waiting caller does not cancel it for the others. The
+sync side coalesces across threads. SIMIO_COALESCE_GETS=0 turns it off.
+"""
+
+import asyncio
+import copy
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+COALESCE_GETS = os.getenv("SIMIO_COALESCE_GETS", "1").lower() not in ("0", "false", "no")
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+class SingleFlight:
+    def __init__(self, enabled: bool = COALESCE_GETS):
+        self.enabled = enabled
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[int, Hashable], Tuple[asyncio.Task, _Call]] = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return fn()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.started += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+        else:
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        # No one can join once the call is popped, so waiters is final here
+        return call.result if leader and not call.waiters else copy.deepcopy(call.result)
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await fn()
+        # Tasks are bound to their loop; the key includes it
+        k = (id(asyncio.get_running_loop()), key)
+        entry = self._tasks.get(k)
+        leader = entry is None
+        if leader:
+            task, call = asyncio.ensure_future(fn()), _Call()
+            self._tasks[k] = (task, call)
+            # Runs before any waiter resumes (callbacks fire in order), so waiters is final by then
+            task.add_done_callback(lambda t: self._finished(k, t))
+            self.started += 1
+        else:
+            task, call = entry
+            call.waiters += 1
+            self.coalesced += 1
+        result = await asyncio.shield(task)
+        return result if leader and not call.waiters else copy.deepcopy(result)
+
+    def _finished(self, k: Tuple[int, Hashable], task: asyncio.Task) -> None:
+        if self._tasks.get(k, (None,))[0] is task:
+            del self._tasks[k]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every waiter was cancelled
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "requests": self.started, "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._tasks)}
+
+# Shared by the sync and async clients
+singleflight = SingleFlight()
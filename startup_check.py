@@ -0,0 +1,43 @@
+# startup_check.py
+"""
+Cold-start budget check: python startup_check.py [budget_secs]
+
+Imports server.py in fresh interpreters and fails if the best import time is over
+budget (default 1.0s, or SIMIO_STARTUP_BUDGET_SECS), if any tool module was imported
+at startup, or if fewer tools are listed than when every module is imported.
+The first run (re)builds tool_manifest.json when it is missing or stale.
+"""
+
+import json, os, subprocess, sys
+
+PROBE = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import server
+elapsed = time.perf_counter() - t0
+from tool_registry import TOOL_MODULES
+tools = asyncio.run(server.mcp.list_tools())
+print(json.dumps({"secs": elapsed, "tools": len(tools),
+                  "imported": [m for m in TOOL_MODULES if m in sys.modules]}))
+"""
+
+def probe(**env):
+    out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)), env={**os.environ, **env})
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    budget = float(sys.argv[1] if len(sys.argv) > 1 else os.getenv("SIMIO_STARTUP_BUDGET_SECS", "1.0"))
+    eager = probe(SIMIO_LAZY_TOOLS="0")
+    print(f"[eager] {eager['secs']:.3f}s, {eager['tools']} tools")
+    probe()  # writes the manifest if needed
+    runs = [probe() for _ in range(3)]
+    best = min(r["secs"] for r in runs)
+    print(f"[lazy]  {best:.3f}s (best of {len(runs)}), {runs[0]['tools']} tools, modules imported: {runs[0]['imported']}")
+    assert runs[0]["tools"] == eager["tools"], "manifest lists a different set of tools"
+    assert not runs[0]["imported"], f"tool modules imported at startup: {runs[0]['imported']}"
+    assert best <= budget, f"startup took {best:.3f}s, budget {budget:.3f}s"
+    print(f"OK: within the {budget:.3f}s budget")
+
+if __name__ == "__main__":
+    main()
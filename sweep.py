@@ -0,0 +1,72 @@
+# sweep.py
+"""
+Design points for parameter sweeps (see sweep_plan_runs in workflow_tools).
+
+  grid: Cartesian product of per-control value lists
+  lhs:  Latin hypercube sample over per-control [low, high] ranges; each range
+        is split into `samples` equal strata and every stratum is used once
+  list: explicit control maps, used as given
+Every point is merged over `fixed` controls.
+"""
+
+import itertools
+import math
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+from helpers import MCPValidationError
+
+def grid_points(grid: Dict[str, Sequence[Any]], max_points: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Size is checked against max_points before the product is built."""
+    values = {n: list(v) for n, v in (grid or {}).items()}
+    if not values or any(not v for v in values.values()):
+        raise MCPValidationError("grid needs at least one value for every control")
+    size = math.prod(len(v) for v in values.values())
+    if max_points is not None and size > max_points:
+        raise MCPValidationError(f"Design has {size} runs, above max_runs={max_points}")
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(values[n] for n in names))]
+
+def lhs_points(
+    ranges: Dict[str, Sequence[float]],
+    samples: int,
+    seed: Optional[int] = None,
+    integer: Sequence[str] = (),
+) -> List[Dict[str, Any]]:
+    if not ranges or samples < 1:
+        raise MCPValidationError("lhs needs ranges and samples >= 1")
+    rng = random.Random(seed)
+    columns: Dict[str, List[Any]] = {}
+    for name, bounds in ranges.items():
+        if len(bounds) != 2 or not bounds[0] <= bounds[1]:
+            raise MCPValidationError(f"Range for '{name}' must be [low, high], got {list(bounds)}")
+        lo, hi = float(bounds[0]), float(bounds[1])
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        values = [lo + (s + rng.random()) / samples * (hi - lo) for s in strata]
+        columns[name] = [round(v) for v in values] if name in integer else values
+    return [{n: columns[n][i] for n in columns} for i in range(samples)]
+
+def design_points(
+    mode: str,
+    *,
+    grid: Optional[Dict[str, Sequence[Any]]] = None,
+    ranges: Optional[Dict[str, Sequence[float]]] = None,
+    samples: int = 0,
+    seed: Optional[int] = None,
+    integer: Sequence[str] = (),
+    points: Optional[List[Dict[str, Any]]] = None,
+    fixed: Optional[Dict[str, Any]] = None,
+    max_points: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    if mode == "grid":
+        out = grid_points(grid or {}, max_points)
+    elif mode == "lhs":
+        out = lhs_points(ranges or {}, samples, seed, integer)
+    elif mode == "list":
+        if not points:
+            raise MCPValidationError("list mode needs points")
+        out = [dict(p) for p in points]
+    else:
+        raise MCPValidationError("mode must be 'grid', 'lhs' or 'list'")
+    return [{**(fixed or {}), **p} for p in out]
@@ -0,0 +1,224 @@
+# table_io.py
+"""
+Paged access to scenario table row data, and incremental writers for it.
+
+`iter_table_pages` walks scenarios_getscenariotablerowdata one page at a time
+(paging.iter_pages) using offset/limit query parameters
+(SIMIO_TABLE_PAGE_PARAMS, default "skip,take"), so only one page is ever held
+in memory. With paging off (SIMIO_TABLE_PAGE_PARAMS=none) the table is fetched
+in one request and decoded row by row as it streams in (bounded memory with
+`ijson`), then cut into pages of the same size.
+
+Pages are written as they arrive, to NDJSON (one JSON object per row) or to
+Parquet (one row group per page; needs the optional `pyarrow` package), and
+`iter_file_pages` reads such a file back in pages of the same shape.
+"""
+
+import json
+import os
+import tempfile
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from helpers import MCPApiError, MCPConfigError, MCPValidationError
+from paging import iter_pages, parse_page_params
+
+TABLE_PAGE_SIZE = int(os.getenv("SIMIO_TABLE_PAGE_SIZE", "5000"))
+# "none" (or empty) means the portal has no paging: the table is streamed in one response
+TABLE_PAGE_PARAMS = parse_page_params(os.getenv("SIMIO_TABLE_PAGE_PARAMS", "skip,take"))
+DOWNLOAD_DIR = os.getenv("SIMIO_DOWNLOAD_DIR") or os.path.join(tempfile.gettempdir(), "simio_portal_mcp")
+
+_ROW_KEYS = ("rows", "items", "data", "value", "results")
+_COLUMN_KEYS = ("columns", "columnNames", "headers")
+# Where rows sit in a table-data response, for incremental decoding
+ROW_PREFIXES = ("item",) + tuple(f"{k}.item" for k in _ROW_KEYS)
+
+def table_rows(data: Any) -> List[Dict[str, Any]]:
+    """
+    Normalize a table-data response to a list of row dicts.
+    Accepts a bare list of rows or a dict wrapping one; positional rows (lists, or
+    {"values": [...]}) are zipped with the response's column names.
+    """
+    columns: Optional[List[str]] = None
+    rows: Any = data
+    if isinstance(data, dict):
+        rows = next((data[k] for k in _ROW_KEYS if isinstance(data.get(k), list)), [])
+        cols = next((data[k] for k in _COLUMN_KEYS if isinstance(data.get(k), list)), None)
+        if cols is not None:
+            columns = [c.get("name") if isinstance(c, dict) else str(c) for c in cols]
+    out = []
+    for row in rows or []:
+        if isinstance(row, dict) and isinstance(row.get("values"), list):
+            row = row["values"]
+        if isinstance(row, dict):
+            out.append(row)
+        elif isinstance(row, (list, tuple)):
+            names = columns or [f"col{i}" for i in range(len(row))]
+            out.append(dict(zip(names, row)))
+        else:
+            out.append({"value": row})
+    return out
+
+async def iter_table_pages(
+    client,
+    run_id: str,
+    scenario_name: str,
+    table_name: str,
+    *,
+    page_size: int = TABLE_PAGE_SIZE,
+    query: Optional[Dict[str, Any]] = None,
+    page_params: Tuple[str, ...] = TABLE_PAGE_PARAMS,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield the table's rows page by page (lists of row dicts)."""
+    if not page_params:
+        async for page in _stream_table_pages(client, run_id, scenario_name, table_name, page_size, query):
+            yield page
+        return
+
+    def fetch(q):
+        return client.scenarios_getscenariotablerowdata(
+            run_id=run_id, scenario_name=scenario_name, table_name=table_name, query=q,
+        )
+
+    async for page in iter_pages(fetch, query, page_size=page_size, page_params=page_params, rows=table_rows):
+        yield page
+
+async def _stream_table_pages(client, run_id, scenario_name, table_name, page_size, query):
+    # Same endpoint as scenarios_getscenariotablerowdata, decoded row by row as the body arrives.
+    # Column names sent alongside positional rows are not seen in this mode (rows become col0, col1, ...).
+    path = f"/api/v1/runs/{run_id}/scenarios/{scenario_name}/table-data/{table_name}"
+    page: List[Any] = []
+    async for row in client.stream_items("GET", path, params=query or None, prefixes=ROW_PREFIXES):
+        page.append(row)
+        if len(page) >= page_size:
+            yield table_rows(page)
+            page = []
+    if page:
+        yield table_rows(page)
+
+def iter_file_pages(path: str, page_size: int = TABLE_PAGE_SIZE, columns: Optional[List[str]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """Yield rows page by page from a file written by download_scenario_table (.ndjson or .parquet)."""
+    path = os.path.abspath(os.path.expanduser(path))
+    if not os.path.isfile(path):
+        raise MCPValidationError(f"No such file: {path}")
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq  # optional
+        except ImportError:
+            raise MCPConfigError("Reading Parquet needs pyarrow (pip install pyarrow)")
+        pf = pq.ParquetFile(path)
+        names = set(pf.schema_arrow.names)
+        cols = None if columns is None else [c for c in columns if c in names]
+        for batch in pf.iter_batches(batch_size=page_size, columns=cols):
+            yield batch.to_pylist()
+        return
+    with open(path, encoding="utf-8") as f:
+        page: List[Dict[str, Any]] = []
+        for line in f:
+            if line.strip():
+                page.append(json.loads(line))
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+class TableSchema:
+    """Column names (in first-seen order) and the JSON types seen in each."""
+
+    _TYPES = ((bool, "bool"), (int, "int"), (float, "float"), (str, "string"), (dict, "object"), (list, "array"))
+
+    def __init__(self):
+        self.columns: Dict[str, set] = {}
+
+    def update(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            for k, v in row.items():
+                self.columns.setdefault(k, set()).add(self._type(v))
+
+    @classmethod
+    def _type(cls, v: Any) -> str:
+        if v is None:
+            return "null"
+        return next((name for t, name in cls._TYPES if isinstance(v, t)), "string")
+
+    def as_dict(self) -> Dict[str, str]:
+        out = {}
+        for name, types in self.columns.items():
+            t = types - {"null"}
+            if t == {"int", "float"}:
+                t = {"float"}
+            out[name] = "|".join(sorted(t)) or "null"
+            if "null" in types and t:
+                out[name] += "?"
+        return out
+
+class NdjsonWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "w", encoding="utf-8", newline="\n")
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._f.writelines(json.dumps(r, default=str) + "\n" for r in rows)
+
+    def close(self) -> None:
+        self._f.close()
+
+class ParquetWriter:
+    """
+    Writes one row group per page. The first page fixes the Arrow schema, with
+    integer columns widened to float64 and all-null columns typed as string so
+    later pages still fit.
+    """
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow  # optional; only needed for Parquet output
+            import pyarrow.parquet
+        except ImportError:
+            raise MCPConfigError("Parquet output needs pyarrow (pip install pyarrow); use format='ndjson' instead")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        self._writer = None
+        self._schema = None
+
+    def _widen(self, schema):
+        pa = self._pa
+        fields = []
+        for f in schema:
+            if pa.types.is_integer(f.type):
+                f = f.with_type(pa.float64())
+            elif pa.types.is_null(f.type):
+                f = f.with_type(pa.string())
+            fields.append(f)
+        return pa.schema(fields)
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        pa = self._pa
+        if self._writer is None:
+            self._schema = self._widen(pa.Table.from_pylist(rows).schema)
+            self._writer = self._pq.ParquetWriter(self.path, self._schema)
+        try:
+            table = pa.Table.from_pylist(rows, schema=self._schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise MCPApiError(f"Table column types changed between pages ({e}); use format='ndjson'")
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        else:
+            self._pq.write_table(self._pa.table({}), self.path)  # empty table, still a valid file
+
+WRITERS = {"ndjson": NdjsonWriter, "parquet": ParquetWriter}
+
+def output_path(path: Optional[str], run_id: str, scenario_name: str, table_name: str, fmt: str) -> str:
+    if path:
+        path = os.path.abspath(os.path.expanduser(path))
+    else:
+        safe = "_".join("".join(ch if ch.isalnum() or ch in "-." else "_" for ch in s) for s in (run_id, scenario_name, table_name))
+        path = os.path.join(DOWNLOAD_DIR, f"{safe}.{fmt}")
+    if os.path.isdir(path):
+        raise MCPValidationError(f"Output path is a directory: {path}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
@@ -0,0 +1,130 @@
+# table_sync.py
+"""
+Diff-based editing of experiment run scenario tables.
+
+`diff_rows` aligns the current rows with the desired rows, by key columns when
+given and otherwise by whole-row content (difflib), and produces a minimal
+edit script:
+  - deletes: row indices in the current table
+  - inserts: row indices in the final table
+  - cells:   (final row index, column, value) for every cell that differs
+A changed row is an update of its differing cells, never a delete + insert,
+so replacing a table with one of the same length needs no structural edits.
+
+`apply_edit_script` orders the edits so row indices stay valid: deletes one at
+a time from the highest index down, then inserts one at a time from the lowest
+index up (both shift the rows after them), and finally every cell value
+concurrently through batch.run_batch, since cell writes don't move rows.
+"""
+
+import difflib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from batch import BATCH_CONCURRENCY, run_batch
+from helpers import MCPApiError, MCPValidationError
+
+# Body of scenarios_setexperimentrunscenariotablevalue (PATCH .../table-data/{table}/rows)
+def cell_body(row_index: int, column: str, value: Any) -> Dict[str, Any]:
+    return {"rowIndex": row_index, "columnName": column, "value": "" if value is None else str(value)}
+
+@dataclass
+class EditScript:
+    deletes: List[int] = field(default_factory=list)
+    inserts: List[int] = field(default_factory=list)
+    cells: List[Tuple[int, str, Any]] = field(default_factory=list)
+    rows_before: int = 0
+    rows_after: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "rows_before": self.rows_before,
+            "rows_after": self.rows_after,
+            "deletes": len(self.deletes),
+            "inserts": len(self.inserts),
+            "cell_updates": len(self.cells),
+        }
+
+def same_value(a: Any, b: Any) -> bool:
+    """Portal tables often return values as text: compare '1' == 1 == 1.0, None == ''."""
+    if a is None or b is None:
+        return (a if a is not None else "") == (b if b is not None else "")
+    if a == b:
+        return True
+    try:
+        return float(a) == float(b)
+    except (TypeError, ValueError):
+        return str(a) == str(b)
+
+def _row_key(row: Dict[str, Any], columns: Sequence[str]) -> str:
+    return json.dumps(["" if row.get(c) is None else str(row.get(c)) for c in columns])
+
+def _changed_cells(current: Dict[str, Any], desired: Dict[str, Any], index: int) -> List[Tuple[int, str, Any]]:
+    # Columns missing from a desired row are left as they are
+    return [(index, c, v) for c, v in desired.items() if not same_value(current.get(c), v)]
+
+def diff_rows(
+    current: List[Dict[str, Any]],
+    desired: List[Dict[str, Any]],
+    key_columns: Optional[Sequence[str]] = None,
+) -> EditScript:
+    if key_columns:
+        keys = [_row_key(r, key_columns) for r in desired]
+        if len(set(keys)) != len(keys):
+            raise MCPValidationError(f"Desired rows have duplicate keys for {list(key_columns)}")
+        a = [_row_key(r, key_columns) for r in current]
+    else:
+        columns = sorted({c for r in desired for c in r})
+        a = [_row_key(r, columns) for r in current]
+        keys = [_row_key(r, columns) for r in desired]
+
+    script = EditScript(rows_before=len(current), rows_after=len(desired))
+    for op, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, keys, autojunk=False).get_opcodes():
+        if op == "equal":
+            if key_columns:  # same key, other columns may differ
+                for i, j in zip(range(i1, i2), range(j1, j2)):
+                    script.cells += _changed_cells(current[i], desired[j], j)
+            continue
+        paired = min(i2 - i1, j2 - j1) if op == "replace" else 0
+        for k in range(paired):
+            script.cells += _changed_cells(current[i1 + k], desired[j1 + k], j1 + k)
+        script.deletes += range(i1 + paired, i2)
+        for j in range(j1 + paired, j2):
+            script.inserts.append(j)
+            script.cells += [(j, c, v) for c, v in desired[j].items() if v is not None]
+    return script
+
+async def apply_edit_script(
+    client,
+    run_id: str,
+    scenario_name: str,
+    table_name: str,
+    script: EditScript,
+    *,
+    concurrency: int = BATCH_CONCURRENCY,
+    retries: int = 2,
+) -> Dict[str, Any]:
+    """Apply deletes (descending), inserts (ascending), then cell values concurrently."""
+    target = dict(run_id=run_id, scenario_name=scenario_name, table_name=table_name)
+    done = {"deleted": 0, "inserted": 0}
+    try:
+        for i in sorted(script.deletes, reverse=True):
+            await client.scenarios_removeexperimentrunscenariotablerow(**target, row_index=str(i))
+            done["deleted"] += 1
+        for j in sorted(script.inserts):
+            await client.scenarios_insertexperimentrunscenariotablerow(**target, row_index=str(j))
+            done["inserted"] += 1
+    except Exception as e:
+        # Row indices after a failed structural edit are unknown; stop before writing any cells
+        raise MCPApiError(f"Table edit stopped after {done['deleted']} deletes and {done['inserted']} inserts: {e}")
+
+    async def set_cell(key, cell):
+        row, column, value = cell
+        return await client.scenarios_setexperimentrunscenariotablevalue(**target, body=cell_body(row, column, value))
+
+    res = await run_batch(
+        ((f"{row}:{column}", (row, column, value)) for row, column, value in script.cells),
+        set_cell, concurrency=concurrency, retries=retries,
+    )
+    return {**done, "cells_set": len(res["results"]), "failed": res["failed"], "rounds": res["rounds"]}
@@ -0,0 +1,197 @@
+# table_tools.py
+"""
+MCP tools for scenario table data that is too large to pass inline.
+
+Tools included:
+  - download_scenario_table
+  - table_query
+  - sync_scenario_table
+"""
+
+import asyncio
+import contextlib
+import os
+import time
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
+from mcp_app import mcp
+from helpers import wrap_errors, MCPValidationError
+from rest_client_async_generated import AsyncSimioClientGenerated
+from table_io import TABLE_PAGE_SIZE, TABLE_PAGE_PARAMS, WRITERS, TableSchema, iter_file_pages, iter_table_pages, output_path
+from columnar import Aggregate, ColumnarTable, query
+from table_sync import apply_edit_script, diff_rows
+from batch import BATCH_CONCURRENCY
+
+class DownloadScenarioTableParams(BaseModel):
+    run_id: str = Field(..., min_length=1)
+    scenario_name: str = Field(..., min_length=1)
+    table_name: str = Field(..., min_length=1)
+    format: str = Field("ndjson", pattern="^(ndjson|parquet)$", description="'ndjson' or 'parquet' (needs pyarrow)")
+    path: Optional[str] = Field(None, description="Output file; defaults to SIMIO_DOWNLOAD_DIR/<run>_<scenario>_<table>.<format>")
+    page_size: int = Field(TABLE_PAGE_SIZE, ge=1, le=100_000, description="Rows requested per page")
+    page_params: str = Field(",".join(TABLE_PAGE_PARAMS) or "none", description="Offset and limit query parameter names, comma-separated, or 'none' to stream one response")
+    query: Optional[Dict[str, Any]] = Field(None, description="Extra query parameters sent with every page")
+
+class TableFilter(BaseModel):
+    column: str = Field(..., min_length=1)
+    op: str = Field(..., description="== != < <= > >= in not_in contains is_null not_null")
+    value: Any = None
+
+class TableQueryParams(BaseModel):
+    # Source: a portal table, or a file written by download_scenario_table
+    run_id: Optional[str] = None
+    scenario_name: Optional[str] = None
+    table_name: Optional[str] = None
+    path: Optional[str] = Field(None, description="Local .ndjson/.parquet file instead of the portal table")
+
+    select: Optional[List[str]] = Field(None, description="Columns to return when not aggregating (default: all)")
+    filters: List[TableFilter] = Field(default_factory=list, description="ANDed row filters")
+    group_by: List[str] = Field(default_factory=list)
+    aggregates: List[str] = Field(default_factory=list, description="e.g. ['count(*)', 'mean(WaitTime) as avg_wait', 'p95(WaitTime)']")
+    order_by: List[str] = Field(default_factory=list, description="Output columns; prefix '-' for descending")
+    limit: int = Field(100, ge=1, le=10_000, description="Max result rows returned")
+
+    page_size: int = Field(TABLE_PAGE_SIZE, ge=1, le=100_000)
+    page_params: str = Field(",".join(TABLE_PAGE_PARAMS) or "none", description="Offset and limit query parameter names, comma-separated, or 'none' to stream one response")
+    query: Optional[Dict[str, Any]] = Field(None, description="Extra query parameters sent with every page")
+
+    @model_validator(mode="after")
+    def _check_source(self):
+        portal = (self.run_id, self.scenario_name, self.table_name)
+        if self.path is None and not all(portal):
+            raise MCPValidationError("Give either path, or run_id + scenario_name + table_name")
+        return self
+
+class SyncScenarioTableParams(BaseModel):
+    run_id: str = Field(..., min_length=1)
+    scenario_name: str = Field(..., min_length=1)
+    table_name: str = Field(..., min_length=1)
+    rows: Optional[List[Dict[str, Any]]] = Field(None, description="Desired table contents, in order")
+    path: Optional[str] = Field(None, description="Desired contents from a local .ndjson/.parquet file instead of rows")
+    key_columns: Optional[List[str]] = Field(None, description="Match rows by these columns; default matches by whole-row content")
+    max_concurrency: int = Field(BATCH_CONCURRENCY, ge=1, le=32, description="Max concurrent cell writes")
+    retries: int = Field(2, ge=0, le=5, description="Extra rounds for cell writes that failed")
+    page_size: int = Field(TABLE_PAGE_SIZE, ge=1, le=100_000)
+    page_params: str = Field(",".join(TABLE_PAGE_PARAMS) or "none", description="Offset and limit query parameter names, comma-separated, or 'none' to stream one response")
+    dry_run: bool = Field(False, description="Return the edit script summary without changing the table")
+
+    @model_validator(mode="after")
+    def _check_source(self):
+        if (self.rows is None) == (self.path is None):
+            raise MCPValidationError("Give exactly one of rows or path")
+        return self
+
+def _page_params(spec: str) -> tuple:
+    if spec.strip().lower() in ("", "none"):
+        return ()  # no paging: stream the whole table in one response
+    page_params = tuple(p.strip() for p in spec.split(","))
+    if len(page_params) != 2 or not all(page_params):
+        raise MCPValidationError("page_params must be two names, e.g. 'skip,take', or 'none'")
+    return page_params
+
+@mcp.tool()
+@wrap_errors
+async def download_scenario_table(params: DownloadScenarioTableParams) -> dict:
+    """
+    Page through a scenario table and write its rows to a local NDJSON or Parquet file.
+    Returns the file path, row count and column schema instead of the rows themselves.
+    """
+    page_params = _page_params(params.page_params)
+    path = output_path(params.path, params.run_id, params.scenario_name, params.table_name, params.format)
+    client = AsyncSimioClientGenerated.from_env()
+    t0 = time.monotonic()
+    rows = pages = 0
+    schema = TableSchema()
+    tmp = path + ".part"
+    writer = await asyncio.to_thread(WRITERS[params.format], tmp)
+    try:
+        async for page in iter_table_pages(
+            client, params.run_id, params.scenario_name, params.table_name,
+            page_size=params.page_size, query=params.query, page_params=page_params,
+        ):
+            schema.update(page)
+            await asyncio.to_thread(writer.write, page)
+            rows += len(page)
+            pages += 1
+        await asyncio.to_thread(writer.close)
+    except BaseException:
+        # Leave no partial file behind for the next download to collide with
+        with contextlib.suppress(Exception):
+            await asyncio.to_thread(writer.close)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return {
+        "path": path,
+        "format": params.format,
+        "rows": rows,
+        "pages": pages,
+        "bytes": os.path.getsize(path),
+        "schema": schema.as_dict(),
+        "elapsed_secs": round(time.monotonic() - t0, 2),
+    }
+
+@mcp.tool()
+@wrap_errors
+async def table_query(params: TableQueryParams) -> dict:
+    """
+    Filter, project, group and aggregate a scenario table on the server (NumPy, columnar).
+    Pages are reduced to the referenced columns and matching rows as they arrive; only the result is returned.
+    """
+    aggregates = [Aggregate.parse(a) for a in params.aggregates]
+    if aggregates or params.group_by:
+        columns = [*params.group_by, *(a.column for a in aggregates if a.column)]
+    else:
+        columns = params.select
+    table = ColumnarTable(columns, [f.model_dump() for f in params.filters])
+    t0 = time.monotonic()
+    if params.path:
+        wanted = None if columns is None else [*columns, *(f.column for f in params.filters)]
+
+        def scan():
+            for page in iter_file_pages(params.path, params.page_size, wanted):
+                table.add_page(page)
+        await asyncio.to_thread(scan)
+    else:
+        client = AsyncSimioClientGenerated.from_env()
+        async for page in iter_table_pages(
+            client, params.run_id, params.scenario_name, params.table_name,
+            page_size=params.page_size, query=params.query, page_params=_page_params(params.page_params),
+        ):
+            table.add_page(page)
+    result = await asyncio.to_thread(
+        query, table, group_by=params.group_by, aggregates=aggregates, order_by=params.order_by, limit=params.limit,
+    )
+    result["elapsed_secs"] = round(time.monotonic() - t0, 2)
+    return result
+
+@mcp.tool()
+@wrap_errors
+async def sync_scenario_table(params: SyncScenarioTableParams) -> dict:
+    """
+    Make a scenario table match the desired rows with a minimal set of edits.
+    Deletes and inserts run in index order; changed cells are written concurrently.
+    """
+    client = AsyncSimioClientGenerated.from_env()
+    t0 = time.monotonic()
+    current: List[Dict[str, Any]] = []
+    async for page in iter_table_pages(
+        client, params.run_id, params.scenario_name, params.table_name,
+        page_size=params.page_size, page_params=_page_params(params.page_params),
+    ):
+        current += page
+    if params.rows is not None:
+        desired = params.rows
+    else:
+        desired = await asyncio.to_thread(lambda: [r for page in iter_file_pages(params.path, params.page_size) for r in page])
+    script = await asyncio.to_thread(diff_rows, current, desired, params.key_columns)
+    result: Dict[str, Any] = {"ok": True, "plan": script.summary(), "dry_run": params.dry_run}
+    if not params.dry_run:
+        result["applied"] = await apply_edit_script(
+            client, params.run_id, params.scenario_name, params.table_name, script,
+            concurrency=params.max_concurrency, retries=params.retries,
+        )
+        result["ok"] = not result["applied"]["failed"]
+    result["elapsed_secs"] = round(time.monotonic() - t0, 2)
+    return result
@@ -0,0 +1,20 @@
+# tests/conftest.py
+import pytest
+
+from mock_portal import MockConfig, MockPortal
+
+PAT = "test-pat"
+
+@pytest.fixture
+def portal(monkeypatch):
+    """An in-process mock portal with SIMIO_PORTAL_URL / PERSONAL_ACCESS_TOKEN pointing at it."""
+    p = MockPortal(MockConfig(latency_ms=0, run_secs=0.3, transfer_secs=0.2)).start()
+    monkeypatch.setenv("SIMIO_PORTAL_URL", p.url)
+    monkeypatch.setenv("PERSONAL_ACCESS_TOKEN", PAT)
+    yield p
+    p.stop()
+
+@pytest.fixture
+def client(portal):
+    from rest_client_async_generated import AsyncSimioClientGenerated
+    return AsyncSimioClientGenerated(base_url=portal.url, personal_access_token=PAT)
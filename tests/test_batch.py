@@ -0,0 +1,36 @@
+# tests/test_batch.py
+import asyncio
+
+from batch import apply_control_values, run_batch
+
+def test_run_batch_caps_concurrency_and_retries_only_failures():
+    in_flight, peak, calls = 0, 0, {}
+
+    async def fn(key, value):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        calls[key] = calls.get(key, 0) + 1
+        if key == "flaky" and calls[key] == 1:
+            raise ConnectionError("reset")
+        if key == "bad":
+            raise ValueError("nope")
+        return value * 2
+
+    items = [("flaky", 1), ("bad", 2)] + [(f"k{i}", i) for i in range(10)]
+    res = asyncio.run(run_batch(items, fn, concurrency=3, retries=2, backoff_secs=0))
+    assert peak <= 3
+    assert res["results"]["flaky"] == 2 and res["results"]["k9"] == 18
+    assert res["failed"] == {"bad": "ValueError: nope"}
+    assert res["rounds"] == 3
+    assert calls["k0"] == 1 and calls["flaky"] == 2 and calls["bad"] == 3
+
+def test_apply_control_values_against_mock_portal(portal, client):
+    run_id = next(iter(portal.runs))
+    scenario = next(iter(portal.scenarios[run_id]))
+    controls = {f"C{i}": i for i in range(12)}
+    res = asyncio.run(apply_control_values(client, run_id, scenario, controls, concurrency=4))
+    assert res["applied"] == sorted(controls) and res["failed"] == {}
+    assert portal.scenarios[run_id][scenario]["controls"] == {k: str(v) for k, v in controls.items()}
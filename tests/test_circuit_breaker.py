@@ -0,0 +1,59 @@
+# tests/test_circuit_breaker.py
+import pytest
+
+import circuit_breaker
+from circuit_breaker import BREAKER_MIN_CALLS, BREAKER_OPEN_SECS, CircuitBreakers, CircuitOpenError
+
+URL = "https://portal.test"
+RUNS = "/api/v1/runs/1"
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+def _trip(cb):
+    for _ in range(BREAKER_MIN_CALLS):
+        cb.record(URL, RUNS, failed=True, elapsed_secs=0.1)
+
+def test_opens_on_failures_and_rejects_with_retry_after(clock):
+    cb = CircuitBreakers(window=10)
+    assert cb.before(URL, RUNS) is False
+    _trip(cb)
+    with pytest.raises(CircuitOpenError) as e:
+        cb.before(URL, RUNS)
+    assert e.value.retry_after_secs == BREAKER_OPEN_SECS
+    assert cb.before(URL, "/api/v1/models") is False  # other families stay closed
+    assert cb.before(URL, "/api/v1/heartbeat") is False  # exempt
+
+def test_half_open_slot_then_close_on_successful_trial(clock):
+    cb = CircuitBreakers(window=10)
+    _trip(cb)
+    clock[0] += BREAKER_OPEN_SECS
+    assert cb.before(URL, RUNS) is True  # this caller probes
+    with pytest.raises(CircuitOpenError):
+        cb.before(URL, RUNS)  # only one half-open slot
+    cb.probe_done(URL, RUNS, ok=True)
+    cb.record(URL, RUNS, failed=False, elapsed_secs=0.1)
+    assert cb.before(URL, RUNS) is False
+
+def test_failed_probe_reopens_with_backoff(clock):
+    cb = CircuitBreakers(window=10)
+    _trip(cb)
+    clock[0] += BREAKER_OPEN_SECS
+    assert cb.before(URL, RUNS) is True
+    with pytest.raises(CircuitOpenError) as e:
+        cb.probe_done(URL, RUNS, ok=False)
+    assert e.value.retry_after_secs == 2 * BREAKER_OPEN_SECS
+
+def test_mostly_successful_window_stays_closed(clock):
+    cb = CircuitBreakers(window=10)
+    for i in range(20):
+        cb.record(URL, RUNS, failed=i % 3 == 0, elapsed_secs=0.1)
+    assert cb.before(URL, RUNS) is False
+
+def test_disabled_with_zero_window(clock):
+    cb = CircuitBreakers(window=0)
+    _trip(cb)
+    assert cb.before(URL, RUNS) is False
@@ -0,0 +1,63 @@
+# tests/test_columnar.py
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from columnar import Aggregate, ColumnarTable, query, to_array
+from helpers import MCPValidationError
+
+ROWS = [
+    {"Cat": "A", "Qty": 1, "Cost": 10.0},
+    {"Cat": "B", "Qty": 2, "Cost": None},
+    {"Cat": "A", "Qty": 3, "Cost": 30.0},
+    {"Cat": "B", "Qty": 4, "Cost": 40.0},
+    {"Cat": None, "Qty": 5, "Cost": 50.0},
+]
+
+def _query(rows, pages=2, filters=(), **kw):
+    table = ColumnarTable(kw.pop("columns", None), filters)
+    size = -(-len(rows) // pages)
+    for i in range(0, len(rows), size):
+        table.add_page(rows[i:i + size])
+    kw["aggregates"] = [Aggregate.parse(a) for a in kw.get("aggregates", ())]
+    return query(table, **kw)
+
+def test_to_array_types():
+    assert to_array([1, 2]).dtype == np.int64
+    assert to_array([1, None, 2.5]).dtype == np.float64
+    assert to_array(["a", 1]).dtype == object
+    assert to_array([True, 1]).dtype == object
+
+def test_numeric_strings_are_numeric():
+    # The portal often returns cells as text
+    assert to_array(["1", "2", " 3 "]).tolist() == [1, 2, 3]
+    arr = to_array(["1.5", None, "", "-2e1"])
+    assert arr.dtype == np.float64 and np.isnan(arr[1]) and np.isnan(arr[2]) and arr[3] == -20.0
+    assert to_array(["1", "0012a"]).dtype == object
+
+def test_group_by_aggregates_across_pages():
+    res = _query(ROWS, group_by=["Cat"], aggregates=["count(*)", "sum(Qty)", "mean(Cost)", "max(Cost)"], order_by=["Cat"])
+    by_cat = {r["Cat"]: r for r in res["rows"]}
+    assert by_cat["A"] == {"Cat": "A", "count": 2, "sum(Qty)": 4.0, "mean(Cost)": 20.0, "max(Cost)": 30.0}
+    assert by_cat["B"]["mean(Cost)"] == 40.0  # null Cost ignored
+    assert by_cat[None]["count"] == 1
+    assert res["scanned_rows"] == 5
+
+def test_aggregates_and_filters_on_text_numbers():
+    rows = [{"Cat": r["Cat"], "Qty": str(r["Qty"]), "Cost": "" if r["Cost"] is None else str(r["Cost"])} for r in ROWS]
+    res = _query(rows, filters=[{"column": "Qty", "op": ">=", "value": "2"}], aggregates=["sum(Qty)", "mean(Cost)", "p50(Cost)"])
+    assert res["matched_rows"] == 4
+    assert res["rows"] == [{"sum(Qty)": 14.0, "mean(Cost)": 40.0, "p50(Cost)": 40.0}]
+    res = _query(rows, filters=[{"column": "Qty", "op": "in", "value": [1, "3"]}], columns=["Qty"])
+    assert [r["Qty"] for r in res["rows"]] == [1, 3]
+
+def test_numeric_aggregate_on_text_column_is_rejected():
+    with pytest.raises(MCPValidationError):
+        _query(ROWS, aggregates=["sum(Cat)"])
+    with pytest.raises(MCPValidationError):
+        Aggregate.parse("sum(*)")
+
+def test_order_by_descending_puts_nulls_last_and_limits():
+    res = _query(ROWS, columns=["Qty", "Cost"], order_by=["-Cost"], limit=3)
+    assert [r["Cost"] for r in res["rows"]] == [50.0, 40.0, 30.0]
+    assert res["truncated"] is True and res["row_count"] == 5
@@ -0,0 +1,58 @@
+# tests/test_jobs.py
+import asyncio
+import threading
+import time
+
+from jobs import CANCELLED, FAILED, SUCCEEDED, JobManager
+
+def test_workflow_returning_ok_false_marks_the_job_failed():
+    jobs = JobManager()
+
+    async def main():
+        async def bad(job):
+            return {"ok": False, "error": {"type": "MCPApiError", "message": "run failed"}, "run_id": 7}
+
+        async def good(job):
+            return {"ok": True}
+
+        a, b = jobs.submit("w", {}, bad), jobs.submit("w", {}, good)
+        await asyncio.gather(a.task, b.task)
+        return a, b
+
+    a, b = asyncio.run(main())
+    assert a.status == FAILED and a.result["run_id"] == 7
+    assert a.error == {"type": "MCPApiError", "message": "run failed"}
+    assert b.status == SUCCEEDED and b.error is None
+    assert [j.id for j in jobs.list(status=FAILED)] == [a.id]
+
+def test_cancel_during_run_create_still_cancels_the_created_run(portal, client):
+    import workflow_tools
+
+    arrived = threading.Event()
+    dispatch = portal.dispatch
+
+    def slow_create(method, path, *args):
+        if path == "/api/v1/runs/create":
+            arrived.set()
+            time.sleep(0.3)
+        return dispatch(method, path, *args)
+
+    portal.dispatch = slow_create
+    model = next(iter(portal.models))
+    exp = next(e["id"] for e in portal.experiments.values() if e["modelId"] == model)
+    jobs = JobManager()
+
+    async def main():
+        job = jobs.submit(
+            "create", {},
+            lambda job: workflow_tools._create_job_run(client, model, exp, "InFlight", job),
+            client=client,
+        )
+        await asyncio.to_thread(arrived.wait)
+        return job, await jobs.cancel(job.id)
+
+    job, report = asyncio.run(main())
+    created = [r["id"] for r in portal.runs.values() if r["name"] == "InFlight"]
+    assert job.status == CANCELLED
+    assert created and job.run_ids == created
+    assert report["cancelled_runs"] == created
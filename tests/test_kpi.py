@@ -0,0 +1,39 @@
+# tests/test_kpi.py
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from helpers import MCPValidationError
+from kpi import build_matrix, number, pareto_fronts, ranks, signed
+
+def test_number_reduces_response_values():
+    assert number("2.5") == 2.5 and number([1, 2, "3"]) == 2.0 and number({"mean": 4}) == 4.0
+    assert number("n/a") is None and number([]) is None
+
+def test_matrix_labels_scenarios_and_fills_missing_with_nan():
+    payloads = {
+        "1": {"scenarios": [{"name": "S1", "responses": [{"name": "Cost", "value": 10}, {"name": "Thru", "value": 5}]},
+                            {"name": "S2", "responses": [{"name": "Cost", "value": 12}]}]},
+        "2": [{"name": "S1", "responseValues": {"Cost": "8", "Thru": [6, 8]}}],
+    }
+    labels, run_ids, names, m, _ = build_matrix(payloads)
+    assert labels == ["1/S1", "1/S2", "2"] and run_ids == ["1", "1", "2"] and names == ["Cost", "Thru"]
+    assert m[0].tolist() == [10, 5] and np.isnan(m[1, 1]) and m[2].tolist() == [8, 7]
+
+def test_ranks_follow_objective_direction_with_nan_last():
+    m = np.array([[10.0, 5.0], [12.0, np.nan], [8.0, 7.0]])
+    r = ranks(m, ["Cost", "Thru"], {"Thru": "max"})
+    assert r[:, 0].tolist() == [2, 3, 1] and r[:, 1].tolist() == [2, 3, 1]
+
+def test_pareto_fronts():
+    # minimize both: (1,4) (2,2) (4,1) are non-dominated, (3,3) is dominated by (2,2), NaN rows get 0
+    a = np.array([[1, 4], [2, 2], [4, 1], [3, 3], [5, 5], [np.nan, 1]], dtype=float)
+    assert pareto_fronts(a).tolist() == [1, 1, 1, 2, 3, 0]
+
+def test_signed_negates_max_objectives_and_validates():
+    m = np.array([[1.0, 2.0]])
+    assert signed(m, ["A", "B"], {"B": "max", "A": "min"}).tolist() == [[-2.0, 1.0]]
+    with pytest.raises(MCPValidationError):
+        signed(m, ["A", "B"], {"C": "min"})
+    with pytest.raises(MCPValidationError):
+        signed(m, ["A", "B"], {"A": "up"})
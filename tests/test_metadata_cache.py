@@ -0,0 +1,52 @@
+# tests/test_metadata_cache.py
+import asyncio
+
+import pytest
+
+from metadata_cache import MetadataCache, metadata_cache
+
+KEY = MetadataCache.key("http://portal/", "pat", "/api/v1/models", None)
+
+def test_touch_refreshes_only_the_stored_entry():
+    cache = MetadataCache(ttl_secs=60)
+    cache.store(KEY, ["old"], {"ETag": '"a"'})
+    entry, _ = cache.lookup(KEY)
+    entry.fetched_at = 0
+    assert cache.touch(KEY, entry) is entry and entry.fresh(60)
+
+    cache.store(KEY, ["new"], {"ETag": '"b"'})  # a newer response landed first
+    assert cache.touch(KEY, entry).data == ["new"]
+
+    cache.invalidate("http://portal")  # a mutation raced the revalidation
+    assert cache.touch(KEY, entry) is None
+    assert cache.lookup(KEY) == (None, False)
+
+@pytest.fixture
+def clean_cache():
+    metadata_cache.invalidate()
+    yield metadata_cache
+    metadata_cache.invalidate()
+
+def test_304_after_invalidation_refetches(portal, client, clean_cache):
+    portal.add_model("Before")
+
+    async def go():
+        assert "Before" in [m["projectName"] for m in await client.models_getmodels()]
+        for entry in clean_cache._entries.values():
+            entry.fetched_at = 0  # stale: the next read revalidates
+        execute, seen = client._execute, []
+
+        async def racing_execute(method, path, **kw):
+            r = await execute(method, path, **kw)
+            if r.status_code == 304:
+                seen.append(path)
+                portal.add_model("After")
+                clean_cache.invalidate(client.base_url)
+            return r
+
+        client._execute = racing_execute
+        return await client.models_getmodels(), seen
+
+    models, seen = asyncio.run(go())
+    assert seen == ["/api/v1/models"]
+    assert "After" in [m["projectName"] for m in models]
@@ -0,0 +1,36 @@
+# tests/test_name_index.py
+import asyncio
+
+import pytest
+
+from name_index import name_index
+from workflow_tools import _delete_run
+
+@pytest.fixture
+def run(portal):
+    name_index.invalidate()
+    exp_id = portal.add_experiment(portal.add_model("Plant"), "Exp")
+    yield exp_id, portal.add_run(exp_id, "Plan"), portal.add_run(exp_id, "Other")
+    name_index.invalidate()
+
+def test_mutate_endpoints_drop_cached_scopes(client, run):
+    exp_id, plan_id, other_id = run
+
+    async def go():
+        assert await name_index.run_id(client, exp_id, "plan") == plan_id
+        await client.runs_deleterun(run_id=str(other_id))
+        assert not name_index._scopes
+        return await name_index.run_id(client, exp_id, "Other")
+
+    assert asyncio.run(go()) is None
+
+def test_delete_of_an_already_deleted_run_is_tolerated(portal, client, run):
+    exp_id, plan_id, _ = run
+
+    async def go():
+        assert await name_index.run_id(client, exp_id, "Plan") == plan_id
+        portal.runs.pop(plan_id)  # deleted by someone else; the index still has it
+        await _delete_run(client, exp_id, plan_id)
+        return await name_index.run_id(client, exp_id, "Plan")
+
+    assert asyncio.run(go()) is None
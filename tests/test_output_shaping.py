@@ -0,0 +1,48 @@
+# tests/test_output_shaping.py
+import inspect
+
+import output_shaping
+from output_shaping import OutputShape, _nbytes, shape_result, shaped
+
+RUNS = [{"id": i, "name": f"Run{i}", "state": "Completed", "detail": "x" * 50} for i in range(200)]
+
+def test_no_output_argument_leaves_results_untouched(monkeypatch):
+    monkeypatch.setattr(output_shaping, "OUTPUT_MAX_BYTES", 0)  # the default: no byte budget
+    res = {"ok": True, "runs": RUNS}
+    assert shape_result(res, None) is res
+    monkeypatch.setattr(output_shaping, "OUTPUT_MAX_BYTES", 5000)
+    assert _nbytes(shape_result(res, None)) <= 5000
+
+def test_fields_offset_limit_and_summary():
+    res = shape_result({"ok": True, "runs": RUNS}, OutputShape(fields=["id", "state"], offset=10, limit=2))
+    assert res["runs"] == [{"id": 10, "state": "Completed"}, {"id": 11, "state": "Completed"}]
+    assert res["truncated"] == [{"path": "runs", "total": 200, "returned": 2, "offset": 10, "reason": "limit"}]
+    res = shape_result({"ok": True, "data": {"runs": RUNS}}, OutputShape(summary=True, summary_items=1, fields=["id"]))
+    assert res["data"]["runs"] == {"count": 200, "first": [{"id": 0}]}
+
+def test_max_bytes_trims_the_largest_lists_to_fit():
+    res = {"ok": True, "runs": RUNS, "nested": {"items": RUNS[:50]}, "note": "kept"}
+    out = shape_result(res, OutputShape(max_bytes=5000))
+    assert _nbytes(out) <= 5000
+    assert out["note"] == "kept" and out["runs"] == RUNS[:len(out["runs"])]
+    notes = {n["path"]: n for n in out["truncated"]}
+    assert notes["runs"]["total"] == 200 and notes["runs"]["reason"] == "max_bytes"
+
+def test_preview_budget_is_split_across_oversized_values():
+    res = {"ok": True, "a": "x" * 50_000, "b": {"blob": "y" * 50_000}, "c": "z" * 50_000, "small": 1}
+    out = shape_result(res, OutputShape(max_bytes=9000))
+    assert _nbytes(out) <= 9000
+    assert out["small"] == 1
+    previews = [n for n in out["truncated"] if "preview_chars" in n]
+    assert sorted(n["path"] for n in previews) == ["a", "b", "c"]
+
+def test_errors_pass_through_and_shaped_adds_the_argument():
+    err = {"ok": False, "error": {"message": "x" * 10_000}}
+    assert shape_result(err, OutputShape(max_bytes=1000)) is err
+
+    def tool(params: int) -> dict:
+        return {"ok": True, "rows": list(range(10))}
+
+    wrapped = shaped(tool)
+    assert "output" in inspect.signature(wrapped).parameters
+    assert wrapped(1, output=OutputShape(limit=3))["rows"] == [0, 1, 2]
@@ -0,0 +1,59 @@
+# tests/test_paging.py
+import asyncio
+
+from paging import find, iter_items, iter_pages, list_items, parse_page_params
+
+def _pager(items, honor_paging=True):
+    calls = []
+
+    async def fetch(query):
+        calls.append(query)
+        if not honor_paging or not query:
+            return {"items": items}
+        skip, take = query["skip"], query["take"]
+        return items[skip:skip + take]
+
+    return fetch, calls
+
+async def _collect(it):
+    return [x async for x in it]
+
+def test_parse_page_params_and_list_items():
+    assert parse_page_params("skip, take") == ("skip", "take")
+    assert parse_page_params("none") == () and parse_page_params(None) == ()
+    assert list_items({"value": [1]}) == [1] and list_items([2]) == [2] and list_items("x") == []
+
+def test_pages_until_a_short_page():
+    fetch, calls = _pager(list(range(25)))
+    pages = asyncio.run(_collect(iter_pages(fetch, {"experiment_id": 1}, page_size=10, page_params=("skip", "take"))))
+    assert [len(p) for p in pages] == [10, 10, 5]
+    assert calls[1] == {"experiment_id": 1, "skip": 10, "take": 10}
+
+def test_ignored_paging_yields_the_list_once():
+    fetch, calls = _pager(list(range(25)), honor_paging=False)
+    items = asyncio.run(_collect(iter_items(fetch, page_size=10, page_params=("skip", "take"))))
+    assert items == list(range(25)) and len(calls) == 1
+    fetch, calls = _pager(list(range(10)), honor_paging=False)  # exactly one page long, repeated
+    items = asyncio.run(_collect(iter_items(fetch, page_size=10, page_params=("skip", "take"))))
+    assert items == list(range(10)) and len(calls) == 2
+
+def test_find_stops_fetching_at_the_first_match():
+    fetch, calls = _pager(list(range(100)))
+    hit = asyncio.run(find(iter_items(fetch, page_size=10, page_params=("skip", "take")), lambda x: x == 15))
+    assert hit == 15 and len(calls) == 2
+
+def test_streamed_list_is_closed_when_the_consumer_stops():
+    closed = []
+
+    async def stream(query):
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.append(True)
+
+    async def fetch(query):
+        raise AssertionError("unpaged lists with a stream are not fetched whole")
+
+    assert asyncio.run(find(iter_items(fetch, page_params=(), stream=stream), lambda x: x == 3)) == 3
+    assert closed == [True]
@@ -0,0 +1,50 @@
+# tests/test_rate_limit.py
+import pytest
+
+import rate_limit
+from rate_limit import RateLimiter, RateLimitError, endpoint_class, retry_after_secs
+
+URL = "https://portal.test"
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+def test_endpoint_class():
+    assert endpoint_class("/api/v1/runs/12/scenarios") == "runs"
+    assert endpoint_class("/api/auth") == "auth"
+    assert endpoint_class("/api/v2/Models?x=1") == "models"
+
+def test_retry_after_parses_seconds_and_dates():
+    assert retry_after_secs("3") == 3.0 and retry_after_secs(None) is None and retry_after_secs("soon") is None
+    assert retry_after_secs("Mon, 01 Jan 2001 00:00:00 GMT") == 0.0
+
+def test_burst_then_queued_slots_spaced_by_rate(clock):
+    rl = RateLimiter(rate=10, burst=3)
+    waits = [rl.reserve(URL, "/api/v1/runs") for _ in range(6)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3:] == pytest.approx([0.1, 0.2, 0.3])
+    assert rl.reserve(URL, "/api/v1/models") == 0  # separate bucket per endpoint class
+    clock[0] += 1.0
+    assert rl.reserve(URL, "/api/v1/runs") == 0
+
+def test_throttle_halves_rate_holds_bucket_and_recovers(clock):
+    rl = RateLimiter(rate=10, burst=5, min_rate=1)
+    rl.on_throttle(URL, "/api/v1/runs", "2")
+    rl.on_throttle(URL, "/api/v1/runs", "2")  # same Retry-After window: one decrease
+    bucket = rl._bucket(URL, "/api/v1/runs")
+    assert bucket.rate == 5 and bucket.throttled == 2
+    assert rl.reserve(URL, "/api/v1/runs") == pytest.approx(2.0)
+    for _ in range(100):
+        rl.on_success(URL, "/api/v1/runs")
+    assert bucket.rate == 10
+
+def test_queue_deeper_than_max_wait_fails(clock):
+    rl = RateLimiter(rate=1, burst=1, max_wait_secs=2)
+    rl.reserve(URL, "/api/v1/runs")
+    rl.reserve(URL, "/api/v1/runs")
+    rl.reserve(URL, "/api/v1/runs")
+    with pytest.raises(RateLimitError):
+        rl.reserve(URL, "/api/v1/runs")
@@ -0,0 +1,73 @@
+# tests/test_retry_policy.py
+import asyncio
+import sys
+
+import httpx
+import pytest
+
+from rest_client_generated import SimioApiError
+from retry_policy import RetryBudget, classify, retry_transient, should_retry, status_of
+
+def test_classify_failures():
+    req = httpx.Request("POST", "https://portal.test/api/v1/runs/create")
+    assert classify(httpx.ConnectError("refused", request=req)) == "connect"
+    assert classify(httpx.ReadTimeout("slow", request=req)) == "transport"
+    assert classify(SimioApiError("503 GET https://portal.test/api/v1/runs: busy")) == "server"
+    assert classify(SimioApiError("429 GET https://portal.test/api/v1/runs: slow down")) == "throttle"
+    assert classify(SimioApiError("404 DELETE https://portal.test/api/v1/runs/1: gone")) == "permanent"
+    assert classify(ValueError("bad")) == "other"
+    assert status_of(SimioApiError("404 DELETE https://x/y: gone")) == 404
+
+def test_only_idempotent_methods_retry_after_the_request_was_sent():
+    assert should_retry("connect", "POST")
+    assert should_retry("server", "GET") and should_retry("transport", "DELETE")
+    assert not should_retry("server", "POST") and not should_retry("transport", "PATCH")
+    assert not should_retry("permanent", "GET") and not should_retry("throttle", "GET")
+
+def test_budget_stops_at_attempts_and_deadline():
+    budget = RetryBudget("GET", attempts=3, budget_secs=60)
+    assert budget.next_wait("server") is not None
+    assert budget.next_wait("server") is not None
+    assert budget.next_wait("server") is None
+    assert RetryBudget("POST", attempts=3).next_wait("server") is None
+    assert RetryBudget("GET", attempts=3, budget_secs=0).next_wait("connect") is None
+
+def test_retry_transient_retries_transient_errors_and_loads_tenacity_lazily(monkeypatch):
+    monkeypatch.setattr("retry_policy.RETRY_BASE_SECS", 0.001)
+    calls = []
+
+    @retry_transient
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("reset")
+        return "ok"
+
+    @retry_transient
+    def permanent():
+        calls.append(2)
+        raise ValueError("bad input")
+
+    assert asyncio.run(flaky()) == "ok" and calls == [1, 1, 1]
+    assert "tenacity" in sys.modules
+    with pytest.raises(ValueError):
+        permanent()
+    assert calls.count(2) == 1
+
+def test_client_retries_gets_but_never_resends_posts(portal, client, monkeypatch):
+    monkeypatch.setattr("retry_policy.RETRY_BASE_SECS", 0.001)
+    dispatch, failures = portal.dispatch, {"GET": 2, "POST": 1}
+
+    def flaky(method, path, *args):
+        if path.startswith("/api/v1/runs") and failures.get(method):
+            failures[method] -= 1
+            return 503, {"error": "busy"}, {}
+        return dispatch(method, path, *args)
+
+    portal.dispatch = flaky
+    run_id = next(iter(portal.runs))
+    assert asyncio.run(client.runs_getrunbyid(run_id=str(run_id)))["id"] == run_id
+    with pytest.raises(SimioApiError, match="503"):
+        asyncio.run(client.runs_createexperimentrun(body={"modelId": 1, "experimentRunName": "Once"}))
+    assert failures == {"GET": 0, "POST": 0}
+    assert not any(r["name"] == "Once" for r in portal.runs.values())  # a retry would have created it
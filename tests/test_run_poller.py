@@ -0,0 +1,43 @@
+# tests/test_run_poller.py
+import asyncio
+
+from run_poller import RunPoller, _Tracked
+
+def test_waiters_share_polls_and_experiment_runs_are_listed_together(portal, client):
+    exp = next(iter(portal.experiments))
+    runs = [r["id"] for r in portal.runs.values() if r["experimentId"] == exp][:2]
+    for r in runs:
+        portal.start_run(r)
+    poller = RunPoller()
+
+    async def main():
+        waits = [poller.wait(client, r, experiment_id=exp, interval_secs=0.1) for r in runs]
+        waits.append(poller.wait(client, runs[0], experiment_id=exp, interval_secs=0.1))  # a second waiter
+        return await asyncio.gather(*waits)
+
+    before = portal.stats()["by_route"]
+    first, second, again = asyncio.run(main())
+    assert first["state"] == second["state"] == again["state"] == "Completed"
+    assert again["eta_secs"] == 0.0
+    by_route = portal.stats()["by_route"]
+    listed = by_route.get("GET /api/v1/runs", 0) - before.get("GET /api/v1/runs", 0)
+    assert listed >= 1 and by_route.get("GET /api/v1/runs/{run_id}", 0) == 0
+    assert poller.tracked() == []
+
+def test_wait_times_out_with_last_snapshot(portal, client):
+    run_id = portal.add_run(next(iter(portal.experiments)), "NeverStarted")
+    res = asyncio.run(RunPoller().wait(client, run_id, interval_secs=0.05, timeout_secs=0.3))
+    assert res["state"] == "TIMEOUT"
+
+def test_adaptive_interval_is_half_the_eta_within_bounds():
+    t = _Tracked(client=None, run_id="1", experiment_id=None, interval_secs=5, adaptive=True,
+                 min_interval_secs=1, max_interval_secs=60)
+    t.polls, t.last = 1, {"percentComplete": 10}
+    t.reschedule(100.0)
+    assert t.eta_secs is None and t.interval_secs == 5
+    t.polls, t.last = 2, {"percentComplete": 30}
+    t.reschedule(110.0)  # 2 %/s -> 35 s left
+    assert t.eta_secs == 35.0 and t.interval_secs == 17.5 and t.next_due == 127.5
+    t.polls, t.last = 3, {"percentComplete": 30}
+    t.reschedule(120.0)  # stalled: the average rate halves, so the ETA doubles
+    assert t.eta_secs == 70.0 and t.interval_secs == 35.0
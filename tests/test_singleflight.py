@@ -0,0 +1,82 @@
+# tests/test_singleflight.py
+import asyncio
+import threading
+import time
+
+from singleflight import SingleFlight
+
+def test_async_callers_share_one_request_and_get_private_copies():
+    sf, started = SingleFlight(), []
+
+    async def fetch():
+        started.append(1)
+        await asyncio.sleep(0.02)
+        return {"items": [1, 2]}
+
+    async def leader():
+        res = await sf.ado("k", fetch)
+        res["items"].append("mutated by the leader")  # e.g. output shaping or name-index post-processing
+        res["extra"] = True
+        return res
+
+    async def follower():
+        await asyncio.sleep(0)
+        return await sf.ado("k", fetch)
+
+    async def main():
+        return await asyncio.gather(leader(), follower(), follower())
+
+    lead, a, b = asyncio.run(main())
+    assert len(started) == 1 and sf.coalesced == 2
+    assert a == b == {"items": [1, 2]} and a is not b
+    assert lead["extra"] is True
+
+def test_uncoalesced_async_call_returns_the_result_itself():
+    sf, result = SingleFlight(), {"x": 1}
+
+    async def fetch():
+        return result
+
+    assert asyncio.run(sf.ado("k", fetch)) is result
+
+def test_threads_share_one_request_and_leader_mutation_does_not_leak():
+    sf, started, out = SingleFlight(), [], {}
+
+    def fetch():
+        started.append(1)
+        time.sleep(0.05)
+        return {"items": [1]}
+
+    def leader():
+        res = sf.do("k", fetch)
+        res["items"].append(99)
+        out["leader"] = res
+
+    def follower(i):
+        time.sleep(0.01)
+        out[i] = sf.do("k", fetch)
+
+    threads = [threading.Thread(target=leader)] + [threading.Thread(target=follower, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(started) == 1
+    assert out["leader"] == {"items": [1, 99]}
+    assert [out[i] for i in range(3)] == [{"items": [1]}] * 3
+
+def test_errors_reach_every_waiter_and_disabled_runs_each_call():
+    sf = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("down")
+
+    async def main():
+        return await asyncio.gather(sf.ado("k", boom), sf.ado("k", boom), return_exceptions=True)
+
+    assert [str(e) for e in asyncio.run(main())] == ["down", "down"]
+    off, calls = SingleFlight(enabled=False), []
+    off.do("k", lambda: calls.append(1))
+    off.do("k", lambda: calls.append(1))
+    assert len(calls) == 2
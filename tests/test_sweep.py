@@ -0,0 +1,32 @@
+# tests/test_sweep.py
+import time
+
+import pytest
+
+from helpers import MCPValidationError
+from sweep import design_points, grid_points, lhs_points
+
+def test_grid_is_the_cartesian_product_over_fixed_controls():
+    points = design_points("grid", grid={"A": [1, 2], "B": ["x", "y", "z"]}, fixed={"C": 0, "A": 9})
+    assert len(points) == 6
+    assert points[0] == {"C": 0, "A": 1, "B": "x"} and points[-1] == {"C": 0, "A": 2, "B": "z"}
+
+def test_oversized_grid_is_rejected_before_it_is_built():
+    grid = {c: list(range(30)) for c in "ABCD"}  # 810,000 points
+    t0 = time.perf_counter()
+    with pytest.raises(MCPValidationError, match="810000"):
+        design_points("grid", grid=grid, max_points=2000)
+    assert time.perf_counter() - t0 < 0.1
+    assert len(grid_points({"A": [1, 2]}, max_points=2)) == 2
+
+def test_lhs_uses_every_stratum_once():
+    points = lhs_points({"A": [0, 10], "B": [0, 1]}, samples=10, seed=1, integer=["A"])
+    strata = sorted(int(p["B"] * 10) for p in points)
+    assert strata == list(range(10))
+    assert all(isinstance(p["A"], int) and 0 <= p["A"] <= 10 for p in points)
+
+def test_invalid_designs():
+    for kwargs in ({"mode": "grid", "grid": {"A": []}}, {"mode": "lhs", "ranges": {"A": [2, 1]}, "samples": 3},
+                   {"mode": "list"}, {"mode": "bogus"}):
+        with pytest.raises(MCPValidationError):
+            design_points(**kwargs)
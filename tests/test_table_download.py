@@ -0,0 +1,34 @@
+# tests/test_table_download.py
+import asyncio
+import json
+import os
+
+from table_tools import DownloadScenarioTableParams, download_scenario_table
+
+def _params(portal, path, **kw):
+    run_id = next(iter(portal.runs))
+    scenario = next(iter(portal.scenarios[run_id]))
+    return DownloadScenarioTableParams(run_id=str(run_id), scenario_name=scenario, table_name="Orders",
+                                       path=str(path), page_size=100, page_params="skip,take", **kw)
+
+def test_download_writes_every_page(portal, tmp_path):
+    out = tmp_path / "orders.ndjson"
+    res = asyncio.run(download_scenario_table(_params(portal, out)))
+    assert res["rows"] == portal.config.table_rows and res["pages"] == 10
+    with open(out, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert [r["Id"] for r in rows] == list(range(portal.config.table_rows))
+    assert os.listdir(tmp_path) == ["orders.ndjson"]
+
+def test_failed_download_leaves_no_partial_file(portal, tmp_path):
+    dispatch = portal.dispatch
+
+    def fail_second_page(method, path, query, *args):
+        if "table-data" in path and int(query.get("skip", 0)) > 0:
+            return 404, {"error": "gone"}, {}
+        return dispatch(method, path, query, *args)
+
+    portal.dispatch = fail_second_page
+    res = asyncio.run(download_scenario_table(_params(portal, tmp_path / "orders.ndjson")))
+    assert res["ok"] is False
+    assert os.listdir(tmp_path) == []
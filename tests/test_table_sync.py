@@ -0,0 +1,88 @@
+# tests/test_table_sync.py
+import asyncio
+import random
+
+import pytest
+
+from helpers import MCPValidationError
+from table_sync import apply_edit_script, diff_rows, same_value
+
+class TableClient:
+    """In-memory stand-in for the three table-edit endpoints (portal semantics: values arrive as text)."""
+
+    def __init__(self, rows):
+        self.rows = [dict(r) for r in rows]
+        self.columns = list(rows[0]) if rows else ["Id", "Name", "Value"]
+        self.calls = []
+
+    async def scenarios_removeexperimentrunscenariotablerow(self, row_index, **target):
+        self.calls.append("delete")
+        del self.rows[int(row_index)]
+
+    async def scenarios_insertexperimentrunscenariotablerow(self, row_index, **target):
+        self.calls.append("insert")
+        self.rows.insert(int(row_index), {c: None for c in self.columns})
+
+    async def scenarios_setexperimentrunscenariotablevalue(self, body, **target):
+        self.calls.append("cell")
+        self.rows[body["rowIndex"]][body["columnName"]] = body["value"]
+
+def _apply(current, desired, key_columns=None):
+    client = TableClient(current)
+    script = diff_rows(current, desired, key_columns)
+    res = asyncio.run(apply_edit_script(client, "1", "S", "T", script))
+    assert res["failed"] == {}
+    assert len(client.rows) == len(desired)
+    for got, want in zip(client.rows, desired):
+        assert all(same_value(got.get(c), v) for c, v in want.items()), (got, want)
+    return script, client
+
+def _row(i, value=None):
+    return {"Id": i, "Name": f"Item{i}", "Value": i * 10 if value is None else value}
+
+def test_same_value_treats_text_numbers_and_nulls_as_equal():
+    assert same_value("1", 1) and same_value(1.0, "1") and same_value(None, "")
+    assert not same_value("a", "b") and not same_value(None, 0)
+
+def test_changed_rows_are_cell_updates_not_delete_insert():
+    current = [_row(i) for i in range(5)]
+    desired = [dict(r) for r in current]
+    desired[2]["Value"] = 999
+    script, client = _apply(current, desired, ["Id"])
+    assert (script.deletes, script.inserts, script.cells) == ([], [], [(2, "Value", 999)])
+    assert client.calls == ["cell"]
+
+def test_unchanged_text_table_needs_no_edits():
+    current = [{k: str(v) for k, v in _row(i).items()} for i in range(5)]
+    script = diff_rows(current, [_row(i) for i in range(5)], ["Id"])
+    assert script.summary()["cell_updates"] == 0 and not script.deletes and not script.inserts
+
+@pytest.mark.parametrize("seed", range(25))
+def test_random_edits_reach_the_desired_table(seed):
+    rng = random.Random(seed)
+    current = [_row(i) for i in range(rng.randint(0, 12))]
+    desired = [dict(r) for r in current if rng.random() > 0.3]
+    for _ in range(rng.randint(0, 4)):
+        desired.insert(rng.randint(0, len(desired)), _row(100 + rng.randint(0, 1000)))
+    for r in desired:
+        if rng.random() < 0.2:
+            r["Value"] = rng.randint(0, 5)
+    desired = list({r["Id"]: r for r in desired}.values())
+    _apply(current, desired, ["Id"] if seed % 2 else None)
+
+def test_duplicate_desired_keys_are_rejected():
+    with pytest.raises(MCPValidationError):
+        diff_rows([], [_row(1), _row(1)], ["Id"])
+
+def test_sync_against_mock_portal(portal, client):
+    run_id = next(iter(portal.runs))
+    scenario = next(iter(portal.scenarios[run_id]))
+    current = [dict(r) for r in portal._table(str(run_id), scenario, "Orders")[:20]]
+    portal.tables[(run_id, scenario, "Orders")] = [dict(r) for r in current]
+    desired = current[:5] + [{**current[5], "Value": 1.5}] + current[7:] + [{**current[0], "Id": 500}]
+    script = diff_rows(current, desired, ["Id"])
+    res = asyncio.run(apply_edit_script(client, str(run_id), scenario, "Orders", script))
+    assert res["failed"] == {} and res["deleted"] == 1 and res["inserted"] == 1
+    rows = portal.tables[(run_id, scenario, "Orders")]
+    assert [str(r["Id"]) for r in rows] == [str(r["Id"]) for r in desired]  # inserted cells arrive as text
+    assert rows[5]["Value"] == 1.5
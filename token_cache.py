@@ -0,0 +1,158 @@
+# token_cache.py
+"""
+Process-wide bearer-token cache shared by every SimioClientGenerated instance.
+
+Tokens are keyed by (portal URL, PAT), so tool calls reuse one token instead of
+POSTing /api/auth each time. Expiry comes from the JWT `exp` claim when the token
+has one, otherwise from SIMIO_TOKEN_TTL_SECS. Tokens that were used since their
+last refresh are renewed in the background SIMIO_TOKEN_REFRESH_SKEW_SECS before
+they expire.
+"""
+
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+log = logging.getLogger("SimioPortalMCP")
+
+TOKEN_TTL_SECS = float(os.getenv("SIMIO_TOKEN_TTL_SECS", "1800"))
+REFRESH_SKEW_SECS = float(os.getenv("SIMIO_TOKEN_REFRESH_SKEW_SECS", "60"))
+# Never hand out a token that expires within this many seconds
+_USE_MARGIN_SECS = 5.0
+
+TokenKey = Tuple[str, str]
+
+def token_expiry(token: str, now: Optional[float] = None) -> float:
+    """Return the epoch expiry of `token`: JWT `exp` if decodable, else now + TTL."""
+    now = time.time() if now is None else now
+    parts = token.split(".")
+    if len(parts) == 3:
+        try:
+            payload = parts[1] + "=" * (-len(parts[1]) % 4)
+            exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+            if exp:
+                return float(exp)
+        except Exception:
+            pass
+    return now + TOKEN_TTL_SECS
+
+@dataclass
+class CachedToken:
+    token: str
+    expires_at: float
+    used: bool = False
+    timer: Optional[threading.Timer] = field(default=None, repr=False)
+
+    def usable(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now < self.expires_at - _USE_MARGIN_SECS
+
+class TokenStore:
+    """Thread-safe (portal URL, PAT) -> token map with background refresh."""
+
+    def __init__(self, refresh_skew_secs: float = REFRESH_SKEW_SECS):
+        self.refresh_skew_secs = refresh_skew_secs
+        self._tokens: Dict[TokenKey, CachedToken] = {}
+        self._fetchers: Dict[TokenKey, Callable[[], str]] = {}
+        self._key_locks: Dict[TokenKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(base_url: str, pat: str) -> TokenKey:
+        return (base_url.rstrip("/"), pat)
+
+    def _key_lock(self, key: TokenKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, base_url: str, pat: str, fetch: Callable[[], str]) -> str:
+        """Return a usable token for (base_url, pat), calling `fetch` at most once per expiry."""
+        key = self.key(base_url, pat)
+        token = self.peek(base_url, pat)
+        if token:
+            return token
+        # One fetch per key; concurrent callers wait for it and share the result
+        with self._key_lock(key):
+            token = self.peek(base_url, pat)
+            if token:
+                return token
+            self._fetchers[key] = fetch
+            return self._refresh(key).token
+
+    def peek(self, base_url: str, pat: str) -> Optional[str]:
+        """Return the cached token if still usable, without ever fetching."""
+        entry = self._tokens.get(self.key(base_url, pat))
+        if entry and entry.usable():
+            entry.used = True
+            return entry.token
+        return None
+
+    def put(self, base_url: str, pat: str, token: str, fetch: Callable[[], str]) -> str:
+        """Store a token obtained elsewhere (e.g. by the async client); `fetch` renews it."""
+        key = self.key(base_url, pat)
+        with self._key_lock(key):
+            self._fetchers[key] = fetch
+            entry = CachedToken(token=token, expires_at=token_expiry(token), used=True)
+            self._install(key, entry)
+        return token
+
+    def invalidate(self, base_url: str, pat: str, token: Optional[str] = None) -> None:
+        """Drop the cached token (only if it still equals `token`, when given)."""
+        key = self.key(base_url, pat)
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry and (token is None or entry.token == token):
+                if entry.timer:
+                    entry.timer.cancel()
+                del self._tokens[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._tokens.values():
+                if entry.timer:
+                    entry.timer.cancel()
+            self._tokens.clear()
+            self._fetchers.clear()
+
+    def _refresh(self, key: TokenKey, used: bool = True) -> CachedToken:
+        token = self._fetchers[key]()
+        entry = CachedToken(token=token, expires_at=token_expiry(token), used=used)
+        self._install(key, entry)
+        return entry
+
+    def _install(self, key: TokenKey, entry: CachedToken) -> None:
+        with self._lock:
+            old = self._tokens.get(key)
+            if old and old.timer:
+                old.timer.cancel()
+            self._tokens[key] = entry
+        self._schedule(key, entry)
+
+    def _schedule(self, key: TokenKey, entry: CachedToken) -> None:
+        delay = entry.expires_at - self.refresh_skew_secs - time.time()
+        if delay <= 0:
+            return
+        entry.timer = threading.Timer(delay, self._background_refresh, args=(key, entry))
+        entry.timer.daemon = True
+        entry.timer.start()
+
+    def _background_refresh(self, key: TokenKey, entry: CachedToken) -> None:
+        # Idle tokens are left to expire; the next get() fetches a new one on demand
+        if self._tokens.get(key) is not entry or not entry.used:
+            return
+        with self._key_lock(key):
+            if self._tokens.get(key) is not entry:
+                return
+            try:
+                self._refresh(key, used=False)
+                log.debug("Refreshed bearer token for %s", key[0])
+            except Exception:
+                log.warning("Background token refresh failed for %s", key[0], exc_info=True)
+
+# Single store used by every client in the process
+token_store = TokenStore()
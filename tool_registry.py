@@ -0,0 +1,153 @@
+# tool_registry.py
+"""
+Lazy, manifest-driven tool registration for a fast cold start.
+
+The MCP client spawns one server per session, so import time is on the
+critical path. On startup, `load_tools` reads tool_manifest.json: one entry
+per tool with its name, description, input and output JSON schemas and the
+module that defines it. Each entry is registered as a LazyTool. Listing tools
+needs nothing else. The defining module (with its Pydantic params models and
+client bindings) is imported on the first call to one of its tools; its
+@mcp.tool() decorators then bind the real functions (see mcp_app.SimioMCP).
+
+There is no swagger.json in the package, so the manifest is compiled from the
+registered tools themselves. When it is missing or stale, every module is
+imported as before and the manifest is rewritten for the next start. It is
+stale when any .py file here, the SIMIO_* settings (defaults such as page
+sizes show up in the schemas; the portal URL is ignored), PROJECT_NAME or the
+mcp/pydantic versions change. SIMIO_LAZY_TOOLS=0 always imports eagerly.
+
+LazyTool relies on FastMCP internals (Tool.title/output_schema, FuncMetadata's
+output_schema, ToolManager._tools) from mcp 1.10; pyproject pins mcp>=1.10,<2.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+from typing import Any, Callable, Dict, Optional
+
+import pydantic
+from pydantic import PrivateAttr
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.server.fastmcp.tools import Tool
+from mcp.server.fastmcp.utilities.func_metadata import ArgModelBase, FuncMetadata
+
+log = logging.getLogger("SimioPortalMCP")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TOOL_MODULES = ("api_tools_rest_generated", "tools", "workflow_tools", "job_tools", "table_tools", "analysis_tools")
+LAZY_TOOLS = os.getenv("SIMIO_LAZY_TOOLS", "1").lower() not in ("0", "false", "no")
+MANIFEST_PATH = os.getenv("SIMIO_TOOL_MANIFEST") or os.path.join(HERE, "tool_manifest.json")
+# Settings that never change a tool schema
+_UNHASHED = frozenset({"SIMIO_PORTAL_URL", "SIMIO_TOOL_MANIFEST", "SIMIO_LAZY_TOOLS"})
+
+class _Deferred(ArgModelBase):
+    """Arguments are validated by the real tool once it is built."""
+
+async def _deferred(**kwargs: Any) -> Any:
+    raise ToolError("Tool not loaded")
+
+class LazyTool(Tool):
+    """A tool registered from the manifest; its module is imported and its Tool built on first call."""
+
+    module: str
+    _fn: Optional[Callable] = PrivateAttr(None)
+    _options: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _real: Optional[Tool] = PrivateAttr(None)
+
+    @classmethod
+    def from_entry(cls, entry: Dict[str, Any]) -> "LazyTool":
+        return cls(
+            fn=_deferred,
+            name=entry["name"],
+            title=entry.get("title"),
+            description=entry.get("description") or "",
+            parameters=entry["parameters"],
+            fn_metadata=FuncMetadata(arg_model=_Deferred, output_schema=entry.get("output_schema")),
+            is_async=True,
+            context_kwarg=None,
+            module=entry["module"],
+        )
+
+    def bind(self, fn: Callable, **options: Any) -> None:
+        """Called by the @mcp.tool() decorator when the defining module is imported."""
+        self._fn, self._options, self._real = fn, options, None
+
+    def resolve(self) -> Tool:
+        if self._real is None:
+            if self._fn is None:
+                importlib.import_module(self.module)
+            if self._fn is None:
+                raise ToolError(f"Module {self.module} no longer defines tool {self.name}; delete {MANIFEST_PATH}")
+            self._real = Tool.from_function(self._fn, name=self.name, **self._options)
+        return self._real
+
+    async def run(self, arguments: Dict[str, Any], context: Any = None, convert_result: bool = False) -> Any:
+        return await self.resolve().run(arguments, context=context, convert_result=convert_result)
+
+def fingerprint() -> str:
+    """Changes whenever the registered tools could: code, settings, or the schema generators."""
+    from importlib.metadata import version
+
+    h = hashlib.sha1()
+    for name in sorted(os.listdir(HERE)):
+        if name.endswith(".py"):
+            h.update(name.encode())
+            with open(os.path.join(HERE, name), "rb") as f:
+                h.update(f.read())
+    for key in sorted(os.environ):
+        if (key.startswith("SIMIO_") and key not in _UNHASHED) or key == "PROJECT_NAME":
+            h.update(f"{key}={os.environ[key]}\n".encode())
+    h.update(f"{sys.version_info[:2]} mcp {version('mcp')} pydantic {pydantic.VERSION}".encode())
+    return h.hexdigest()
+
+def _read_manifest(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(MANIFEST_PATH, "rb") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log.warning("Ignoring unreadable tool manifest %s: %s", MANIFEST_PATH, e)
+        return None
+    return manifest if manifest.get("fingerprint") == key else None
+
+def build_manifest(mcp, key: str) -> Dict[str, Any]:
+    entries = []
+    for t in mcp._tool_manager.list_tools():
+        real = t.resolve() if isinstance(t, LazyTool) else t
+        entries.append({
+            "name": real.name,
+            "title": real.title,
+            "description": real.description,
+            "parameters": real.parameters,
+            "output_schema": real.output_schema,
+            "module": real.fn.__module__,
+        })
+    return {"fingerprint": key, "tools": entries}
+
+def _write_manifest(manifest: Dict[str, Any]) -> None:
+    tmp = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, MANIFEST_PATH)
+    except OSError as e:
+        log.warning("Could not write tool manifest %s: %s", MANIFEST_PATH, e)
+
+def load_tools(mcp) -> str:
+    """Register every tool on mcp: lazily from the manifest ("manifest") or by importing the modules ("imported")."""
+    key = fingerprint() if LAZY_TOOLS else ""
+    manifest = _read_manifest(key) if LAZY_TOOLS else None
+    if manifest is not None:
+        for entry in manifest["tools"]:
+            mcp._tool_manager._tools[entry["name"]] = LazyTool.from_entry(entry)
+        return "manifest"
+    for module in TOOL_MODULES:
+        importlib.import_module(module)
+    if LAZY_TOOLS:
+        _write_manifest(build_manifest(mcp, key))
+    return "imported"
@@ -1,4 +1,7 @@
 # tools.py
+import asyncio
+import time
+from typing import Optional
 from mcp_app import mcp
 from helpers import api, wrap_errors, retryable, MCPValidationError
 import models
@@ -10,7 +13,7 @@ from models import AuthParams
 # tools.py (replace describe_pysimio with this)
 @mcp.tool()
 @wrap_errors
-def describe_pysimio(_: dict) -> dict:
+def describe_pysimio(params: Optional[dict] = None) -> dict:
     """
     Introspect the pySimio client and return a compact map of
     { method_name: { signature, doc } } for key methods.
@@ -56,7 +59,7 @@ def describe_pysimio(_: dict) -> dict:
 @mcp.tool()
 @wrap_errors
 @retryable
-def portal_authenticate_pysimio(params: models.AuthParams) -> dict:
+async def portal_authenticate_pysimio(params: models.AuthParams) -> dict:
     """
     Authenticate with PAT (param overrides env).
     """
@@ -65,12 +68,17 @@ def portal_authenticate_pysimio(params: models.AuthParams) -> dict:
         raise MCPValidationError(
             "No PAT provided. Pass personal_access_token or set PERSONAL_ACCESS_TOKEN."
         )
-    api().authenticate(personalAccessToken=pat)
+    await asyncio.to_thread(api().authenticate, personalAccessToken=pat)
     return {"message": "Authenticated."}
 
 
 # ---------- Thin REST-backed tools expected by clients (validation-friendly) ----------
-from rest_client_generated import SimioClientGenerated
+from rest_client_async_generated import AsyncSimioClientGenerated
+from name_index import name_index
+from circuit_breaker import circuit_breaker
+from rate_limit import rate_limiter
+from singleflight import singleflight
+from endpoints import endpoint_stats
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 
@@ -79,11 +87,10 @@ class ListModelsParams(BaseModel):
 
 @mcp.tool()
 @wrap_errors
-@retryable
-def list_models(params: ListModelsParams) -> dict:
+async def list_models(params: ListModelsParams) -> dict:
     """Return list of models visible to this PAT."""
-    c = SimioClientGenerated.from_env()
-    models_list = c.models_getmodels()
+    c = AsyncSimioClientGenerated.from_env()
+    models_list = await c.models_getmodels()
     return {"response": models_list}
 
 class GetModelIdByProjectParams(BaseModel):
@@ -91,15 +98,53 @@ class GetModelIdByProjectParams(BaseModel):
 
 @mcp.tool()
 @wrap_errors
-@retryable
-def get_model_id_by_project(params: GetModelIdByProjectParams) -> dict:
+async def get_model_id_by_project(params: GetModelIdByProjectParams) -> dict:
     """Find model ID by project name (case-insensitive exact match)."""
-    c = SimioClientGenerated.from_env()
-    name = params.project_name or models.ENV_PROJECT_NAME
+    c = AsyncSimioClientGenerated.from_env()
+    name = params.project_name or models.DEFAULT_PROJECT
     if not name:
         raise MCPValidationError("project_name is required (or set PROJECT_NAME in .env).")
-    all_models = c.models_getmodels()
-    matches = [m for m in all_models if str(m.get('projectName','')).lower() == name.lower()]
-    if not matches:
+    model_id = await name_index.model_id(c, name)
+    if model_id is None:
         raise MCPValidationError(f"No model found with projectName='{name}'.")
-    return {"response": matches[0].get('id')}
+    return {"response": model_id}
+
+class ResolveIdsParams(BaseModel):
+    project_name: Optional[str] = Field(None, description="If omitted uses PROJECT_NAME from .env")
+    experiment_name: Optional[str] = Field(None, description="Experiment to resolve within the project's model")
+    run_name: Optional[str] = Field(None, description="Run to resolve within the experiment (requires experiment_name)")
+
+@mcp.tool()
+@wrap_errors
+async def resolve_ids(params: ResolveIdsParams) -> dict:
+    """Resolve project[/experiment[/run]] names to {model_id, experiment_id, run_id} in one call (case-insensitive)."""
+    name = params.project_name or models.DEFAULT_PROJECT
+    if not name:
+        raise MCPValidationError("project_name is required (or set PROJECT_NAME in .env).")
+    if params.run_name and not params.experiment_name:
+        raise MCPValidationError("run_name requires experiment_name.")
+    c = AsyncSimioClientGenerated.from_env()
+    return await name_index.resolve(c, name, params.experiment_name, params.run_name)
+
+class PortalHealthParams(BaseModel):
+    probe: bool = Field(False, description="Also call heartbeat_get now and report its latency")
+
+@mcp.tool()
+@wrap_errors
+async def portal_health(params: PortalHealthParams) -> dict:
+    """Circuit breaker state per endpoint family, rate limiter buckets, GET coalescing counts, per-endpoint call stats and (optionally) a live heartbeat."""
+    out: Dict[str, Any] = {
+        "breakers": circuit_breaker.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "coalesced_gets": singleflight.stats(),
+        "endpoints": endpoint_stats.stats(),
+    }
+    if params.probe:
+        c = AsyncSimioClientGenerated.from_env()
+        started = time.monotonic()
+        try:
+            await c.heartbeat_get()
+            out["heartbeat"] = {"ok": True, "latency_secs": round(time.monotonic() - started, 3)}
+        except Exception as e:
+            out["heartbeat"] = {"ok": False, "error": str(e), "latency_secs": round(time.monotonic() - started, 3)}
+    return out
@@ -1,19 +1,36 @@
 # workflow_tools.py
 """
-High-level MCP tools ("workflows") that orchestrate multiple pysimio calls directly.
-These do NOT depend on the atomic tools; they call pysimio via portal_adapter.call
-and helpers.api.
+High-level MCP tools ("workflows") that orchestrate multiple portal calls directly.
+These do NOT depend on the atomic tools; they call the portal through
+AsyncSimioClientGenerated (pooled connections, shared token cache). Payloads
+match the ones pysimio sends for the same operations. Project/experiment/run
+names are resolved through the shared name_index (backed by the metadata cache).
+Workflows are async, and waiting for a run is delegated to the shared
+run_poller, so a long poll never blocks other tool calls and N waiting
+workflows do not mean N pollers.
 
-Workflow included:
+Workflows included:
   - create_or_replace_plan_run
+  - sweep_plan_runs
+  - set_controls_bulk
+  - export_scenarios / import_scenarios
 """
 
-from typing import Optional, Dict, Any
+import asyncio
+import time
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
 from mcp_app import mcp
-from helpers import wrap_errors, retryable, MCPValidationError, MCPApiError, api
-from portal_adapter import call
+from helpers import log, wrap_errors, MCPValidationError, MCPApiError
+from rest_client_generated import SimioApiError
+from rest_client_async_generated import AsyncSimioClientGenerated
+from retry_policy import status_of
+from name_index import name_index
+from batch import BATCH_CONCURRENCY, apply_control_values, run_batch
+from run_poller import run_poller
+from jobs import Job, job_manager
+from sweep import design_points
 
 # ------------------ Pydantic input models ------------------
 
@@ -27,6 +44,7 @@ class CreateOrReplacePlanRunParams(BaseModel):
 
     # Optional configuration
     controls: Optional[Dict[str, Any]] = Field(None, description="ControlName -> value map")
+    control_concurrency: int = Field(BATCH_CONCURRENCY, ge=1, le=32, description="Max concurrent setControlValues calls")
     start_time: Optional[str] = Field(
         None,
         description="ISO8601 start (e.g. '2025-12-13T03:14:00Z'); set use_specific_start automatically"
@@ -38,7 +56,7 @@ class CreateOrReplacePlanRunParams(BaseModel):
 
     # Behavior
     delete_existing: bool = Field(True, description="Delete existing run with same name before create")
-    start_mode: str = Field("standard", description="'standard' uses startRun; 'from_existing' uses startRunFromExisting")
+    start_mode: str = Field("standard", description="'standard' runs the plan only; 'from_existing' uses run_plan / run_replications")
     run_plan: bool = Field(True, description="Only for start_mode='from_existing'")
     run_replications: bool = Field(False, description="Only for start_mode='from_existing'")
 
@@ -46,6 +64,12 @@ class CreateOrReplacePlanRunParams(BaseModel):
     poll: bool = Field(True, description="Poll until terminal state")
     interval_secs: float = Field(10.0, ge=0.5, le=60)
     timeout_secs: float = Field(3600.0, ge=5, le=24*3600)
+    adaptive_poll: bool = Field(False, description="Schedule polls from the percentComplete-based ETA (interval_secs is the first interval)")
+    min_interval_secs: float = Field(1.0, ge=0.5, le=60, description="Adaptive polling lower bound")
+    max_interval_secs: float = Field(300.0, ge=1, le=3600, description="Adaptive polling upper bound")
+
+    # Background execution
+    background: bool = Field(False, description="Return a job_id immediately and run (and poll) in the background")
 
     # Dry-run
     dry_run: bool = Field(False, description="If true, perform discovery and return planned actions without mutating")
@@ -58,6 +82,62 @@ class CreateOrReplacePlanRunParams(BaseModel):
             raise MCPValidationError("start_mode must be 'standard' or 'from_existing'")
         return v2
 
+class SweepPlanRunsParams(BaseModel):
+    # Resolution (done once for the whole sweep)
+    project_name: str = Field(..., min_length=1, description="Simio projectName to resolve model")
+    experiment_name: str = Field("__Default", min_length=1, description="Experiment name to use")
+    name_prefix: str = Field(..., min_length=1, description="Runs are named <name_prefix>_001, _002, ...")
+
+    # Design
+    mode: str = Field("grid", pattern="^(grid|lhs|list)$", description="'grid' (Cartesian), 'lhs' (Latin hypercube) or 'list'")
+    grid: Optional[Dict[str, List[Any]]] = Field(None, description="grid: ControlName -> values")
+    ranges: Optional[Dict[str, List[float]]] = Field(None, description="lhs: ControlName -> [low, high]")
+    samples: int = Field(10, ge=1, le=1000, description="lhs: number of points")
+    integer_controls: List[str] = Field(default_factory=list, description="lhs: controls rounded to integers")
+    seed: Optional[int] = Field(None, description="lhs: random seed for a reproducible design")
+    points: Optional[List[Dict[str, Any]]] = Field(None, description="list: explicit ControlName -> value maps")
+    fixed_controls: Optional[Dict[str, Any]] = Field(None, description="Controls set on every run")
+    max_runs: int = Field(200, ge=1, le=2000, description="Refuse designs larger than this")
+
+    # Per-run configuration
+    start_time: Optional[str] = Field(None, description="ISO8601 start applied to every run")
+    end_time: Optional[str] = Field(None, description="ISO8601 end applied to every run")
+    delete_existing: bool = Field(True, description="Delete existing runs with the same names first")
+    run_replications: bool = Field(False, description="Also run replications (risk analysis)")
+    control_concurrency: int = Field(BATCH_CONCURRENCY, ge=1, le=32, description="Max concurrent control writes per run")
+
+    # Concurrency
+    max_concurrency: int = Field(4, ge=1, le=32, description="Runs being created/configured/started at once")
+    max_running: Optional[int] = Field(None, ge=1, le=500, description="If set, at most this many runs in flight until terminal (needs poll)")
+
+    # Polling
+    poll: bool = Field(True, description="Wait for every run to reach a terminal state")
+    interval_secs: float = Field(10.0, ge=0.5, le=60)
+    timeout_secs: float = Field(6 * 3600.0, ge=5, le=48*3600)
+    adaptive_poll: bool = Field(True, description="Schedule polls from each run's ETA")
+    min_interval_secs: float = Field(1.0, ge=0.5, le=60)
+    max_interval_secs: float = Field(300.0, ge=1, le=3600)
+
+    background: bool = Field(False, description="Return a job_id immediately and run the sweep in the background")
+    dry_run: bool = Field(False, description="Return the design and run names without touching the portal runs")
+
+class SetControlsBulkParams(BaseModel):
+    run_id: str = Field(..., min_length=1, description="Existing (plan) run ID")
+    scenario_name: str = Field(..., min_length=1, description="Scenario to modify (for plan runs, the run name)")
+    controls: Dict[str, Any] = Field(..., min_length=1, description="ControlName -> value map")
+    max_concurrency: int = Field(BATCH_CONCURRENCY, ge=1, le=32)
+    retries: int = Field(2, ge=0, le=5, description="Extra rounds for controls that failed")
+
+class ScenarioTransferParams(BaseModel):
+    run_id: str = Field(..., min_length=1)
+    scenario_names: Optional[List[str]] = Field(None, description="Scenarios to export/import; default: every scenario of the run")
+    max_concurrency: int = Field(BATCH_CONCURRENCY, ge=1, le=32, description="Max concurrent start calls")
+    interval_secs: float = Field(2.0, ge=0.5, le=60, description="First status poll interval")
+    backoff: float = Field(1.5, ge=1.0, le=4.0, description="Poll interval multiplier after each poll")
+    max_interval_secs: float = Field(30.0, ge=1, le=600)
+    timeout_secs: float = Field(1800.0, ge=5, le=24*3600)
+    background: bool = Field(False, description="Return a job_id immediately and track in the background")
+
 # ------------------ Helpers ------------------
 
 def _iso(dt: Optional[str]) -> Optional[str]:
@@ -81,34 +161,90 @@ def _iso(dt: Optional[str]) -> Optional[str]:
         except Exception:
             raise MCPValidationError(f"Invalid ISO datetime: {dt}")
 
-def _terminal(state: Optional[str]) -> bool:
-    return (state or "").upper() in {"COMPLETED", "FAILED", "ERROR", "CANCELED"}
+def _time_options(run_id: Any, st: Optional[str], et: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Body for runs/{id}/time-options (what pysimio's TimeOptions.as_json() sends), or None."""
+    if not (st or et):
+        return None
+    body: Dict[str, Any] = {"runId": run_id, "isSpecificStartTime": bool(st), "isSpecificEndTime": bool(et)}
+    if st:
+        body["specificStartingTime"] = st
+    if et:
+        body["specificEndingTime"] = et
+    return body
+
+# ------------------ Run steps (shared by the plan-run workflows) ------------------
+
+async def _delete_run(client: AsyncSimioClientGenerated, experiment_id: Any, run_id: Any) -> None:
+    try:
+        await client.runs_deleterun(run_id=str(run_id))
+    except SimioApiError as e:
+        if status_of(e) != 404:
+            raise
+        log.info("Run %s was already deleted", run_id)  # stale index entry, e.g. deleted by another client
+    name_index.drop_run(client, experiment_id, run_id)
+
+async def _create_run(client: AsyncSimioClientGenerated, model_id: Any, experiment_id: Any, name: str) -> Any:
+    created = await client.runs_createexperimentrun(body={"modelId": model_id, "experimentRunName": name})
+    run_id = created.get("id") if isinstance(created, dict) else created
+    if run_id is None:
+        raise MCPApiError(f"createRun returned no id: {created}")
+    name_index.add_run(client, experiment_id, name, run_id)
+    return run_id
+
+async def _create_job_run(client: AsyncSimioClientGenerated, model_id: Any, experiment_id: Any, name: str, job: Optional[Job]) -> Any:
+    """_create_run that records the run on `job`, even when the job is cancelled mid-create (so cancel_job cancels it)."""
+    if job is None:
+        return await _create_run(client, model_id, experiment_id, name)
+    create = asyncio.ensure_future(_create_run(client, model_id, experiment_id, name))
+    try:
+        run_id = await asyncio.shield(create)
+    except asyncio.CancelledError:
+        # The portal may already have created the run; let the request finish and record it
+        try:
+            job.run_ids.append(await create)
+        except Exception:
+            pass
+        raise
+    job.run_ids.append(run_id)
+    return run_id
+
+async def _apply_controls(client: AsyncSimioClientGenerated, run_id: Any, scenario: str, controls: Dict[str, Any], concurrency: int) -> dict:
+    report = await apply_control_values(client, run_id, scenario, controls, concurrency=concurrency)
+    if report["failed"]:
+        raise MCPApiError(f"Failed to set controls on run {run_id}: {report['failed']}")
+    return report
+
+async def _start_run(client: AsyncSimioClientGenerated, run_id: Any, run_plan: bool, run_replications: bool) -> Any:
+    return await client.runs_startexistingplanrun(
+        body={"existingExperimentRunId": run_id, "runPlan": run_plan, "runReplications": run_replications}
+    )
 
-# ------------------ Workflow tool ------------------
+# ------------------ Workflow tools ------------------
 
 @mcp.tool()
 @wrap_errors
-@retryable
-def create_or_replace_plan_run(params: CreateOrReplacePlanRunParams) -> dict:
+async def create_or_replace_plan_run(params: CreateOrReplacePlanRunParams) -> dict:
     """
     Resolve model by project -> experiment -> (optional) delete same-name run -> create run -> set controls/time -> start -> (optional) poll.
     Returns IDs and (if polled) a final status snapshot.
+    With background=true returns a job_id at once; follow it with get_job / wait_job / cancel_job.
     Assumes you've already authenticated via portal_authenticate.
     """
-    # 1) Resolve model by project
-    models = call("getModels") or []
-    model = next((m for m in models if (m.get("projectName") or "").lower() == params.project_name.lower()), None)
-    if not model:
-        raise MCPApiError(f"Project '{params.project_name}' not found in getModels()")
-    model_id = model["id"]
-
-    # 2) Resolve experiment by name
-    experiments = call("getExperiments", model_id=model_id) or []
-    exp = next((e for e in experiments if (e.get("name") or "").strip().lower() == params.experiment_name.strip().lower()), None)
-    if not exp:
-        names = [e.get("name") for e in experiments]
-        raise MCPApiError(f"Experiment '{params.experiment_name}' not found for model {model_id}. Available: {names}")
-    experiment_id = exp["id"]
+    client = AsyncSimioClientGenerated.from_env()
+    if params.background and not params.dry_run:
+        job = job_manager.submit(
+            "create_or_replace_plan_run",
+            params.model_dump(exclude_defaults=True),
+            lambda job: _create_or_replace_plan_run(client, params, job),
+            client=client,
+        )
+        return {"ok": True, "job_id": job.id, "status": job.status}
+    return await _create_or_replace_plan_run(client, params)
+
+async def _create_or_replace_plan_run(client: AsyncSimioClientGenerated, params: CreateOrReplacePlanRunParams, job: Optional[Job] = None) -> dict:
+    # 1-2) Resolve model by project, then experiment by name (shared name index)
+    ids = await name_index.resolve(client, params.project_name, params.experiment_name)
+    model_id, experiment_id = ids["model_id"], ids["experiment_id"]
 
     # Prepare result shell
     result = {
@@ -121,94 +257,279 @@ def create_or_replace_plan_run(params: CreateOrReplacePlanRunParams) -> dict:
     }
 
     # 3) Find existing run by name (exact, case-insensitive)
-    runs = call("getRuns", experiment_id=experiment_id) or []
-    existing = next((r for r in runs if (r.get("name") or "").strip().lower() == params.plan_name.strip().lower()), None)
+    existing_id = await name_index.run_id(client, experiment_id, params.plan_name)
 
-    if existing and params.delete_existing:
-        result["actions"].append({"deleteRun": existing["id"]})
+    if existing_id is not None and params.delete_existing:
+        result["actions"].append({"deleteRun": existing_id})
         if not params.dry_run:
-            call("deleteRun", run_id=existing["id"])
+            await _delete_run(client, experiment_id, existing_id)
 
     # 4) Create new run
-    result["actions"].append({"createRun": {"experiment_id": experiment_id, "name": params.plan_name}})
+    result["actions"].append({"createRun": {"model_id": model_id, "name": params.plan_name}})
     if params.dry_run:
         run_id = "DRY_RUN_PLACEHOLDER"
     else:
-        created = call("createRun", experiment_id=experiment_id, name=params.plan_name)
-        run_id = created["id"]
+        run_id = await _create_job_run(client, model_id, experiment_id, params.plan_name, job)
     result["run_id"] = run_id
 
-    # 5) Set control values
+    # 5) Set control values (concurrently, failed controls retried)
     if params.controls:
         for k, v in params.controls.items():
             result["actions"].append({"setControlValues": {"run_id": run_id, "scenario": params.plan_name, "name": k, "value": str(v)}})
-            if not params.dry_run:
-                call(
-                    "setControlValues",
-                    run_id=run_id,
-                    scenario_name=params.plan_name,
-                    control_name=k,
-                    control_value=str(v),
-                )
+        if not params.dry_run:
+            result["controls"] = await _apply_controls(client, run_id, params.plan_name, params.controls, params.control_concurrency)
 
     # 6) Set run time options
-    st = _iso(params.start_time)
-    et = _iso(params.end_time)
-    if st or et:
-        result["actions"].append({"setRunTimeOptions": {"run_id": run_id, "start": st, "end": et}})
+    time_options = _time_options(run_id, _iso(params.start_time), _iso(params.end_time))
+    if time_options:
+        result["actions"].append({"setRunTimeOptions": time_options})
         if not params.dry_run:
-            # Build TimeOptions and pass via adapter (supports snake/camel)
-            from pysimio.classes import TimeOptions
-            opts = TimeOptions(
-                runId=run_id,
-                isSpecificStartTime=bool(st),
-                specificStartingTime=st,
-                isSpecificEndTime=bool(et),
-                specificEndingTime=et,
-            )
-            # Some pysimio builds take positional TimeOptions, others expect kw `timeOptions`
-            try:
-                call("setRunTimeOptions", time_options=opts)
-            except MCPApiError:
-                # Fallback: try direct client if adapter mapping isn't enough
-                api().setRunTimeOptions(opts)
+            await client.runs_setscenariostartendtype(run_id=str(run_id), body=time_options)
 
-    # 7) Start the run
+    # 7) Start the run ('standard' = run the plan only)
     if params.start_mode == "standard":
-        result["actions"].append({"startRun": {"experiment_id": experiment_id, "run_id": run_id}})
-        if not params.dry_run:
-            call("startRun", experiment_id=experiment_id, run_id=run_id)
+        run_plan, run_replications = True, False
     else:  # from_existing
-        result["actions"].append({"startRunFromExisting": {"run_id": run_id, "runPlan": params.run_plan, "runReplications": params.run_replications}})
-        if not params.dry_run:
-            call(
-                "startRunFromExisting",
-                existing_experiment_run_id=run_id,
-                run_plan=params.run_plan,
-                run_replications=params.run_replications,
-            )
-
-    # 8) Optional poll to completion
+        run_plan, run_replications = params.run_plan, params.run_replications
+    result["actions"].append({"startRun": {"run_id": run_id, "runPlan": run_plan, "runReplications": run_replications}})
+    if not params.dry_run:
+        await _start_run(client, run_id, run_plan, run_replications)
+
+    # 8) Optional poll to completion (shared poller, one status stream per run)
     if params.poll and not params.dry_run:
-        import time
         start_ts = time.time()
-        last = {}
-        while True:
-            detail = call("getRun", experiment_id=experiment_id, run_id=run_id) or {}
-            last = {
-                "state": detail.get("state"),
-                "percentComplete": detail.get("percentComplete"),
-                "started": detail.get("startDateTimeUtc"),
-                "finished": detail.get("endDateTimeUtc"),
-            }
-            if _terminal(last["state"]):
-                result["final"] = last
-                result["elapsed_secs"] = round(time.time() - start_ts, 2)
-                break
-            if time.time() - start_ts > params.timeout_secs:
-                result["final"] = {"state": "TIMEOUT", **last}
-                result["elapsed_secs"] = round(time.time() - start_ts, 2)
-                break
-            time.sleep(params.interval_secs)
+        result["final"] = await run_poller.wait(
+            client, run_id,
+            experiment_id=experiment_id,
+            interval_secs=params.interval_secs,
+            timeout_secs=params.timeout_secs,
+            adaptive=params.adaptive_poll,
+            min_interval_secs=params.min_interval_secs,
+            max_interval_secs=params.max_interval_secs,
+        )
+        result["elapsed_secs"] = round(time.time() - start_ts, 2)
+        if "eta_secs" in result["final"]:
+            result["eta_secs"] = result["final"]["eta_secs"]
 
     return {"ok": True, **result}
+
+_TRANSFER_DONE = {"COMPLETED", "SUCCEEDED", "SUCCESS", "FAILED", "ERROR", "CANCELED", "CANCELLED"}
+_TRANSFER_OK = {"COMPLETED", "SUCCEEDED", "SUCCESS"}
+
+def _transfer_snapshot(detail: Dict[str, Any]) -> Dict[str, Any]:
+    state = detail.get("status", detail.get("state"))
+    return {
+        "state": None if state is None else str(state),
+        "percentComplete": detail.get("percentComplete"),
+        "message": detail.get("errorMessage") or detail.get("message"),
+    }
+
+def _transfer_done(snap: Dict[str, Any]) -> bool:
+    return (snap.get("state") or "").upper() in _TRANSFER_DONE
+
+def _scenario_names(data: Any) -> List[str]:
+    items = data.get("scenarios") if isinstance(data, dict) else data
+    return [s["name"] for s in items or [] if isinstance(s, dict) and s.get("name")]
+
+def _started_id(data: Any) -> Any:
+    if isinstance(data, dict):
+        for k in ("id", "exportId", "importId"):
+            if data.get(k) is not None:
+                return data[k]
+        raise MCPApiError(f"Start response has no id: {data}")
+    return data
+
+async def _transfer_scenarios(client: AsyncSimioClientGenerated, kind: str, params: ScenarioTransferParams) -> dict:
+    """Start one export/import per scenario (bounded), then wait on all of them through run_poller."""
+    start_ts = time.time()
+    names = params.scenario_names
+    if not names:
+        names = _scenario_names(await client.scenarios_getscenarioresponsedatabyid(run_id=params.run_id))
+        if not names:
+            raise MCPApiError(f"No scenarios found for run {params.run_id}; pass scenario_names")
+    if kind == "export":
+        start, get = client.scenarios_exporttablesandlogs, client.scenarios_getexportbyid
+    else:
+        start, get = client.scenarios_importexperimentrunscenariotabledata, client.scenarios_getimportbyid
+
+    async def start_one(name, _):
+        return _started_id(await start(run_id=params.run_id, scenario_name=name))
+
+    # POST starts are not idempotent: no retry rounds
+    started = await run_batch(((n, None) for n in names), start_one, concurrency=params.max_concurrency, retries=0)
+
+    async def wait_one(name, job_id):
+        return await run_poller.wait_for(
+            client, f"{kind}:{params.run_id}:{job_id}",
+            lambda: get(run_id=params.run_id, **{f"{kind}_id": str(job_id)}),
+            snapshot=_transfer_snapshot, done=_transfer_done,
+            interval_secs=params.interval_secs, backoff=params.backoff,
+            max_interval_secs=params.max_interval_secs, timeout_secs=params.timeout_secs,
+        )
+
+    finals = await asyncio.gather(*(wait_one(n, i) for n, i in started["results"].items()), return_exceptions=True)
+    scenarios: Dict[str, Any] = {n: {"error": e} for n, e in started["failed"].items()}
+    for (name, job_id), final in zip(started["results"].items(), finals):
+        if isinstance(final, Exception):
+            scenarios[name] = {"id": job_id, "error": f"{final.__class__.__name__}: {final}"}
+        else:
+            scenarios[name] = {"id": job_id, **final}
+    counts: Dict[str, int] = {}
+    for v in scenarios.values():
+        state = v.get("state") or ("ERROR" if "id" in v else "START_FAILED")
+        counts[state] = counts.get(state, 0) + 1
+    return {
+        "ok": all((v.get("state") or "").upper() in _TRANSFER_OK for v in scenarios.values()),
+        "run_id": params.run_id,
+        "kind": kind,
+        "counts": counts,
+        "scenarios": scenarios,
+        "elapsed_secs": round(time.time() - start_ts, 2),
+    }
+
+async def _submit_or_run_transfer(kind: str, params: ScenarioTransferParams) -> dict:
+    client = AsyncSimioClientGenerated.from_env()
+    if params.background:
+        job = job_manager.submit(
+            f"{kind}_scenarios",
+            params.model_dump(exclude_defaults=True),
+            lambda job: _transfer_scenarios(client, kind, params),
+            client=client,
+        )
+        return {"ok": True, "job_id": job.id, "status": job.status}
+    return await _transfer_scenarios(client, kind, params)
+
+@mcp.tool()
+@wrap_errors
+async def export_scenarios(params: ScenarioTransferParams) -> dict:
+    """
+    Start table/log exports for many scenarios of a run at once and track them all through the shared poller.
+    Returns one report: per-scenario export id and final state, plus counts by state.
+    """
+    return await _submit_or_run_transfer("export", params)
+
+@mcp.tool()
+@wrap_errors
+async def import_scenarios(params: ScenarioTransferParams) -> dict:
+    """
+    Start table-data imports for many scenarios of a run at once and track them all through the shared poller.
+    Returns one report: per-scenario import id and final state, plus counts by state.
+    """
+    return await _submit_or_run_transfer("import", params)
+
+@mcp.tool()
+@wrap_errors
+async def sweep_plan_runs(params: SweepPlanRunsParams) -> dict:
+    """
+    Run one plan over many control combinations (grid, Latin hypercube or explicit list).
+    Resolves model/experiment once, creates + configures + starts runs with a concurrency cap,
+    tracks them all through the shared poller, and returns one table of run ids, states and timings.
+    With background=true returns a job_id at once; follow it with get_job / wait_job / cancel_job.
+    """
+    points = design_points(
+        params.mode, grid=params.grid, ranges=params.ranges, samples=params.samples, seed=params.seed,
+        integer=params.integer_controls, points=params.points, fixed=params.fixed_controls,
+        max_points=params.max_runs,
+    )
+    if len(points) > params.max_runs:
+        raise MCPValidationError(f"Design has {len(points)} runs, above max_runs={params.max_runs}")
+    if params.max_running is not None and not params.poll:
+        raise MCPValidationError("max_running needs poll=true")
+    client = AsyncSimioClientGenerated.from_env()
+    if params.background and not params.dry_run:
+        job = job_manager.submit(
+            "sweep_plan_runs",
+            params.model_dump(exclude_defaults=True),
+            lambda job: _sweep_plan_runs(client, params, points, job),
+            client=client,
+        )
+        return {"ok": True, "job_id": job.id, "status": job.status, "runs": len(points)}
+    return await _sweep_plan_runs(client, params, points)
+
+async def _sweep_plan_runs(client: AsyncSimioClientGenerated, params: SweepPlanRunsParams, points: List[Dict[str, Any]], job: Optional[Job] = None) -> dict:
+    sweep_ts = time.time()
+    ids = await name_index.resolve(client, params.project_name, params.experiment_name)
+    model_id, experiment_id = ids["model_id"], ids["experiment_id"]
+    width = max(3, len(str(len(points))))
+    names = [f"{params.name_prefix}_{i + 1:0{width}d}" for i in range(len(points))]
+    if params.dry_run:
+        return {
+            "ok": True, "dry_run": True, "model_id": model_id, "experiment_id": experiment_id,
+            "runs": [{"run": n, "controls": p} for n, p in zip(names, points)],
+        }
+    existing = await name_index.run_ids(client, experiment_id, names) if params.delete_existing else {}
+    time_options = (_iso(params.start_time), _iso(params.end_time))
+    provision = asyncio.Semaphore(params.max_concurrency)
+    running = asyncio.Semaphore(params.max_running) if params.max_running else None
+
+    async def one(name: str, controls: Dict[str, Any]) -> Dict[str, Any]:
+        row: Dict[str, Any] = {"run": name, "run_id": None, "state": None, "controls": controls}
+        t0 = time.time()
+        try:
+            if running is not None:
+                await running.acquire()
+            try:
+                async with provision:
+                    row["queued_secs"] = round(time.time() - t0, 2)
+                    if name in existing:
+                        await _delete_run(client, experiment_id, existing[name])
+                    run_id = row["run_id"] = await _create_job_run(client, model_id, experiment_id, name, job)
+                    if controls:
+                        await _apply_controls(client, run_id, name, controls, params.control_concurrency)
+                    body = _time_options(run_id, *time_options)
+                    if body:
+                        await client.runs_setscenariostartendtype(run_id=str(run_id), body=body)
+                    await _start_run(client, run_id, True, params.run_replications)
+                    row["state"] = "STARTED"
+                    row["start_secs"] = round(time.time() - t0, 2)
+                if params.poll:
+                    final = await run_poller.wait(
+                        client, run_id,
+                        experiment_id=experiment_id,
+                        interval_secs=params.interval_secs,
+                        timeout_secs=max(1.0, params.timeout_secs - (time.time() - sweep_ts)),
+                        adaptive=params.adaptive_poll,
+                        min_interval_secs=params.min_interval_secs,
+                        max_interval_secs=params.max_interval_secs,
+                    )
+                    row.update(state=final.get("state"), percentComplete=final.get("percentComplete"),
+                               started=final.get("started"), finished=final.get("finished"))
+            finally:
+                if running is not None:
+                    running.release()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            row["state"] = "ERROR"
+            row["error"] = f"{e.__class__.__name__}: {e}"
+        row["elapsed_secs"] = round(time.time() - t0, 2)
+        return row
+
+    rows = await asyncio.gather(*(one(n, p) for n, p in zip(names, points)))
+    counts: Dict[str, int] = {}
+    for r in rows:
+        counts[r["state"] or "UNKNOWN"] = counts.get(r["state"] or "UNKNOWN", 0) + 1
+    done_ok = {"COMPLETED"} if params.poll else {"STARTED"}
+    return {
+        "ok": all((r["state"] or "").upper() in done_ok for r in rows),
+        "model_id": model_id,
+        "experiment_id": experiment_id,
+        "mode": params.mode,
+        "counts": counts,
+        "runs": rows,
+        "elapsed_secs": round(time.time() - sweep_ts, 2),
+    }
+
+@mcp.tool()
+@wrap_errors
+async def set_controls_bulk(params: SetControlsBulkParams) -> dict:
+    """
+    Set many control values on an existing run concurrently.
+    Returns the applied control names and, per failed control, the last error.
+    """
+    client = AsyncSimioClientGenerated.from_env()
+    report = await apply_control_values(
+        client, params.run_id, params.scenario_name, params.controls,
+        concurrency=params.max_concurrency, retries=params.retries,
+    )
+    return {"ok": not report["failed"], "run_id": params.run_id, **report}